@@ -1,16 +1,30 @@
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from app.core.config import settings
+from app.core.security import current_user_cache
+from app.core.tracing import start_span, traced
 from app.infrastructure.database.models.user import User
+from app.infrastructure.database.routing import bind_user, use_primary
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
+@traced("auth.get_current_user", "auth")
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     """
     Dependency that validates JWT and retrieves the current user.
+
+    Tokens already verified for an active user are served from
+    `current_user_cache` without decoding them or querying the database;
+    the others look the user up on the primary.
     """
+    user = current_user_cache.get(token)
+    if user is not None:
+        bind_user(user.id)
+        return user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -18,17 +32,36 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     )
 
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        with start_span("auth.jwt_decode", "auth"):
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
-    user = await User.get_or_none(email=email)
+    # Read from the primary: a user who has just registered or been
+    # reactivated may not have reached the replica yet.
+    with use_primary():
+        user = await User.get_or_none(email=email)
     if user is None or not user.is_active:
         raise credentials_exception
 
+    expires_in = payload.get("exp", time.time()) - time.time()
+    current_user_cache.set(token, user, ttl=expires_in)
+    bind_user(user.id)
     return user
+
+
+async def get_ops_user(current_user: User = Depends(get_current_user)) -> User:
+    """
+    Dependency that only lets through the users listed in OPS_ADMIN_EMAILS.
+
+    Raises:
+        HTTPException: 403 for any other authenticated user.
+    """
+    if current_user.email not in settings.OPS_ADMIN_EMAILS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    return current_user
@@ -0,0 +1,188 @@
+import logging
+from time import perf_counter, time_ns
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.logging import get_logging
+from app.core.metrics import MetricsRegistry, metrics
+from app.core.tracing import SpanExporter, activate, sample_trace, server_timing
+from app.infrastructure.database.instrumentation import (
+    QueryStats,
+    current_query_stats,
+    track_queries,
+)
+from app.infrastructure.database.routing import replica_reads
+
+log = get_logging(__name__)
+
+SAFE_METHODS = ("GET", "HEAD")
+NO_QUERIES = QueryStats()
+
+
+class ReplicaReadsMiddleware:
+    """
+    Lets the database reads of safe requests go to the read replica.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        with replica_reads():
+            await self.app(scope, receive, send)
+
+
+class MetricsMiddleware:
+    """
+    Records the latency, status and database queries (counted by the
+    enclosing `QueryStatsMiddleware`) of every request under its route
+    template (e.g. `/api/task/lists/{list_id}`).
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # Unhandled errors never start a response; they end as a 500.
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        registry = self.registry
+        registry.in_flight += 1
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            registry.in_flight -= 1
+            route = scope.get("route")
+            queries = current_query_stats() or NO_QUERIES
+            registry.observe_request(
+                scope["method"],
+                getattr(route, "path_format", None),
+                status,
+                perf_counter() - start,
+                queries.count,
+                queries.seconds,
+            )
+
+
+class QueryStatsMiddleware:
+    """
+    Counts the database queries of every request and their time.
+
+    They are logged once the request ends, even if it fails (at DEBUG, or
+    WARNING beyond `warn_threshold` queries, a likely N+1). With `headers`,
+    they are also returned as `X-DB-Queries` and `X-DB-Time-Ms`; headers are
+    sent when the response starts, so these leave out the queries made while
+    a streaming body (such as an export) is sent, which only the log and the
+    metrics include. Must wrap `MetricsMiddleware`, which reads the same
+    counters.
+    """
+
+    def __init__(self, app: ASGIApp, headers: bool = False, warn_threshold: int = 50):
+        self.app = app
+        self.headers = headers
+        self.warn_threshold = warn_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with track_queries() as queries:
+            try:
+                if self.headers:
+
+                    async def send_with_headers(message: Message) -> None:
+                        if message["type"] == "http.response.start":
+                            headers = MutableHeaders(scope=message)
+                            headers.append("X-DB-Queries", str(queries.count))
+                            headers.append(
+                                "X-DB-Time-Ms", f"{queries.seconds * 1000:.2f}"
+                            )
+                        await send(message)
+
+                    await self.app(scope, receive, send_with_headers)
+                else:
+                    await self.app(scope, receive, send)
+            finally:
+                self._log(scope, queries)
+
+    def _log(self, scope: Scope, queries: QueryStats) -> None:
+        if queries.count > self.warn_threshold:
+            level = logging.WARNING
+        elif log.isEnabledFor(logging.DEBUG):
+            level = logging.DEBUG
+        else:
+            return
+        route = scope.get("route")
+        path = getattr(route, "path_format", scope["path"])
+        log.log(
+            level,
+            f"{scope['method']} {path}: {queries.count} queries "
+            f"in {queries.seconds * 1000:.1f} ms",
+            extra={"db_queries": queries.count, "db_time_ms": queries.seconds * 1000},
+        )
+
+
+class TracingMiddleware:
+    """
+    Traces a sample of the requests (or those whose `traceparent` header is
+    sampled) and exports them. Traced responses carry their `traceparent`
+    and, with `timing`, a `Server-Timing` header with the time per layer.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        exporter: SpanExporter,
+        sample_rate: float,
+        timing: bool = True,
+    ):
+        self.app = app
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.timing = timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        traceparent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        root = sample_trace(traceparent, self.sample_rate)
+        if root is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_trace(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("traceparent", root.traceparent)
+                if self.timing:
+                    headers.append("Server-Timing", server_timing(root, time_ns()))
+            await send(message)
+
+        with activate(root):
+            try:
+                await self.app(scope, receive, send_with_trace)
+            finally:
+                route = getattr(scope.get("route"), "path_format", scope["path"])
+                root.name = f"{scope['method']} {route}"
+                root.attributes["http.method"] = scope["method"]
+                root.attributes["http.route"] = route
+        self.exporter.export(root.trace)
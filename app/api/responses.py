@@ -0,0 +1,27 @@
+from typing import Any
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from app.utils.serialization import dumps_trusted
+
+
+class TrustedJSONResponse(ORJSONResponse):
+    """
+    Serializes plain dicts of trusted database rows straight to JSON.
+
+    Returning it from a route skips FastAPI's re-validation of the result
+    against `response_model`, which is still used for the OpenAPI schema.
+    See `dumps_trusted`.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_trusted(content)
+
+
+def etag_headers(etag: str) -> dict:
+    # Responses depend on the user's token, so only private caches may keep
+    # them, and they must revalidate before every reuse.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
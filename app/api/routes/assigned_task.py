@@ -1,14 +1,43 @@
+from typing import List
 from fastapi import Depends
 from app.api.dependencies.auth import get_current_user
 from app.infrastructure.database.models.user import User
 
 from fastapi import APIRouter
-from app.domain.schemas.assigned_task import AssignTask
+from app.domain.schemas.assigned_task import (
+    AssignTask,
+    AssignTaskBatchResult,
+    AssignTaskItem,
+)
 from app.services.assigned_task_service import assigned_task_service
 
 router = APIRouter(prefix="/assigned_task", tags=["Assigned_task"])
 
 
+@router.post("/batch", response_model=AssignTaskBatchResult)
+async def assign_tasks(
+    items: List[AssignTaskItem],
+    current_user: User = Depends(get_current_user),
+) -> AssignTaskBatchResult:
+    """
+    Assign many tasks to existing users by email in a single request.
+
+    Users and tasks are resolved with one query each. The assignment
+    notifications are queued in the outbox and delivered in the background.
+
+    Args:
+        items (List[AssignTaskItem]): Pairs of task ID and user email.
+
+    Returns:
+        AssignTaskBatchResult: Number of assigned tasks and the items that
+        could not be assigned, keyed by their position in the request.
+
+    Raises:
+        HTTPException: 413 if the request has more than BULK_MAX_ITEMS items.
+    """
+    return await assigned_task_service.assign_users_to_tasks(items)
+
+
 @router.post("/{task_id}")
 async def assign_task(
     task_id: int, payload: AssignTask, current_user: User = Depends(get_current_user)
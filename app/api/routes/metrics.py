@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import CONTENT_TYPE, metrics
+
+router = APIRouter(tags=["Ops"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Metrics of this worker in the Prometheus text format, for scrapers.
+
+    Returns:
+        PlainTextResponse: The exposition text.
+    """
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends
+from app.api.dependencies.auth import get_ops_user
+from app.core.logging import logging_stats
+from app.core.tracing import span_exporter
+from app.core.security import current_user_cache, password_hash_pool
+from app.infrastructure.database.models.user import User
+from app.infrastructure.database.pool import pool_stats
+from app.infrastructure.database.routing import replica_stats
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services.task_service import task_service
+
+router = APIRouter(prefix="/ops", tags=["Ops"])
+
+
+@router.get("/stats")
+async def get_stats(current_user: User = Depends(get_ops_user)) -> dict:
+    """
+    Runtime counters of the in-process caches and pools of this worker.
+    Only for the users listed in OPS_ADMIN_EMAILS.
+
+    Returns:
+        dict: Counters per subsystem.
+    """
+    return {
+        "auth_cache": current_user_cache.stats(),
+        "password_hash_pool": password_hash_pool.stats(),
+        "db_pool": pool_stats(),
+        "db_replica": replica_stats(),
+        "notifications": await notification_dispatcher.metrics(),
+        "task_cache": await task_service.cache.stats(),
+        "logging": logging_stats(),
+        "tracing": span_exporter.stats(),
+    }
@@ -1,14 +1,26 @@
-from fastapi import Depends, APIRouter, HTTPException
-from typing import Optional, List
+from fastapi import Depends, APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, List, Literal, Optional
 from app.api.dependencies.auth import get_current_user
+from app.api.responses import TrustedJSONResponse, etag_headers, not_modified
+from app.core.config import settings
 from app.infrastructure.database.models.user import User
 from app.services.task_service import task_service
+from app.utils.etag import etag_matches
+from app.utils.export import EXPORT_MEDIA_TYPES
 from app.domain.schemas.task import (
+    TaskBulkCreateResult,
+    TaskBulkResult,
+    TaskBulkSelection,
+    TaskBulkUpdate,
+    TaskImportResult,
     TaskListCreate,
     TaskCreate,
     TaskUpdate,
     TaskListOut,
+    TaskListPage,
     TaskOut,
+    TaskPage,
 )
 
 
@@ -31,24 +43,52 @@ async def create_list(
     return await task_service.create_list(data)
 
 
-@router.get("/lists", response_model=List[TaskListOut])
-async def get_lists(current_user: User = Depends(get_current_user)) -> List[dict]:
+@router.get("/lists", response_model=TaskListPage)
+async def get_lists(
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
+) -> TaskListPage:
     """
-    Retrieve all task lists with their completion percentage.
+    Retrieve a page of task lists with their completion percentage.
+
+    Task totals are aggregated by the database in a single query, so the
+    tasks themselves are not included in the response. The page carries an
+    ETag built from the versions of its lists; a matching If-None-Match gets
+    304 without reading the page.
+
+    Args:
+        limit (int, optional): Maximum number of lists in the page.
+        cursor (str, optional): `next_cursor` returned by the previous page.
 
     Returns:
-        List[dict]: A list of task lists with metadata.
+        TaskListPage: The lists of the page and the cursor of the next one.
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid.
     """
-    return await task_service.get_all_lists()
+    # The ETag is read before the data, so a concurrent change can only make
+    # it older than the body, which costs a 200 on the next poll at most.
+    etag = await task_service.get_lists_etag(limit, cursor)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    page = await task_service.get_all_lists(limit, cursor, etag)
+    return TrustedJSONResponse(page, headers=etag_headers(etag))
 
 
 @router.get("/lists/{list_id}", response_model=TaskListOut)
 async def get_list(
-    list_id: int, current_user: User = Depends(get_current_user)
+    list_id: int,
+    if_none_match: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user),
 ) -> TaskListOut:
     """
     Get a specific task list by ID, including completion percentage.
 
+    The response carries the version of the list as ETag; a matching
+    If-None-Match gets 304 without loading the tasks.
+
     Args:
         list_id (int): The ID of the task list.
 
@@ -58,10 +98,15 @@ async def get_list(
     Raises:
         HTTPException: 404 if the list is not found.
     """
-    result = await task_service.get_list_with_progress(list_id)
+    etag = await task_service.get_list_etag(list_id)
+    if etag is None:
+        raise HTTPException(status_code=404, detail="Task list not found")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    result = await task_service.get_list_with_progress(list_id, etag)
     if not result:
         raise HTTPException(status_code=404, detail="Task list not found")
-    return result
+    return TrustedJSONResponse(result, headers=etag_headers(etag))
 
 
 @router.post("/lists/{list_id}/tasks", status_code=201, response_model=TaskOut)
@@ -84,25 +129,158 @@ async def create_task(
     return await task_service.create_task(list_id, task)
 
 
-@router.get("/lists/{list_id}/tasks", response_model=List[TaskOut])
+@router.post(
+    "/lists/{list_id}/tasks/bulk",
+    status_code=201,
+    response_model=TaskBulkCreateResult,
+)
+async def bulk_create_tasks(
+    list_id: int,
+    items: List[Dict[str, Any]],
+    current_user: User = Depends(get_current_user),
+) -> TaskBulkCreateResult:
+    """
+    Create many tasks inside a given task list in a single request.
+
+    Every item is validated as a `TaskCreate` on its own: valid items are
+    inserted in batches and invalid ones are reported without failing the
+    whole request.
+
+    Args:
+        list_id (int): The ID of the parent task list.
+        items (List[dict]): Task payloads (title, description, priority).
+
+    Returns:
+        TaskBulkCreateResult: The IDs of the created tasks and the validation
+        errors, both keyed by the position of the item in the request.
+
+    Raises:
+        HTTPException: 404 if the task list does not exist, 413 if the request
+        has more than BULK_MAX_ITEMS items.
+    """
+    return await task_service.bulk_create_tasks(list_id, items)
+
+
+@router.post(
+    "/lists/{list_id}/tasks/import",
+    status_code=201,
+    response_model=TaskImportResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string"}}
+                for media_type in EXPORT_MEDIA_TYPES.values()
+            },
+        }
+    },
+)
+async def import_tasks(
+    list_id: int,
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    current_user: User = Depends(get_current_user),
+) -> TaskImportResult:
+    """
+    Import tasks into a list from a CSV or NDJSON request body.
+
+    The body is parsed while it is received and every row is validated as a
+    `TaskCreate`. Valid rows are written in batches of IMPORT_BATCH_SIZE (COPY
+    on PostgreSQL, multi-row INSERT on SQLite); invalid rows are reported
+    without failing the import.
+
+    Args:
+        list_id (int): The ID of the parent task list.
+        format (str, optional): "ndjson" (default) or "csv" with a header row.
+
+    Returns:
+        TaskImportResult: Imported and failed rows, the first row errors and
+        the throughput in rows per second.
+
+    Raises:
+        HTTPException: 400 if the body is not UTF-8, 404 if the task list does
+            not exist, 413 if a line is longer than IMPORT_MAX_LINE_LENGTH.
+    """
+    return await task_service.import_tasks(list_id, format, request.stream())
+
+
+@router.get("/lists/{list_id}/tasks", response_model=TaskPage)
 async def list_tasks(
     list_id: int,
     completed: Optional[bool] = None,
     priority: Optional[int] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-) -> List[TaskOut]:
+) -> TaskPage:
     """
-    List tasks in a given list, with optional filters by completion and priority.
+    List a page of tasks in a given list, with optional filters by completion
+    and priority.
+
+    The page carries an ETag built from the list version and the query
+    parameters; a matching If-None-Match gets 304 without reading the tasks.
 
     Args:
         list_id (int): The ID of the task list.
         completed (bool, optional): Filter by task completion status.
         priority (int, optional): Filter by task priority (1-5).
+        limit (int, optional): Maximum number of tasks in the page.
+        cursor (str, optional): `next_cursor` returned by the previous page.
 
     Returns:
-        List[dict]: Filtered list of tasks.
+        TaskPage: Filtered tasks of the page and the cursor of the next one.
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid.
+    """
+    etag = await task_service.get_tasks_etag(
+        list_id, completed, priority, limit, cursor
+    )
+    if etag is not None and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    page = await task_service.list_tasks(
+        list_id, completed, priority, limit, cursor, etag
+    )
+    headers = etag_headers(etag) if etag is not None else None
+    return TrustedJSONResponse(page, headers=headers)
+
+
+@router.get("/lists/{list_id}/export", response_class=StreamingResponse)
+async def export_tasks(
+    list_id: int,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    completed: Optional[bool] = None,
+    priority: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Stream every task of a list as NDJSON or CSV, with the same filters as
+    the task listing.
+
+    Tasks are fetched and written in chunks, so memory use does not grow with
+    the size of the list and the download starts before the last chunk is read.
+
+    Args:
+        list_id (int): The ID of the task list.
+        format (str, optional): "ndjson" (default) or "csv".
+        completed (bool, optional): Filter by task completion status.
+        priority (int, optional): Filter by task priority (1-5).
+
+    Returns:
+        StreamingResponse: The tasks, one per line.
+
+    Raises:
+        HTTPException: 404 if the task list does not exist.
     """
-    return await task_service.list_tasks(list_id, completed, priority)
+    stream = await task_service.export_tasks(list_id, format, completed, priority)
+    return StreamingResponse(
+        stream,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="list-{list_id}.{format}"'
+        },
+    )
 
 
 @router.patch("/tasks/{task_id}", response_model=TaskOut)
@@ -145,3 +323,46 @@ async def delete_task(
         HTTPException: 404 if the task does not exist.
     """
     return await task_service.delete_task(task_id)
+
+
+@router.post("/tasks/bulk/update", response_model=TaskBulkResult)
+async def bulk_update_tasks(
+    payload: TaskBulkUpdate, current_user: User = Depends(get_current_user)
+) -> TaskBulkResult:
+    """
+    Apply the same changes to many tasks at once.
+
+    Tasks are selected either by an explicit `ids` list or by a `filter`
+    (list_id, completed, priority) and updated with a single statement (two
+    when `completed` changes, to keep the list progress counters exact).
+
+    Args:
+        payload (TaskBulkUpdate): The selection and the fields to update.
+
+    Returns:
+        TaskBulkResult: Number of updated tasks.
+
+    Raises:
+        HTTPException: 400 if there are no fields to update, 413 if more than
+        BULK_MAX_ITEMS ids are sent.
+    """
+    return await task_service.bulk_update_tasks(payload)
+
+
+@router.post("/tasks/bulk/delete", response_model=TaskBulkResult)
+async def bulk_delete_tasks(
+    payload: TaskBulkSelection, current_user: User = Depends(get_current_user)
+) -> TaskBulkResult:
+    """
+    Delete many tasks at once, selected by `ids` or by a `filter`.
+
+    Args:
+        payload (TaskBulkSelection): The tasks to delete.
+
+    Returns:
+        TaskBulkResult: Number of deleted tasks.
+
+    Raises:
+        HTTPException: 413 if more than BULK_MAX_ITEMS ids are sent.
+    """
+    return await task_service.bulk_delete_tasks(payload)
@@ -0,0 +1,314 @@
+import argparse
+import asyncio
+import math
+import random
+from time import perf_counter
+from typing import Awaitable, Callable, Optional
+import httpx
+import orjson
+from tortoise import Tortoise
+from app.core.config import settings
+from app.core.logging import get_logging
+from app.commands.seed import (
+    PASSWORD,
+    SeedData,
+    add_seed_arguments,
+    seed,
+    seed_config,
+)
+from app.infrastructure.database.db import init_db
+from app.infrastructure.database.migrate import migrate
+from app.main import create_application
+
+log = get_logging(__name__)
+
+PERCENTILES = (50, 95, 99)
+# Relative share of each request in the mix, roughly what the web client does:
+# mostly reads, some edits and the occasional login.
+DEFAULT_MIX = {
+    "login": 2,
+    "list_index": 25,
+    "list_detail": 20,
+    "filtered_tasks": 30,
+    "patch_task": 15,
+    "assign_task": 8,
+}
+
+
+class VirtualUser:
+    """
+    One simulated client: a seeded user sending requests picked from the mix,
+    one at a time.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, data: SeedData, rng: random.Random):
+        self.client = client
+        self.data = data
+        self.rng = rng
+        self.email = rng.choice(data.emails)
+        self.headers: dict = {}
+
+    async def login(self) -> httpx.Response:
+        response = await self.client.post(
+            "/api/auth/login", data={"username": self.email, "password": PASSWORD}
+        )
+        if response.status_code == 200:
+            token = response.json()["access_token"]
+            self.headers = {"Authorization": f"Bearer {token}"}
+        return response
+
+    async def list_index(self) -> httpx.Response:
+        return await self.client.get("/api/task/lists", headers=self.headers)
+
+    async def list_detail(self) -> httpx.Response:
+        list_id = self.rng.choice(self.data.list_ids)
+        return await self.client.get(f"/api/task/lists/{list_id}", headers=self.headers)
+
+    async def filtered_tasks(self) -> httpx.Response:
+        list_id = self.rng.choice(self.data.list_ids)
+        params = {"completed": "false", "priority": self.rng.randint(1, 5)}
+        return await self.client.get(
+            f"/api/task/lists/{list_id}/tasks", params=params, headers=self.headers
+        )
+
+    async def patch_task(self) -> httpx.Response:
+        task_id = self.rng.choice(self.data.task_ids)
+        return await self.client.patch(
+            f"/api/task/tasks/{task_id}",
+            json={"completed": self.rng.random() < 0.5},
+            headers=self.headers,
+        )
+
+    async def assign_task(self) -> httpx.Response:
+        task_id = self.rng.choice(self.data.task_ids)
+        return await self.client.post(
+            f"/api/assigned_task/{task_id}",
+            json={"user_email": self.rng.choice(self.data.emails)},
+            headers=self.headers,
+        )
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of already sorted samples.
+    """
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class LoadRecorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+
+    def record(self, endpoint: str, seconds: float, ok: bool) -> None:
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def report(self, elapsed: float) -> dict:
+        """
+        Returns:
+            dict: Requests, errors, RPS and latency percentiles (ms) per
+            endpoint and for the whole run.
+        """
+        endpoints = {
+            name: self._summary(samples, self.errors.get(name, 0), elapsed)
+            for name, samples in sorted(self.latencies.items())
+        }
+        every = [s for samples in self.latencies.values() for s in samples]
+        total = self._summary(every, sum(self.errors.values()), elapsed)
+        return {"elapsed_s": round(elapsed, 3), "total": total, "endpoints": endpoints}
+
+    @staticmethod
+    def _summary(samples: list[float], errors: int, elapsed: float) -> dict:
+        ordered = sorted(samples)
+        summary = {
+            "requests": len(ordered),
+            "errors": errors,
+            "rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        }
+        for pct in PERCENTILES:
+            summary[f"p{pct}_ms"] = round(percentile(ordered, pct) * 1000, 3)
+        return summary
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    data: SeedData,
+    mix: dict[str, float] = DEFAULT_MIX,
+    concurrency: int = 10,
+    requests: int = 1000,
+    duration: Optional[float] = None,
+    seed: int = 1,
+) -> dict:
+    """
+    Sends the mix of requests from `concurrency` virtual users until
+    `requests` have been sent or `duration` seconds have passed.
+
+    Each virtual user draws from its own random generator, derived from
+    `seed`, so the sequence of requests only depends on the arguments.
+
+    Returns:
+        dict: The report of `LoadRecorder.report`.
+    """
+    recorder = LoadRecorder()
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    users = [
+        VirtualUser(client, data, random.Random(f"{seed}-{i}"))
+        for i in range(concurrency)
+    ]
+    # The first logins happen before the clock starts: a burst of bcrypt
+    # would otherwise weigh on the latency of everything else.
+    await asyncio.gather(*(user.login() for user in users))
+    remaining = requests
+    start = perf_counter()
+    deadline = start + duration if duration else None
+
+    async def timed(endpoint: str, call: Callable[[], Awaitable]) -> None:
+        began = perf_counter()
+        try:
+            response = await call()
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        recorder.record(endpoint, perf_counter() - began, ok)
+
+    async def virtual_user(user: VirtualUser) -> None:
+        nonlocal remaining
+        while remaining > 0 and (deadline is None or perf_counter() < deadline):
+            remaining -= 1
+            name = user.rng.choices(names, weights)[0]
+            await timed(name, getattr(user, name))
+
+    await asyncio.gather(*(virtual_user(user) for user in users))
+    return recorder.report(perf_counter() - start)
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compares a report with a baseline one, endpoint by endpoint.
+
+    Returns:
+        list[str]: The regressions: an endpoint whose p95 grew, or whose RPS
+        fell, by more than `tolerance` (a fraction) of the baseline.
+    """
+    regressions = []
+    for name, before in baseline["endpoints"].items():
+        after = report["endpoints"].get(name)
+        if after is None:
+            continue
+        if after["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {before['p95_ms']} ms -> {after['p95_ms']} ms"
+            )
+        if after["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {before['rps']} -> {after['rps']} RPS")
+    return regressions
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """
+    Parses `name=weight,...` (e.g. `list_index=3,patch_task=1`).
+    """
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown request {name!r}")
+        mix[name] = float(weight)
+    return mix
+
+
+async def main(args: argparse.Namespace) -> int:
+    settings.DATABASE_URL = args.database_url
+    await init_db(None)
+    try:
+        await migrate()
+        config = seed_config(args)
+        data = await seed(config)
+        if args.url:
+            client = httpx.AsyncClient(base_url=args.url, timeout=30)
+        else:
+            transport = httpx.ASGITransport(app=create_application())
+            client = httpx.AsyncClient(transport=transport, base_url="http://loadtest")
+        async with client:
+            report = await run_load(
+                client,
+                data,
+                mix=args.mix,
+                concurrency=args.concurrency,
+                requests=args.requests,
+                duration=args.duration,
+                seed=args.seed,
+            )
+    finally:
+        await Tortoise.close_connections()
+
+    report = {
+        "seed": config._asdict(),
+        "concurrency": args.concurrency,
+        "mix": args.mix,
+        **report,
+    }
+    output = orjson.dumps(report, option=orjson.OPT_INDENT_2).decode()
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline, "rb") as file:
+            baseline = orjson.loads(file.read())
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            log.warning(f"Regression: {regression}")
+        log.info(f"{len(regressions)} regressions against {args.baseline}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Seed synthetic data and measure the RPS and latency percentiles of "
+            "a mix of API requests."
+        )
+    )
+    parser.add_argument(
+        "--database-url",
+        default="sqlite://:memory:",
+        help="Empty database to seed; must be the server's one with --url.",
+    )
+    parser.add_argument(
+        "--url",
+        help="Base URL of a running server. By default the app runs in-process.",
+    )
+    add_seed_arguments(parser)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument(
+        "--duration", type=float, help="Stop after these seconds at the latest."
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=DEFAULT_MIX,
+        help="Weights as name=weight,... (default: %(default)s).",
+    )
+    parser.add_argument("--output", help="Also write the JSON report to this file.")
+    parser.add_argument(
+        "--baseline",
+        help="Report to compare with; exit code 1 on regressions.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.3,
+        help="Allowed p95 growth / RPS drop against the baseline (fraction).",
+    )
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args)))
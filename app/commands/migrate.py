@@ -0,0 +1,37 @@
+import argparse
+import asyncio
+from typing import Optional
+from tortoise import Tortoise
+from app.core.logging import get_logging
+from app.infrastructure.database.db import init_db
+from app.infrastructure.database.migrate import migrate, pending_migrations
+
+log = get_logging(__name__)
+
+
+async def main(target: Optional[int], status: bool) -> int:
+    await init_db(None)
+    try:
+        if status:
+            pending = await pending_migrations()
+            for migration in pending:
+                log.info(f"Pending {migration.version:04d}_{migration.name}")
+            log.info(f"{len(pending)} pending migrations")
+            return 1 if pending else 0
+        applied = await migrate(target=target)
+        log.info(f"{len(applied)} migrations applied")
+    finally:
+        await Tortoise.close_connections()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply the database migrations.")
+    parser.add_argument("--target", type=int, help="Last migration version to apply.")
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Only list the pending migrations (exit code 1 if any).",
+    )
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(target=args.target, status=args.status)))
@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+from tortoise import Tortoise
+from app.core.logging import get_logging
+from app.infrastructure.database.db import init_db
+from app.infrastructure.database.repositories.task_repo import task_repo
+from app.services.task_cache import TaskReadCache, build_task_cache
+
+log = get_logging(__name__)
+
+
+async def repair_counters(fix: bool, cache: TaskReadCache) -> list[dict]:
+    """
+    Compares the progress counters of every task list with the task table
+    and logs (and optionally repairs) the lists that drifted. The cached
+    reads of the repaired lists are dropped.
+
+    Args:
+        fix (bool): Whether the drifted counters should be overwritten.
+        cache (TaskReadCache): Cache of the reads of the lists.
+
+    Returns:
+        list[dict]: The drifted lists.
+    """
+    drifted = await task_repo.recompute_list_counters(fix=fix)
+    for row in drifted:
+        log.warning(
+            f"List {row['id']} counters drifted: "
+            f"stored {row['completed_tasks']}/{row['total_tasks']}, "
+            f"actual {row['actual_completed']}/{row['actual_total']}"
+        )
+    log.info(f"{len(drifted)} task lists with drifted counters")
+    if fix and drifted:
+        await cache.invalidate_lists([row["id"] for row in drifted])
+    return drifted
+
+
+async def main(fix: bool) -> int:
+    await init_db(None)
+    # Only a shared backend (Redis) reaches the servers' caches; an
+    # in-process one is new here, and the servers' entries are keyed by the
+    # list versions the repair bumps.
+    cache = build_task_cache()
+    try:
+        drifted = await repair_counters(fix, cache)
+    finally:
+        await cache.close()
+        await Tortoise.close_connections()
+    return 1 if drifted and not fix else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Detect and repair drift in the task list progress counters."
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only report the drifted lists."
+    )
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(fix=not args.dry_run)))
@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import random
+from typing import NamedTuple
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+from app.core.config import settings
+from app.core.logging import get_logging
+from app.core.security import hash_password
+from app.infrastructure.database.bulk import chunked, insert_returning_ids
+from app.infrastructure.database.db import init_db
+from app.infrastructure.database.migrate import migrate
+from app.infrastructure.database.models.task import Task, TaskList
+from app.infrastructure.database.models.user import User
+from app.infrastructure.database.routing import PRIMARY
+
+log = get_logging(__name__)
+
+PASSWORD = "loadtest-password"
+EMAIL_DOMAIN = "loadtest.example.com"
+
+
+class SeedConfig(NamedTuple):
+    users: int = 20
+    lists: int = 50
+    tasks_per_list: int = 100
+    # Fraction of the tasks assigned to one of the seeded users.
+    assignment_ratio: float = 0.3
+    completed_ratio: float = 0.3
+    seed: int = 1
+
+
+class SeedData(NamedTuple):
+    emails: list[str]
+    list_ids: list[int]
+    task_ids: list[int]
+
+
+async def seed(config: SeedConfig) -> SeedData:
+    """
+    Fills an empty database with synthetic users, lists and tasks. The same
+    config always produces the same rows, so runs against it are comparable.
+
+    Every user has the password `PASSWORD`; it is hashed once and shared, as
+    bcrypt would otherwise dominate the time to seed.
+
+    Args:
+        config (SeedConfig): Volumes to generate and the random seed.
+
+    Returns:
+        SeedData: The emails of the users and the IDs of the lists and tasks.
+    """
+    rng = random.Random(config.seed)
+    hashed = hash_password(PASSWORD)
+    users = [
+        User(
+            email=f"user{i}@{EMAIL_DOMAIN}",
+            hashed_password=hashed,
+            full_name=f"Load Test {i}",
+        )
+        for i in range(config.users)
+    ]
+    lists = [TaskList(name=f"List {i}") for i in range(config.lists)]
+    batch_size = settings.BULK_INSERT_BATCH_SIZE
+    task_ids = []
+    async with in_transaction(PRIMARY) as connection:
+        user_ids = []
+        for batch in chunked(users, batch_size):
+            user_ids.extend(await insert_returning_ids(User, batch, connection))
+        for task_list in lists:
+            rows = [
+                {
+                    "title": f"Task {i}",
+                    "description": f"Synthetic task {i} of {task_list.name}",
+                    "priority": rng.randint(1, 5),
+                    "completed": rng.random() < config.completed_ratio,
+                    "assigned_to_id": (
+                        rng.choice(user_ids)
+                        if user_ids and rng.random() < config.assignment_ratio
+                        else None
+                    ),
+                }
+                for i in range(config.tasks_per_list)
+            ]
+            task_list.total_tasks = len(rows)
+            task_list.completed_tasks = sum(row["completed"] for row in rows)
+            await insert_returning_ids(TaskList, [task_list], connection)
+            tasks = [Task(task_list_id=task_list.pk, **row) for row in rows]
+            for batch in chunked(tasks, batch_size):
+                task_ids.extend(await insert_returning_ids(Task, batch, connection))
+    log.info(f"Seeded {len(users)} users, {len(lists)} lists and {len(task_ids)} tasks")
+    return SeedData(
+        emails=[user.email for user in users],
+        list_ids=[task_list.pk for task_list in lists],
+        task_ids=task_ids,
+    )
+
+
+def add_seed_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = SeedConfig()
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--lists", type=int, default=defaults.lists)
+    parser.add_argument("--tasks-per-list", type=int, default=defaults.tasks_per_list)
+    parser.add_argument(
+        "--assignment-ratio",
+        type=float,
+        default=defaults.assignment_ratio,
+        help="Fraction of the tasks assigned to a user.",
+    )
+    parser.add_argument(
+        "--completed-ratio",
+        type=float,
+        default=defaults.completed_ratio,
+        help="Fraction of the tasks already completed.",
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def seed_config(args: argparse.Namespace) -> SeedConfig:
+    return SeedConfig(
+        users=args.users,
+        lists=args.lists,
+        tasks_per_list=args.tasks_per_list,
+        assignment_ratio=args.assignment_ratio,
+        completed_ratio=args.completed_ratio,
+        seed=args.seed,
+    )
+
+
+async def main(config: SeedConfig) -> int:
+    await init_db(None)
+    try:
+        await migrate()
+        await seed(config)
+    finally:
+        await Tortoise.close_connections()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fill an empty DATABASE_URL with synthetic data (migrating it)."
+    )
+    add_seed_arguments(parser)
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(seed_config(args))))
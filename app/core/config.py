@@ -1,3 +1,4 @@
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -7,9 +8,65 @@ class Settings(BaseSettings):
     WEB_APP_VERSION: str = "1.0.0"
     DEBUGGER: bool = True
     DATABASE_URL: str
+    DATABASE_MIGRATE_ON_STARTUP: bool = False
+    DATABASE_REPLICA_URL: Optional[str] = None
+    DATABASE_READ_YOUR_WRITES_MS: int = 2000
+    DATABASE_POOL_MIN_SIZE: int = 1
+    DATABASE_POOL_MAX_SIZE: int = 10
+    DATABASE_POOL_MAX_QUERIES: int = 50000
+    DATABASE_POOL_MAX_INACTIVE_SECONDS: float = 300.0
+    DATABASE_POOL_ACQUIRE_TIMEOUT_SECONDS: float = 10.0
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: Literal["json", "text"] = "json"
+    LOG_LEVELS: dict[str, str] = {}
+    LOG_SAMPLING: dict[str, float] = {}
+    LOG_QUEUE_SIZE: int = 10000
+    METRICS_ENABLED: bool = True
+    DB_QUERY_DEBUG_HEADERS: bool = False
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATE: float = 0.01
+    TRACING_SERVER_TIMING: bool = True
+    TRACING_EXPORTER: Literal["none", "file", "otlp"] = "none"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318"
+    DB_QUERY_WARN_THRESHOLD: int = 50
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    # Users allowed to read /api/ops/stats; nobody by default.
+    OPS_ADMIN_EMAILS: list[str] = []
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 4
+    SMTP_HOST: Optional[str] = None
+    SMTP_PORT: int = 25
+    SMTP_FROM: str = "no-reply@task-manager.local"
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_STARTTLS: bool = False
+    SMTP_TIMEOUT_SECONDS: float = 10
+    NOTIFICATIONS_DISPATCHER_ENABLED: bool = True
+    NOTIFICATIONS_BATCH_SIZE: int = 100
+    NOTIFICATIONS_POLL_SECONDS: float = 1.0
+    NOTIFICATIONS_MAX_ATTEMPTS: int = 5
+    NOTIFICATIONS_BACKOFF_SECONDS: float = 5.0
+    NOTIFICATIONS_LEASE_SECONDS: float = 60.0
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 500
+    BULK_MAX_ITEMS: int = 10000
+    BULK_INSERT_BATCH_SIZE: int = 1000
+    EXPORT_CHUNK_SIZE: int = 1000
+    IMPORT_BATCH_SIZE: int = 5000
+    IMPORT_MAX_ERRORS: int = 1000
+    IMPORT_MAX_LINE_LENGTH: int = 1024 * 1024
+    TASK_CACHE_BACKEND: Literal["memory", "redis", "none"] = "memory"
+    TASK_CACHE_TTL_SECONDS: float = 30
+    TASK_CACHE_MAX_SIZE: int = 10000
+    TASK_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    TASK_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    TASK_CACHE_REDIS_TIMEOUT_SECONDS: float = 0.5
 
     class Config:
         env_file = ".env"
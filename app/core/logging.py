@@ -1,4 +1,13 @@
+import atexit
 import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+import orjson
+from app.core.config import settings
 
 
 class MyFormat(logging.Formatter):
@@ -21,25 +30,185 @@ class MyFormat(logging.Formatter):
         logging.CRITICAL: f"{asctime} {bold_red} {name} {levelname} {message} {reset}",
     }
 
+    def __init__(self):
+        super().__init__()
+        self._formatters = {
+            level: logging.Formatter(fmt) for level, fmt in self.FORMATS.items()
+        }
+        self._default = logging.Formatter()
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
-        return formatter.format(record)
+        return self._formatters.get(record.levelno, self._default).format(record)
+
+
+# Attributes of every LogRecord; anything else was passed through `extra`.
+RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+}
+
+
+class JSONFormat(logging.Formatter):
+    """
+    One JSON object per line, with the fields given through `extra`
+    (e.g. `db_queries`) next to the standard ones.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
+
+
+class StderrHandler(logging.StreamHandler):
+    """
+    Writes to the current `sys.stderr`, which test runners replace.
+    """
+
+    def __init__(self):
+        super().__init__(sys.stderr)
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of the records below WARNING of the configured loggers
+    (and their children); warnings and errors are never dropped.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: dict[str, float] = {}
+
+    def rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate, parent = 1.0, name
+            while parent:
+                if parent in self.rates:
+                    rate = self.rates[parent]
+                    break
+                parent = parent.rpartition(".")[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands the records to the writer thread; when its queue is full the
+    records are counted and dropped instead of blocking the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # Resolve the message and traceback now, keeping the `extra` fields.
+        prepared = logging.makeLogRecord(record.__dict__)
+        prepared.msg = record.getMessage()
+        prepared.args = None
+        if record.exc_info:
+            prepared.exc_text = logging.Formatter().formatException(record.exc_info)
+            prepared.exc_info = None
+        return prepared
+
+
+_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging() -> None:
+    """
+    Installs the logging pipeline once per process: records go through a
+    queue to a background thread that writes them to stderr, as JSON lines
+    or colored text (LOG_FORMAT). LOG_LEVEL sets the root level, LOG_LEVELS
+    the level of given loggers and LOG_SAMPLING the fraction of their
+    records below WARNING that is kept.
+    """
+    global _handler, _listener
+    if _listener is not None:
+        return
+    output = StderrHandler()
+    output.setFormatter(JSONFormat() if settings.LOG_FORMAT == "json" else MyFormat())
+    _handler = NonBlockingQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE))
+    if settings.LOG_SAMPLING:
+        _handler.addFilter(SamplingFilter(settings.LOG_SAMPLING))
+    root = logging.getLogger()
+    root.addHandler(_handler)
+    root.setLevel(settings.LOG_LEVEL)
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level)
+    _listener = QueueListener(_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """
+    Writes the queued records and stops the writer thread.
+    """
+    global _handler, _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    logging.getLogger().removeHandler(_handler)
+    _handler, _listener = None, None
+
+
+def logging_stats() -> dict:
+    if _handler is None:
+        return {"configured": False}
+    return {
+        "configured": True,
+        "queued": _handler.queue.qsize(),
+        "dropped": _handler.dropped,
+    }
 
 
 def get_logging(mod_name: str) -> logging.Logger:
     """
-    Returns a logger instance with colored output per level.
+    Returns the logger of a module, installing the logging pipeline on first
+    use.
 
     Args:
         mod_name (str): Name of the module to associate with the logger
 
     Returns:
-        logging.Logger: Configured logger
-    """
-    log = logging.getLogger(mod_name)
-    handler = logging.StreamHandler()
-    handler.setFormatter(MyFormat())
-    log.addHandler(handler)
-    log.setLevel(logging.INFO)
-    return log
+        logging.Logger: Logger writing through the shared pipeline
+    """
+    configure_logging()
+    return logging.getLogger(mod_name)
@@ -0,0 +1,146 @@
+"""
+In-process metrics of this worker, rendered in the Prometheus text format by
+`GET /metrics`.
+
+The label set of every route is built once (when the app registers its
+routes) and looked up by `(method, route template)`, so recording a request
+only updates numbers; strings are formatted at scrape time.
+"""
+
+from typing import Iterable, Optional
+from fastapi.routing import APIRoute
+from app.utils.histogram import Histogram
+
+REQUEST_SECONDS_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+PASSWORD_HASH_SECONDS_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2.5)
+# Requests matching no registered route (e.g. 404s) share one label set, so
+# arbitrary paths and methods cannot grow the number of series.
+UNMATCHED = ("", "<unmatched>")
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RouteMetrics:
+    __slots__ = ("labels", "statuses", "seconds", "db_queries", "db_seconds")
+
+    def __init__(self, method: str, route: str):
+        self.labels = f'method="{_label_value(method)}",route="{_label_value(route)}"'
+        self.statuses: dict[int, int] = {}
+        self.seconds = Histogram(REQUEST_SECONDS_BUCKETS)
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.in_flight = 0
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+        self.unmatched = self.route(*UNMATCHED)
+        self.password_hash_seconds = Histogram(PASSWORD_HASH_SECONDS_BUCKETS)
+
+    def register_routes(self, routes: Iterable) -> None:
+        """
+        Allocates the label sets of the API routes ahead of their first
+        request.
+        """
+        for route in routes:
+            if isinstance(route, APIRoute):
+                for method in route.methods:
+                    self.route(method, route.path_format)
+
+    def route(self, method: str, template: str) -> RouteMetrics:
+        key = (method, template)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            metrics = self.routes[key] = RouteMetrics(method, template)
+        return metrics
+
+    def observe_request(
+        self,
+        method: str,
+        template: Optional[str],
+        status: int,
+        seconds: float,
+        db_queries: int = 0,
+        db_seconds: float = 0.0,
+    ) -> None:
+        metrics = self.routes.get((method, template)) or self.unmatched
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+        metrics.seconds.observe(seconds)
+        metrics.db_queries += db_queries
+        metrics.db_seconds += db_seconds
+
+    def render(self) -> str:
+        """
+        Returns:
+            str: Every metric in the Prometheus text exposition format.
+        """
+        routes = list(self.routes.values())
+        lines = [
+            "# HELP http_requests_total Requests answered, per route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for route in routes:
+            for status, count in sorted(route.statuses.items()):
+                lines.append(
+                    f'http_requests_total{{{route.labels},status="{status}"}} {count}'
+                )
+        lines += [
+            "# HELP http_request_duration_seconds Time to answer a request.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for route in routes:
+            lines += _histogram_lines(
+                "http_request_duration_seconds", route.seconds, route.labels
+            )
+        lines += [
+            "# HELP http_requests_in_flight Requests being answered.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP db_queries_total Statements sent to the database, per route.",
+            "# TYPE db_queries_total counter",
+        ]
+        lines += [f"db_queries_total{{{r.labels}}} {r.db_queries}" for r in routes]
+        lines += [
+            "# HELP db_query_seconds_total Time spent in the database, per route.",
+            "# TYPE db_query_seconds_total counter",
+        ]
+        lines += [
+            f"db_query_seconds_total{{{r.labels}}} {r.db_seconds:.6f}" for r in routes
+        ]
+        lines += [
+            "# HELP password_hash_seconds Time to hash or verify a password.",
+            "# TYPE password_hash_seconds histogram",
+            *_histogram_lines("password_hash_seconds", self.password_hash_seconds),
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(name: str, histogram: Histogram, labels: str = "") -> list[str]:
+    prefix = f"{labels}," if labels else ""
+    lines = [
+        f'{name}_bucket{{{prefix}le="{bound}"}} {count}'
+        for bound, count in histogram.cumulative()
+    ]
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.sum:.6f}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
+
+
+metrics = MetricsRegistry()
@@ -1,11 +1,83 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt
+from time import perf_counter
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.tracing import traced
+from app.utils.cache import TTLCache
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified access token -> active user. Entries never outlive the token and are
+# dropped through `invalidate_cached_user` when the user changes in this worker;
+# other workers pick the change up after AUTH_CACHE_TTL_SECONDS at most.
+current_user_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+
+class PasswordHashPool:
+    """
+    Runs bcrypt in a dedicated bounded thread pool so that hashing does not
+    block the event loop (bcrypt releases the GIL while it works).
+
+    At most `max_pending` operations are handed to the pool at once; the rest
+    wait on a semaphore, so a login storm queues cheaply in the event loop and
+    cancelled requests never leave orphaned work behind in the pool.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max(max_pending, workers)
+        self.waiting = 0
+        self.in_flight = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._loop = None
+        self._slots = None
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def run(self, func, *args):
+        slots = self._get_slots()
+        self.waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        start = perf_counter()
+        try:
+            return await self._loop.run_in_executor(self._executor, func, *args)
+        finally:
+            metrics.password_hash_seconds.observe(perf_counter() - start)
+            self.in_flight -= 1
+            slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+        }
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -15,6 +87,16 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+@traced("auth.hash_password", "auth")
+async def hash_password_async(password: str) -> str:
+    return await password_hash_pool.run(hash_password, password)
+
+
+@traced("auth.verify_password", "auth")
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await password_hash_pool.run(verify_password, plain, hashed)
+
+
 def create_access_token(data: dict, expires_delta: int = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(
@@ -22,3 +104,7 @@ def create_access_token(data: dict, expires_delta: int = None):
     )
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def invalidate_cached_user(email: str) -> int:
+    return current_user_cache.discard_where(lambda user: user.email == email)
@@ -0,0 +1,391 @@
+"""
+Lightweight request tracing.
+
+A sampled request opens a root span (see `TracingMiddleware`); the
+functions and classes marked with `traced`/`trace_methods` and every
+database statement open child spans of the current one. Outside a sampled
+request they only read a context variable.
+
+Finished traces are exported from a background thread as OTLP/JSON, to a
+file or to an OTLP/HTTP collector. Trace ids follow W3C Trace Context, so
+an incoming `traceparent` header continues the caller's trace.
+"""
+
+import abc
+import functools
+import inspect
+import os
+import queue
+import random
+import re
+import threading
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import time_ns
+from typing import Iterator, Optional
+import orjson
+from app.core.config import settings
+from app.core.logging import get_logging
+
+log = get_logging(__name__)
+
+TRACEPARENT = re.compile(r"00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+# Layers summarized by the Server-Timing header, outermost first.
+PHASES = ("auth", "service", "repo", "db")
+LAYERS = {kind: rank for rank, kind in enumerate(PHASES)}
+# OTLP span kinds.
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+
+class Trace:
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: list[Span] = []
+
+
+class Span:
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_id",
+        "outer_layer",
+        "layer",
+        "name",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+    )
+
+    def __init__(
+        self,
+        trace: Trace,
+        name: str,
+        kind: str,
+        parent_id: Optional[str] = None,
+        outer_layer: int = -1,
+        attributes: Optional[dict] = None,
+    ):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        # Rank in PHASES of the innermost layer among the ancestors (-1 for
+        # none), and the same including this span.
+        self.outer_layer = outer_layer
+        self.layer = max(outer_layer, LAYERS.get(kind, -1))
+        self.name = name
+        self.kind = kind
+        self.start_ns = time_ns()
+        self.end_ns = 0
+        self.attributes = attributes or {}
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace.trace_id}-{self.span_id}-01"
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def sample_trace(traceparent: Optional[str], rate: float) -> Optional[Span]:
+    """
+    Decides whether a request is traced: a valid `traceparent` keeps the
+    caller's decision, otherwise `rate` of the requests are.
+
+    Returns:
+        Optional[Span]: The unstarted root span, or None if not sampled.
+    """
+    match = TRACEPARENT.fullmatch(traceparent or "")
+    if match:
+        trace_id, parent_id, flags = match.groups()
+        if not int(flags, 16) & 1:
+            return None
+        return Span(Trace(trace_id), "", "server", parent_id)
+    if rate <= 0 or random.random() >= rate:
+        return None
+    return Span(Trace(os.urandom(16).hex()), "", "server")
+
+
+@contextmanager
+def activate(span: Span) -> Iterator[Span]:
+    """
+    Makes `span` the current one for the block, then ends it.
+    """
+    token = _current_span.set(span)
+    span.start_ns = time_ns()
+    try:
+        yield span
+    finally:
+        span.end_ns = time_ns()
+        _current_span.reset(token)
+        span.trace.spans.append(span)
+
+
+@contextmanager
+def start_span(name: str, kind: str = "internal", **attributes) -> Iterator:
+    """
+    Opens a child of the current span; does nothing if there is none.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    span = Span(
+        parent.trace, name, kind, parent.span_id, parent.layer, attributes or None
+    )
+    with activate(span):
+        yield span
+
+
+def traced(name: str, kind: str = "internal"):
+    """
+    Decorator opening a span around each call of a coroutine function.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return await func(*args, **kwargs)
+            with start_span(name, kind):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_methods(kind: str):
+    """
+    Class decorator tracing every public coroutine method, as
+    `ClassName.method` spans of the given kind (e.g. "service").
+    """
+
+    def decorator(cls):
+        for name, attr in list(vars(cls).items()):
+            if not name.startswith("_") and inspect.iscoroutinefunction(attr):
+                setattr(cls, name, traced(f"{cls.__name__}.{name}", kind)(attr))
+        return cls
+
+    return decorator
+
+
+def server_timing(root: Span, end_ns: int) -> str:
+    """
+    Summarizes a request for the `Server-Timing` header: the time spent in
+    each layer, the rest of the app (routing, validation, serialization) and
+    the total, in milliseconds.
+
+    A layer includes the deeper layers it calls (a service its repositories,
+    which include their queries). A span nested in its own or a deeper layer,
+    such as the password hashing of `AuthService.login_user`, is part of
+    that layer's time and is not counted again.
+    """
+    totals = dict.fromkeys(PHASES, 0)
+    outermost = 0
+    for span in root.trace.spans:
+        rank = LAYERS.get(span.kind)
+        if rank is None or rank <= span.outer_layer:
+            continue
+        duration = span.end_ns - span.start_ns
+        totals[span.kind] += duration
+        if span.outer_layer < 0:
+            outermost += duration
+    total = end_ns - root.start_ns
+    app = max(total - outermost, 0)
+    parts = [f"{name};dur={ns / 1e6:.2f}" for name, ns in totals.items() if ns]
+    parts.append(f"app;dur={app / 1e6:.2f}")
+    parts.append(f"total;dur={total / 1e6:.2f}")
+    return ", ".join(parts)
+
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+SPAN_KINDS = {"server": SPAN_KIND_SERVER, "db": SPAN_KIND_CLIENT}
+
+
+def otlp_payload(traces: list[Trace]) -> dict:
+    """
+    Returns:
+        dict: The spans of the traces as an OTLP/JSON export request.
+    """
+    spans = []
+    for trace in traces:
+        for span in trace.spans:
+            entry = {
+                "traceId": trace.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": SPAN_KINDS.get(span.kind, SPAN_KIND_INTERNAL),
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": [
+                    _attribute("app.layer", span.kind),
+                    *(_attribute(k, v) for k, v in span.attributes.items()),
+                ],
+            }
+            if span.parent_id:
+                entry["parentSpanId"] = span.parent_id
+            spans.append(entry)
+    service = _attribute("service.name", settings.WEB_APP_TITLE)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [service]},
+                "scopeSpans": [{"scope": {"name": "app"}, "spans": spans}],
+            }
+        ]
+    }
+
+
+class SpanExporter(abc.ABC):
+    """
+    Queues finished traces and writes them in batches from a background
+    thread. When the queue is full, traces are counted and dropped.
+    """
+
+    _STOP = object()
+
+    def __init__(self, max_queue: int = 2048, batch_size: int = 64):
+        self.queue: queue.Queue = queue.Queue(max_queue)
+        self.batch_size = batch_size
+        self.exported = 0
+        self.dropped = 0
+        self.errors = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="span-exporter", daemon=True
+                    )
+                    self._thread.start()
+        try:
+            self.queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            item = self.queue.get()
+            batch = []
+            while item is not self._STOP:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    self.write(otlp_payload(batch))
+                    self.exported += len(batch)
+                except Exception as exc:
+                    self.errors += 1
+                    log.warning(f"Could not export {len(batch)} traces: {exc!r}")
+            if item is self._STOP:
+                return
+
+    @abc.abstractmethod
+    def write(self, payload: dict) -> None:
+        """
+        Sends one OTLP/JSON export request built by `otlp_payload`. Runs in
+        the exporter thread; exceptions are counted as errors and the batch
+        is dropped.
+        """
+
+    def shutdown(self) -> None:
+        """
+        Exports the queued traces and stops the thread.
+        """
+        if self._thread is not None:
+            self.queue.put(self._STOP)
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "queued": self.queue.qsize(),
+        }
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Appends one OTLP/JSON export request per line, as the file exporter of
+    the OpenTelemetry Collector does.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+
+    def write(self, payload: dict) -> None:
+        with open(self.path, "ab") as file:
+            file.write(orjson.dumps(payload) + b"\n")
+
+
+class OTLPSpanExporter(SpanExporter):
+    """
+    Posts OTLP/JSON to the `/v1/traces` endpoint of an OTLP/HTTP collector.
+    """
+
+    def __init__(self, endpoint: str, timeout: float = 5, **kwargs):
+        super().__init__(**kwargs)
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.timeout = timeout
+
+    def write(self, payload: dict) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class NullSpanExporter(SpanExporter):
+    def export(self, trace: Trace) -> None:
+        pass
+
+    def write(self, payload: dict) -> None:
+        pass
+
+
+def build_span_exporter() -> SpanExporter:
+    """
+    Builds the exporter configured by the TRACING_* settings.
+    """
+    if settings.TRACING_EXPORTER == "file":
+        return FileSpanExporter(settings.TRACING_FILE_PATH)
+    if settings.TRACING_EXPORTER == "otlp":
+        return OTLPSpanExporter(settings.TRACING_OTLP_ENDPOINT)
+    return NullSpanExporter()
+
+
+span_exporter = build_span_exporter()
@@ -1,5 +1,21 @@
 from pydantic import BaseModel, EmailStr
+from typing import List
 
 
 class AssignTask(BaseModel):
     user_email: EmailStr
+
+
+class AssignTaskItem(BaseModel):
+    task_id: int
+    user_email: EmailStr
+
+
+class AssignTaskError(BaseModel):
+    index: int
+    detail: str
+
+
+class AssignTaskBatchResult(BaseModel):
+    assigned: int
+    errors: List[AssignTaskError] = []
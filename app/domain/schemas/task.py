@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, field_validator, model_validator
+from typing import Any, Optional, List
 from datetime import datetime
 
 
@@ -21,6 +21,14 @@ class TaskUpdate(BaseModel):
     class Config:
         from_attributes = True
 
+    @field_validator("title", "priority", "completed")
+    @classmethod
+    def not_null(cls, value):
+        # Omit a field to leave it unchanged; the columns are NOT NULL.
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 
 class TaskOut(BaseModel):
     id: int
@@ -34,6 +42,10 @@ class TaskOut(BaseModel):
         from_attributes = True
 
 
+# Columns read by projections that build TaskOut without validation.
+TASK_OUT_FIELDS = tuple(TaskOut.model_fields)
+
+
 class TaskListCreate(BaseModel):
     name: str
 
@@ -47,3 +59,75 @@ class TaskListOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TaskListSummaryOut(BaseModel):
+    id: int
+    name: str
+    created_at: datetime
+    total_tasks: int = 0
+    completed_tasks: int = 0
+    completed_percentage: float = 0.0
+
+    class Config:
+        from_attributes = True
+
+
+class TaskPage(BaseModel):
+    items: List[TaskOut] = []
+    next_cursor: Optional[str] = None
+
+
+class TaskListPage(BaseModel):
+    items: List[TaskListSummaryOut] = []
+    next_cursor: Optional[str] = None
+
+
+class TaskBulkCreated(BaseModel):
+    index: int
+    id: int
+
+
+class TaskBulkError(BaseModel):
+    index: int
+    errors: List[Any]
+
+
+class TaskBulkCreateResult(BaseModel):
+    created: List[TaskBulkCreated] = []
+    errors: List[TaskBulkError] = []
+
+
+class TaskImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[TaskBulkError] = []
+    seconds: float
+    rows_per_second: float
+
+
+class TaskFilter(BaseModel):
+    list_id: Optional[int] = None
+    completed: Optional[bool] = None
+    priority: Optional[int] = None
+
+
+class TaskBulkSelection(BaseModel):
+    ids: Optional[List[int]] = None
+    filter: Optional[TaskFilter] = None
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide either ids or filter")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("filter needs at least one criterion")
+        return self
+
+
+class TaskBulkUpdate(TaskBulkSelection):
+    patch: TaskUpdate
+
+
+class TaskBulkResult(BaseModel):
+    affected: int
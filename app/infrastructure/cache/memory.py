@@ -0,0 +1,37 @@
+from typing import Optional
+from app.utils.cache import TTLCache
+
+
+class MemoryCacheBackend:
+    """
+    Byte-valued cache kept in the memory of this worker: an LRU bounded both
+    by entry count and by the total size of the values, with a TTL per entry.
+
+    Counters set through `incr` are kept apart from the entries so that they
+    are never evicted.
+    """
+
+    def __init__(self, maxsize: int, maxbytes: int):
+        self.entries = TTLCache(
+            maxsize=maxsize, ttl=float("inf"), maxbytes=maxbytes, sizeof=len
+        )
+        self.counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.entries.set(key, value, ttl=ttl)
+
+    async def get_counters(self, keys: list[str]) -> list[int]:
+        return [self.counters.get(key, 0) for key in keys]
+
+    async def incr(self, keys: list[str]) -> None:
+        for key in keys:
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+    async def stats(self) -> dict:
+        return {"backend": "memory", **self.entries.stats()}
+
+    async def close(self) -> None:
+        self.entries.clear()
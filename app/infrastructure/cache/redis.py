@@ -0,0 +1,178 @@
+import asyncio
+from typing import Any, Optional
+from urllib.parse import urlsplit
+from app.core.logging import get_logging
+
+log = get_logging(__name__)
+
+
+class CacheServerError(Exception):
+    """Error reply sent by the cache server."""
+
+
+def encode_command(*args: Any) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by the cache server")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        raise CacheServerError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        count = int(rest)
+        if count < 0:
+            return None
+        return [await read_reply(reader) for _ in range(count)]
+    raise CacheServerError(f"Unexpected reply: {line!r}")
+
+
+def parse_info(text: bytes) -> dict:
+    fields = {}
+    for line in text.decode().splitlines():
+        if ":" in line and not line.startswith("#"):
+            name, value = line.split(":", 1)
+            fields[name] = value
+    return fields
+
+
+class RedisCacheBackend:
+    """
+    Byte-valued cache served by any server speaking the Redis protocol
+    (RESP2), so every worker shares the entries and the invalidations.
+
+    One connection is kept and used by one command or pipeline at a time.
+    Errors and timeouts are counted and then behave as misses: the cache must
+    never fail a request. Counters are stored without TTL, so the server
+    should evict with a `volatile-*` policy.
+    """
+
+    def __init__(self, url: str, timeout: float):
+        parsed = urlsplit(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            await self._roundtrip(setup)
+
+    async def _roundtrip(self, commands: list[tuple]) -> list:
+        self._writer.write(b"".join(encode_command(*command) for command in commands))
+        await self._writer.drain()
+        return [await read_reply(self._reader) for _ in commands]
+
+    async def execute(self, *commands: tuple) -> list:
+        """
+        Sends the commands in one pipeline and returns their replies.
+
+        Raises:
+            CacheServerError, OSError, asyncio.TimeoutError: The connection is
+            dropped and reopened by the next call.
+        """
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await asyncio.wait_for(self._connect(), self.timeout)
+                return await asyncio.wait_for(
+                    self._roundtrip(list(commands)), self.timeout
+                )
+            except BaseException:
+                await self._disconnect()
+                raise
+
+    async def _safe_execute(self, *commands: tuple) -> Optional[list]:
+        try:
+            return await self.execute(*commands)
+        except (CacheServerError, OSError, asyncio.TimeoutError) as exc:
+            self.errors += 1
+            log.warning(f"Cache server unavailable: {exc!r}")
+            return None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        replies = await self._safe_execute(("GET", key))
+        value = replies[0] if replies else None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._safe_execute(("SET", key, value, "PX", int(ttl * 1000)))
+
+    async def get_counters(self, keys: list[str]) -> Optional[list[int]]:
+        """
+        Returns:
+            Optional[list[int]]: The counters, or None if the server is
+            unavailable, in which case nothing should be cached.
+        """
+        replies = await self._safe_execute(("MGET", *keys))
+        if replies is None:
+            return None
+        return [int(value or 0) for value in replies[0]]
+
+    async def incr(self, keys: list[str]) -> None:
+        await self._safe_execute(*[("INCR", key) for key in keys])
+
+    async def stats(self) -> dict:
+        replies = await self._safe_execute(("INFO", "memory"), ("INFO", "stats"))
+        lookups = self.hits + self.misses
+        stats = {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+        if replies:
+            info = {**parse_info(replies[0]), **parse_info(replies[1])}
+            stats.update(
+                bytes=int(info.get("used_memory", 0)),
+                maxbytes=int(info.get("maxmemory", 0)),
+                evictions=int(info.get("evicted_keys", 0)),
+            )
+        return stats
+
+    async def _disconnect(self):
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._disconnect()
@@ -0,0 +1,181 @@
+from typing import Iterable, Optional, Type, Union
+from pypika.terms import Criterion
+from tortoise import BaseDBAsyncClient, Model
+from tortoise.queryset import DeleteQuery, UpdateQuery
+
+
+def chunked(items: list, size: int) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+async def insert_returning_ids(
+    model: Type[Model], objects: list[Model], connection: BaseDBAsyncClient
+) -> list[int]:
+    """
+    Inserts the objects with a single multi-row INSERT ... RETURNING statement.
+
+    Unlike `Model.bulk_create`, the generated primary keys are returned (and set
+    on the objects). Supported by PostgreSQL and SQLite >= 3.35.
+
+    Args:
+        model (Type[Model]): Model of the objects.
+        objects (list[Model]): Unsaved instances to insert.
+        connection (BaseDBAsyncClient): Connection or transaction to use.
+
+    Returns:
+        list[int]: The primary keys of the inserted rows, in insertion order.
+    """
+    # RETURNING does not promise an order, but keys generated by a single
+    # statement grow with the VALUES order, so sorting them restores it.
+    if not objects:
+        return []
+    executor = connection.executor_class(model=model, db=connection)
+    fields = executor.regular_columns
+    meta = model._meta
+    columns = [meta.fields_db_projection[field] for field in fields]
+
+    query = connection.query_class.into(meta.basetable).columns(*columns)
+    values = []
+    for obj in objects:
+        params = [executor.parameter(len(values) + i) for i in range(len(fields))]
+        query = query.insert(*params)
+        values.extend(
+            executor.column_map[field](getattr(obj, field), obj) for field in fields
+        )
+
+    sql = f'{query.get_sql()} RETURNING "{meta.db_pk_column}"'
+    _, rows = await connection.execute_query(sql, values)
+    ids = sorted(row[0] for row in rows)
+    for obj, pk in zip(objects, ids):
+        obj.pk = pk
+        obj._saved_in_db = True
+    return ids
+
+
+async def update_returning(
+    model: Type[Model],
+    pk: int,
+    data: dict,
+    connection: BaseDBAsyncClient,
+    exclude: Optional[dict] = None,
+    only_changes: bool = False,
+) -> Optional[Model]:
+    """
+    Updates only the given fields of one row with a single
+    UPDATE ... RETURNING statement and builds the instance from the result.
+
+    Args:
+        model (Type[Model]): Model of the row.
+        pk (int): Primary key of the row.
+        data (dict): Field name -> new value.
+        connection (BaseDBAsyncClient): Connection or transaction to use.
+        exclude (Optional[dict]): Field name -> value the row must NOT have
+            for the update to apply, like `QuerySet.exclude`.
+        only_changes (bool): Skip the row when it already holds every value
+            of `data`.
+
+    Returns:
+        Optional[Model]: The updated instance, or None if no row matched.
+    """
+    executor = connection.executor_class(model=model, db=connection)
+    meta = model._meta
+    table = meta.basetable
+
+    query = connection.query_class.update(table)
+    values = []
+    for field, value in data.items():
+        query = query.set(
+            meta.fields_db_projection[field], executor.parameter(len(values))
+        )
+        values.append(executor.column_map[field](value, model))
+    query = query.where(table[meta.db_pk_column] == executor.parameter(len(values)))
+    values.append(pk)
+    for field, value in (exclude or {}).items():
+        column = table[meta.fields_db_projection[field]]
+        query = query.where(column != executor.parameter(len(values)))
+        values.append(executor.column_map[field](value, model))
+    if only_changes:
+        differs = []
+        for field, value in data.items():
+            column = table[meta.fields_db_projection[field]]
+            if value is None:
+                differs.append(column.notnull())
+                continue
+            differs.append(
+                (column != executor.parameter(len(values))) | column.isnull()
+            )
+            values.append(executor.column_map[field](value, model))
+        query = query.where(Criterion.any(differs))
+
+    _, rows = await connection.execute_query(f"{query.get_sql()} RETURNING *", values)
+    return model._init_from_db(**dict(rows[0])) if rows else None
+
+
+async def copy_rows(
+    model: Type[Model],
+    objects: list[Model],
+    connection: BaseDBAsyncClient,
+    insert_batch_size: int = 1000,
+) -> int:
+    """
+    Writes the objects as fast as the backend allows, without returning keys:
+    COPY on PostgreSQL, multi-row INSERT statements of `insert_batch_size`
+    rows elsewhere.
+
+    Args:
+        model (Type[Model]): Model of the objects.
+        objects (list[Model]): Unsaved instances to write.
+        connection (BaseDBAsyncClient): Connection or transaction to use.
+        insert_batch_size (int): Rows per INSERT when COPY is not available.
+
+    Returns:
+        int: Number of written rows.
+    """
+    if not objects:
+        return 0
+    if connection.capabilities.dialect != "postgres":
+        for batch in chunked(objects, insert_batch_size):
+            await insert_returning_ids(model, batch, connection)
+        return len(objects)
+
+    executor = connection.executor_class(model=model, db=connection)
+    fields = executor.regular_columns
+    meta = model._meta
+    records = [
+        tuple(executor.column_map[field](getattr(obj, field), obj) for field in fields)
+        for obj in objects
+    ]
+    async with connection.acquire_connection() as raw_connection:
+        await raw_connection.copy_records_to_table(
+            meta.db_table,
+            records=records,
+            columns=[meta.fields_db_projection[field] for field in fields],
+        )
+    return len(objects)
+
+
+async def execute_returning(
+    query: Union[UpdateQuery, DeleteQuery], columns: tuple[str, ...]
+) -> list[dict]:
+    """
+    Runs a `QuerySet.update(...)` or `QuerySet.delete()` query with a
+    RETURNING clause, so the caller learns exactly which rows the statement
+    changed instead of reading them in a separate, racy SELECT. Supported by
+    PostgreSQL and SQLite >= 3.35.
+
+    Args:
+        query (Union[UpdateQuery, DeleteQuery]): The unawaited query, e.g.
+            bound to a transaction with `using_db`.
+        columns (tuple[str, ...]): Database columns to return.
+
+    Returns:
+        list[dict]: One dict per changed row.
+    """
+    if query._db is None:
+        query._db = query._choose_db(True)
+    query._make_query()
+    returning = ", ".join(f'"{column}"' for column in columns)
+    sql = f"{query.query.get_sql()} RETURNING {returning}"
+    _, rows = await query._db.execute_query(sql, getattr(query, "values", None))
+    return [dict(row) for row in rows]
@@ -1,16 +1,65 @@
-from tortoise import Tortoise
+from tortoise import Tortoise, connections
+from tortoise.backends.base.config_generator import generate_config
 from fastapi import FastAPI
 from app.core.config import settings
+from app.infrastructure.database.instrumentation import instrument_queries
+from app.infrastructure.database.migrate import migrate
+from app.infrastructure.database.routing import REPLICA
+
+MODELS = [
+    "app.infrastructure.database.models.user",
+    "app.infrastructure.database.models.task",
+    "app.infrastructure.database.models.notification",
+]
+
+
+def _pooled(connection: dict) -> None:
+    if connection["engine"] == "tortoise.backends.asyncpg":
+        connection["engine"] = "app.infrastructure.database.pool"
+        connection["credentials"].update(
+            minsize=settings.DATABASE_POOL_MIN_SIZE,
+            maxsize=settings.DATABASE_POOL_MAX_SIZE,
+            max_queries=settings.DATABASE_POOL_MAX_QUERIES,
+            max_inactive_connection_lifetime=(
+                settings.DATABASE_POOL_MAX_INACTIVE_SECONDS
+            ),
+            statement_cache_size=settings.DATABASE_STATEMENT_CACHE_SIZE,
+            acquire_timeout=settings.DATABASE_POOL_ACQUIRE_TIMEOUT_SECONDS,
+        )
+
+
+def database_config() -> dict:
+    """
+    Tortoise config for DATABASE_URL. PostgreSQL uses the instrumented
+    asyncpg engine with the DATABASE_POOL_* settings.
+
+    With DATABASE_REPLICA_URL, a `replica` connection is added together with
+    the router that sends the reads of safe requests to it (see `routing`).
+    """
+    config = generate_config(settings.DATABASE_URL, {"models": MODELS})
+    _pooled(config["connections"]["default"])
+    if settings.DATABASE_REPLICA_URL:
+        replica = generate_config(settings.DATABASE_REPLICA_URL, {})
+        config["connections"][REPLICA] = replica["connections"]["default"]
+        _pooled(config["connections"][REPLICA])
+        config["routers"] = ["app.infrastructure.database.routing.ReplicaRouter"]
+    return config
 
 
 async def init_db(app: FastAPI) -> None:
-    await Tortoise.init(
-        db_url=settings.DATABASE_URL,
-        modules={
-            "models": [
-                "app.infrastructure.database.models.user",
-                "app.infrastructure.database.models.task",
-            ]
-        },
-    )
-    await Tortoise.generate_schemas()
+    """
+    Connects Tortoise to the database. The schema is not inspected nor
+    created: it is managed by `python -m app.commands.migrate`, or applied
+    here when DATABASE_MIGRATE_ON_STARTUP is set (e.g. for SQLite in
+    development).
+    """
+    await Tortoise.init(config=database_config())
+    instrument_queries()
+    if settings.DATABASE_MIGRATE_ON_STARTUP:
+        await migrate()
+        if settings.DATABASE_REPLICA_URL:
+            replica = connections.get(REPLICA)
+            # A real replica gets the schema from the primary; a local SQLite
+            # stand-in has to be created.
+            if replica.capabilities.dialect == "sqlite":
+                await migrate(replica)
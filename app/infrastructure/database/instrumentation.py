@@ -0,0 +1,124 @@
+"""
+Counts the statements sent to the database, and the time spent in them, per
+unit of work (e.g. a request), and opens a span per statement in traced
+requests.
+
+`instrument_queries` wraps the query methods of the Tortoise clients in use,
+once per process; `track_queries` opens the unit of work. Outside of it the
+wrappers only check a context variable. Units of work nest: a statement
+counts in every open one, so a test can measure whole requests.
+"""
+
+import functools
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator, Optional
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from app.core.tracing import current_span, start_span
+
+QUERY_METHODS = (
+    "execute_insert",
+    "execute_many",
+    "execute_query",
+    "execute_query_dict",
+    "execute_script",
+)
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds", "queries")
+
+    def __init__(self, record: bool = False):
+        self.count = 0
+        self.seconds = 0.0
+        # The statements themselves, only kept when asked for.
+        self.queries: Optional[list[str]] = [] if record else None
+
+
+_current: ContextVar[tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+# Set while a statement runs, so the methods calling each other count once.
+_in_query: ContextVar[bool] = ContextVar("in_query", default=False)
+
+
+@contextmanager
+def track_queries(record: bool = False) -> Iterator[QueryStats]:
+    """
+    Counts the statements run by the current context and the tasks it starts,
+    and keeps their text in `queries` when `record` is set.
+    """
+    stats = QueryStats(record)
+    token = _current.set(_current.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """
+    The innermost open unit of work, if any.
+    """
+    tracked = _current.get()
+    return tracked[-1] if tracked else None
+
+
+def _timed(method):
+    span_name = f"db.{method.__name__}"
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        tracked = _current.get()
+        if (not tracked and current_span() is None) or _in_query.get():
+            return await method(self, *args, **kwargs)
+        token = _in_query.set(True)
+        query = args[0] if args else ""
+        for stats in tracked:
+            if stats.queries is not None:
+                stats.queries.append(query)
+        start = perf_counter()
+        try:
+            # Only the verb: statements may inline user data.
+            operation = query.lstrip().split(" ", 1)[0].upper()
+            with start_span(span_name, "db", **{"db.operation": operation}):
+                return await method(self, *args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            for stats in tracked:
+                stats.seconds += elapsed
+                stats.count += 1
+            _in_query.reset(token)
+
+    wrapper.instrumented = True
+    return wrapper
+
+
+def _client_classes(client: BaseDBAsyncClient) -> set[type]:
+    """
+    The classes defining the query methods of a client and of the
+    transactions it opens, which live in a sibling `TransactionWrapper`.
+    """
+    classes = set()
+    for cls in type(client).__mro__:
+        if not issubclass(cls, BaseDBAsyncClient) or cls is BaseDBAsyncClient:
+            continue
+        classes.add(cls)
+        wrapper = getattr(sys.modules[cls.__module__], "TransactionWrapper", None)
+        if isinstance(wrapper, type) and issubclass(wrapper, cls):
+            classes.add(wrapper)
+    return classes
+
+
+def instrument_queries() -> None:
+    """
+    Wraps the query methods of the clients of every configured connection.
+    Safe to call more than once.
+    """
+    for client in connections.all():
+        for cls in _client_classes(client):
+            for name in QUERY_METHODS:
+                method = cls.__dict__.get(name)
+                if method is not None and not getattr(method, "instrumented", False):
+                    setattr(cls, name, _timed(method))
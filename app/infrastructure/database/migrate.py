@@ -0,0 +1,150 @@
+import importlib
+import pkgutil
+import re
+from typing import Awaitable, Callable, NamedTuple, Optional
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+from app.core.logging import get_logging
+
+log = get_logging(__name__)
+
+MIGRATIONS_PACKAGE = "app.infrastructure.database.migrations"
+MIGRATION_NAME = re.compile(r"(\d{4})_(\w+)")
+SUPPORTED_DIALECTS = ("sqlite", "postgres")
+# Serializes concurrent runs against the same PostgreSQL database.
+ADVISORY_LOCK_ID = 7_140_017
+
+CREATE_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS "schema_migrations" (
+    "version" INT NOT NULL PRIMARY KEY,
+    "name" VARCHAR(255) NOT NULL,
+    "applied_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    upgrade: Callable[[BaseDBAsyncClient, str], Awaitable[None]]
+
+
+def load_migrations(package: str = MIGRATIONS_PACKAGE) -> list[Migration]:
+    """
+    Imports the `NNNN_name` modules of the migrations package.
+
+    Returns:
+        list[Migration]: The migrations sorted by version.
+
+    Raises:
+        ValueError: If two modules share a version.
+    """
+    migrations = []
+    for module in pkgutil.iter_modules(importlib.import_module(package).__path__):
+        match = MIGRATION_NAME.fullmatch(module.name)
+        if match:
+            upgrade = importlib.import_module(f"{package}.{module.name}").upgrade
+            migrations.append(Migration(int(match[1]), match[2], upgrade))
+    migrations.sort()
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicated migration versions in {package}")
+    return migrations
+
+
+async def execute(connection: BaseDBAsyncClient, statements: list[str]) -> None:
+    """
+    Runs the statements one by one, since SQLite scripts commit the
+    surrounding transaction.
+    """
+    for statement in statements:
+        await connection.execute_query(statement)
+
+
+async def lock_migrations(connection: BaseDBAsyncClient) -> None:
+    """
+    Takes the advisory lock on PostgreSQL until the end of the transaction
+    of `connection`.
+    """
+    if connection.capabilities.dialect == "postgres":
+        await connection.execute_query(
+            f"SELECT pg_advisory_xact_lock({ADVISORY_LOCK_ID})"
+        )
+
+
+async def create_migrations_table(connection: BaseDBAsyncClient) -> None:
+    """
+    Creates `schema_migrations` if it is missing, under the advisory lock:
+    concurrent CREATE TABLE IF NOT EXISTS statements can still collide on
+    the PostgreSQL catalog.
+    """
+    async with in_transaction(connection.connection_name) as tx:
+        await lock_migrations(tx)
+        await tx.execute_query(CREATE_MIGRATIONS_TABLE)
+
+
+async def applied_versions(connection: BaseDBAsyncClient) -> set[int]:
+    rows = await connection.execute_query_dict(
+        'SELECT "version" FROM "schema_migrations"'
+    )
+    return {row["version"] for row in rows}
+
+
+async def migrate(
+    connection: Optional[BaseDBAsyncClient] = None,
+    target: Optional[int] = None,
+    package: str = MIGRATIONS_PACKAGE,
+) -> list[Migration]:
+    """
+    Applies the pending migrations in order, each one in its own transaction
+    together with its row in `schema_migrations`.
+
+    Args:
+        connection: Database to migrate; the default connection if omitted.
+        target (int, optional): Last version to apply; all if omitted.
+        package (str): Package holding the migration modules.
+
+    Returns:
+        list[Migration]: The migrations applied by this call.
+
+    Raises:
+        ValueError: If the database dialect is not supported.
+    """
+    connection = connection or connections.get("default")
+    dialect = connection.capabilities.dialect
+    if dialect not in SUPPORTED_DIALECTS:
+        raise ValueError(f"Migrations do not support {dialect}")
+
+    await create_migrations_table(connection)
+    applied = await applied_versions(connection)
+    done = []
+    for migration in load_migrations(package):
+        if migration.version in applied:
+            continue
+        if target is not None and migration.version > target:
+            break
+        async with in_transaction(connection.connection_name) as tx:
+            if dialect == "postgres":
+                await lock_migrations(tx)
+                # Another instance may have applied it while we waited.
+                if migration.version in await applied_versions(tx):
+                    continue
+            await migration.upgrade(tx, dialect)
+            await tx.execute_query(
+                'INSERT INTO "schema_migrations" ("version", "name") '
+                f"VALUES ({migration.version}, '{migration.name}')"
+            )
+        log.info(f"Applied migration {migration.version:04d}_{migration.name}")
+        done.append(migration)
+    return done
+
+
+async def pending_migrations(
+    connection: Optional[BaseDBAsyncClient] = None,
+    package: str = MIGRATIONS_PACKAGE,
+) -> list[Migration]:
+    connection = connection or connections.get("default")
+    await create_migrations_table(connection)
+    applied = await applied_versions(connection)
+    return [m for m in load_migrations(package) if m.version not in applied]
@@ -0,0 +1,74 @@
+"""
+Schema of the first release: users, task lists and tasks.
+
+The tables are created only if missing, so databases created by the former
+`generate_schemas` call on startup adopt the migrations.
+"""
+
+from app.infrastructure.database.migrate import execute
+
+SQLITE = [
+    """
+    CREATE TABLE IF NOT EXISTS "users" (
+        "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+        "email" VARCHAR(255) NOT NULL UNIQUE,
+        "hashed_password" VARCHAR(255) NOT NULL,
+        "full_name" VARCHAR(255),
+        "is_active" INT NOT NULL DEFAULT 1
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS "tasklist" (
+        "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+        "name" VARCHAR(255) NOT NULL,
+        "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS "task" (
+        "id" INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+        "title" VARCHAR(255) NOT NULL,
+        "description" TEXT,
+        "completed" INT NOT NULL DEFAULT 0,
+        "priority" INT NOT NULL DEFAULT 1,
+        "created_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        "assigned_to_id" INT REFERENCES "users" ("id") ON DELETE SET NULL,
+        "task_list_id" INT NOT NULL REFERENCES "tasklist" ("id") ON DELETE CASCADE
+    )
+    """,
+]
+
+POSTGRES = [
+    """
+    CREATE TABLE IF NOT EXISTS "users" (
+        "id" SERIAL NOT NULL PRIMARY KEY,
+        "email" VARCHAR(255) NOT NULL UNIQUE,
+        "hashed_password" VARCHAR(255) NOT NULL,
+        "full_name" VARCHAR(255),
+        "is_active" BOOL NOT NULL DEFAULT True
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS "tasklist" (
+        "id" SERIAL NOT NULL PRIMARY KEY,
+        "name" VARCHAR(255) NOT NULL,
+        "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS "task" (
+        "id" SERIAL NOT NULL PRIMARY KEY,
+        "title" VARCHAR(255) NOT NULL,
+        "description" TEXT,
+        "completed" BOOL NOT NULL DEFAULT False,
+        "priority" INT NOT NULL DEFAULT 1,
+        "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        "assigned_to_id" INT REFERENCES "users" ("id") ON DELETE SET NULL,
+        "task_list_id" INT NOT NULL REFERENCES "tasklist" ("id") ON DELETE CASCADE
+    )
+    """,
+]
+
+
+async def upgrade(connection, dialect: str) -> None:
+    await execute(connection, POSTGRES if dialect == "postgres" else SQLITE)
@@ -0,0 +1,63 @@
+"""
+Progress counters and version of the task lists, and the notification
+outbox.
+
+Columns are added only if missing, since `generate_schemas` may already
+have created them, and the counters are recomputed from the task table.
+"""
+
+from app.infrastructure.database.migrate import execute
+
+LIST_COLUMNS = {
+    "total_tasks": "INT NOT NULL DEFAULT 0",
+    "completed_tasks": "INT NOT NULL DEFAULT 0",
+    "version": "INT NOT NULL DEFAULT 1",
+}
+
+BACKFILL_COUNTERS = """
+UPDATE "tasklist" SET
+    "total_tasks" = (
+        SELECT COUNT(*) FROM "task" WHERE "task"."task_list_id" = "tasklist"."id"
+    ),
+    "completed_tasks" = (
+        SELECT COUNT(*) FROM "task"
+        WHERE "task"."task_list_id" = "tasklist"."id" AND "task"."completed"
+    )
+"""
+
+OUTBOX = """
+CREATE TABLE IF NOT EXISTS "notification_outbox" (
+    "id" {pk},
+    "recipient" VARCHAR(255) NOT NULL,
+    "task_id" INT NOT NULL,
+    "status" VARCHAR(16) NOT NULL DEFAULT 'pending',
+    "attempts" INT NOT NULL DEFAULT 0,
+    "next_attempt_at" {timestamp} NOT NULL,
+    "last_error" TEXT,
+    "created_at" {timestamp} NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "sent_at" {timestamp}
+)
+"""
+
+
+async def upgrade(connection, dialect: str) -> None:
+    if dialect == "postgres":
+        statements = [
+            f'ALTER TABLE "tasklist" ADD COLUMN IF NOT EXISTS "{name}" {ddl}'
+            for name, ddl in LIST_COLUMNS.items()
+        ]
+        outbox = OUTBOX.format(
+            pk="SERIAL NOT NULL PRIMARY KEY", timestamp="TIMESTAMPTZ"
+        )
+    else:
+        rows = await connection.execute_query_dict('PRAGMA table_info("tasklist")')
+        existing = {row["name"] for row in rows}
+        statements = [
+            f'ALTER TABLE "tasklist" ADD COLUMN "{name}" {ddl}'
+            for name, ddl in LIST_COLUMNS.items()
+            if name not in existing
+        ]
+        outbox = OUTBOX.format(
+            pk="INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL", timestamp="TIMESTAMP"
+        )
+    await execute(connection, [*statements, BACKFILL_COUNTERS, outbox])
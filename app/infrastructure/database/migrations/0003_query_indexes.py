@@ -0,0 +1,28 @@
+"""
+Indexes for the query patterns of the repositories:
+
+- the tasks of a list in `(created_at, id)` order, for pages and exports;
+- the same, filtered by `completed` and `priority`, which also serves the
+  per-list counts of the bulk operations;
+- the tasks assigned to a user, which foreign keys do not index;
+- the list index in `(created_at, id)` order;
+- the due notifications claimed by the dispatcher.
+"""
+
+from app.infrastructure.database.migrate import execute
+
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS "idx_task_list_created" '
+    'ON "task" ("task_list_id", "created_at", "id")',
+    'CREATE INDEX IF NOT EXISTS "idx_task_list_state" '
+    'ON "task" ("task_list_id", "completed", "priority", "created_at", "id")',
+    'CREATE INDEX IF NOT EXISTS "idx_task_assigned_to" ON "task" ("assigned_to_id")',
+    'CREATE INDEX IF NOT EXISTS "idx_tasklist_created" '
+    'ON "tasklist" ("created_at", "id")',
+    'CREATE INDEX IF NOT EXISTS "idx_outbox_due" '
+    'ON "notification_outbox" ("status", "next_attempt_at")',
+]
+
+
+async def upgrade(connection, dialect: str) -> None:
+    await execute(connection, INDEXES)
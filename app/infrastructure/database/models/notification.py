@@ -0,0 +1,16 @@
+from tortoise import fields, models
+
+
+class NotificationOutbox(models.Model):
+    id = fields.IntField(pk=True)
+    recipient = fields.CharField(max_length=255)
+    task_id = fields.IntField()
+    status = fields.CharField(max_length=16, default="pending")
+    attempts = fields.IntField(default=0)
+    next_attempt_at = fields.DatetimeField()
+    last_error = fields.TextField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    sent_at = fields.DatetimeField(null=True)
+
+    class Meta:
+        table = "notification_outbox"
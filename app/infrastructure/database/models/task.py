@@ -5,6 +5,10 @@ class TaskList(models.Model):
     id = fields.IntField(pk=True)
     name = fields.CharField(max_length=255)
     created_at = fields.DatetimeField(auto_now_add=True)
+    total_tasks = fields.IntField(default=0)
+    completed_tasks = fields.IntField(default=0)
+    # Bumped whenever the list or any of its tasks changes; used as ETag.
+    version = fields.IntField(default=1)
 
     tasks: fields.ReverseRelation["Task"]
 
@@ -0,0 +1,99 @@
+"""
+Tortoise engine for PostgreSQL whose asyncpg pool reports its pressure.
+
+Select it with `"engine": "app.infrastructure.database.pool"` in the
+connection config (see `database_config`).
+"""
+
+import asyncio
+from time import perf_counter
+from typing import Any, Optional
+from tortoise import connections
+from tortoise.backends.asyncpg.client import AsyncpgDBClient
+from app.utils.histogram import Histogram
+
+ACQUIRE_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+class PoolAcquireTimeout(Exception):
+    """No pooled connection became free within the acquire timeout."""
+
+
+class PoolStats:
+    def __init__(self):
+        self.waiters = 0
+        self.acquired_total = 0
+        self.timeouts_total = 0
+        self.acquire_seconds = Histogram(ACQUIRE_SECONDS_BUCKETS)
+
+
+class InstrumentedPool:
+    """
+    Proxy of an asyncpg pool that times every acquire, counts the callers
+    waiting for a connection and bounds the wait.
+    """
+
+    def __init__(self, pool, stats: PoolStats, acquire_timeout: Optional[float]):
+        self._pool = pool
+        self.stats = stats
+        self.acquire_timeout = acquire_timeout
+
+    async def acquire(self):
+        self.stats.waiters += 1
+        start = perf_counter()
+        try:
+            connection = await self._pool.acquire(timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.stats.timeouts_total += 1
+            raise PoolAcquireTimeout(
+                f"No database connection free after {self.acquire_timeout}s"
+            )
+        finally:
+            self.stats.waiters -= 1
+        self.stats.acquire_seconds.observe(perf_counter() - start)
+        self.stats.acquired_total += 1
+        return connection
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+
+class InstrumentedAsyncpgDBClient(AsyncpgDBClient):
+    def __init__(self, acquire_timeout: Optional[float] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.acquire_timeout = acquire_timeout
+        self.pool_stats = PoolStats()
+
+    async def create_pool(self, **kwargs) -> InstrumentedPool:
+        pool = await super().create_pool(**kwargs)
+        return InstrumentedPool(pool, self.pool_stats, self.acquire_timeout)
+
+    def stats(self) -> dict:
+        size = self._pool.get_size() if self._pool else 0
+        idle = self._pool.get_idle_size() if self._pool else 0
+        return {
+            "backend": "asyncpg",
+            "min_size": self.pool_minsize,
+            "max_size": self.pool_maxsize,
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "waiters": self.pool_stats.waiters,
+            "acquired_total": self.pool_stats.acquired_total,
+            "timeouts_total": self.pool_stats.timeouts_total,
+            "acquire_seconds": self.pool_stats.acquire_seconds.snapshot(),
+        }
+
+
+client_class = InstrumentedAsyncpgDBClient
+
+
+def pool_stats(connection_name: str = "default") -> dict:
+    """
+    Pool counters of a connection; clients without a pool (SQLite) only
+    report their backend.
+    """
+    client = connections.get(connection_name)
+    if isinstance(client, InstrumentedAsyncpgDBClient):
+        return client.stats()
+    return {"backend": client.capabilities.dialect}
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+from tortoise import timezone
+from tortoise.expressions import F
+from tortoise.functions import Count, Min
+from tortoise.transactions import in_transaction
+from app.core.tracing import trace_methods
+from app.infrastructure.database.bulk import execute_returning
+from app.infrastructure.database.routing import PRIMARY
+from app.infrastructure.database.models.notification import NotificationOutbox
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+DISCARDED = "discarded"
+
+
+@trace_methods("repo")
+class NotificationRepository:
+    async def enqueue_task_assignments(self, assignments: list[tuple[str, int]]):
+        """
+        Writes one outbox row per (recipient, task_id) pair. Meant to be called
+        inside the transaction that performs the assignment.
+        """
+        now = timezone.now()
+        await NotificationOutbox.bulk_create(
+            [
+                NotificationOutbox(
+                    recipient=email, task_id=task_id, next_attempt_at=now
+                )
+                for email, task_id in assignments
+            ]
+        )
+
+    async def claim_due(self, limit: int, lease: timedelta) -> list[NotificationOutbox]:
+        """
+        Claims up to `limit` due notifications by pushing their next attempt
+        `lease` into the future, so that concurrent dispatchers skip them and
+        a crashed dispatcher's claims are retried once the lease expires.
+
+        The claiming UPDATE re-checks that each row is still pending and due
+        and returns the rows it changed: on PostgreSQL `SKIP LOCKED` already
+        keeps dispatchers apart, on SQLite (no row locks) this check is what
+        stops two dispatchers from claiming, and sending, the same row.
+        """
+        now = timezone.now()
+        async with in_transaction(PRIMARY) as connection:
+            rows = (
+                await NotificationOutbox.filter(
+                    status=PENDING, next_attempt_at__lte=now
+                )
+                .using_db(connection)
+                .order_by("id")
+                .limit(limit)
+                .select_for_update(skip_locked=True)
+            )
+            if not rows:
+                return []
+            claimed = await execute_returning(
+                NotificationOutbox.filter(
+                    id__in=[row.id for row in rows],
+                    status=PENDING,
+                    next_attempt_at__lte=now,
+                )
+                .using_db(connection)
+                .update(attempts=F("attempts") + 1, next_attempt_at=now + lease),
+                ("id",),
+            )
+        claimed_ids = {row["id"] for row in claimed}
+        rows = [row for row in rows if row.id in claimed_ids]
+        for row in rows:
+            row.attempts += 1
+        return rows
+
+    async def mark_sent(self, ids: list[int]) -> None:
+        await NotificationOutbox.filter(id__in=ids).update(
+            status=SENT, sent_at=timezone.now(), last_error=None
+        )
+
+    async def mark_discarded(self, ids: list[int], reason: str) -> None:
+        """
+        Closes notifications that must not be delivered (e.g. their task was
+        deleted) without counting them as sent or failed.
+        """
+        await NotificationOutbox.filter(id__in=ids).update(
+            status=DISCARDED, last_error=reason
+        )
+
+    async def mark_failed(
+        self, ids: list[int], error: str, retry_at: datetime | None
+    ) -> None:
+        if retry_at is None:
+            await NotificationOutbox.filter(id__in=ids).update(
+                status=FAILED, last_error=error
+            )
+        else:
+            await NotificationOutbox.filter(id__in=ids).update(
+                next_attempt_at=retry_at, last_error=error
+            )
+
+    async def pending_stats(self) -> dict:
+        """
+        Returns:
+            dict: Number of pending notifications (`depth`) and the creation
+            date of the oldest one (`oldest_created_at`).
+        """
+        rows = (
+            await NotificationOutbox.filter(status=PENDING)
+            .annotate(depth=Count("id"), oldest_created_at=Min("created_at"))
+            .values("depth", "oldest_created_at")
+        )
+        return rows[0] if rows else {"depth": 0, "oldest_created_at": None}
+
+
+notification_repo = NotificationRepository()
@@ -1,49 +1,389 @@
-from tortoise.expressions import Q
+from collections import Counter, defaultdict
+from tortoise.expressions import F, Q
+from tortoise.functions import Count
+from tortoise.transactions import in_transaction
+from app.core.config import settings
+from app.core.tracing import trace_methods
+from app.infrastructure.database.bulk import (
+    chunked,
+    copy_rows,
+    execute_returning,
+    insert_returning_ids,
+    update_returning,
+)
+from app.infrastructure.database.routing import PRIMARY
 from app.infrastructure.database.models.task import Task, TaskList
-from typing import Optional
+from app.infrastructure.database.repositories.notification_repo import (
+    notification_repo,
+)
+from app.utils.pagination import Cursor, after_cursor
+from typing import AsyncIterator, Optional
 
 
+@trace_methods("repo")
 class TaskRepository:
     async def create_list(self, name: str) -> TaskList:
         return await TaskList.create(name=name)
 
-    async def get_list(self, list_id: int) -> Optional[TaskList]:
-        obj = await TaskList.get_or_none(id=list_id)
-        if obj:
-            await obj.fetch_related("tasks")
-        return obj
+    async def list_exists(self, list_id: int) -> bool:
+        return await TaskList.exists(id=list_id)
 
-    async def get_all_lists(self) -> list[TaskList]:
-        return await TaskList.all()
+    async def get_list_row(self, list_id: int, fields: tuple) -> Optional[dict]:
+        return await TaskList.filter(id=list_id).first().values(*fields)
+
+    async def get_list_version(self, list_id: int) -> Optional[int]:
+        return (
+            await TaskList.filter(id=list_id).first().values_list("version", flat=True)
+        )
+
+    async def get_list_versions(
+        self, limit: int, after: Optional[Cursor] = None
+    ) -> list[tuple[int, int]]:
+        """
+        `(id, version)` of the lists `get_all_lists` returns for the same
+        arguments, without reading the rest of the columns.
+        """
+        return (
+            await TaskList.filter(after_cursor(after))
+            .order_by("created_at", "id")
+            .limit(limit)
+            .values_list("id", "version")
+        )
+
+    async def get_all_lists(
+        self, limit: int, after: Optional[Cursor] = None
+    ) -> list[dict]:
+        return (
+            await TaskList.filter(after_cursor(after))
+            .order_by("created_at", "id")
+            .limit(limit)
+            .values("id", "name", "created_at", "total_tasks", "completed_tasks")
+        )
+
+    async def _shift_counters(self, list_id: int, total: int, completed: int):
+        await TaskList.filter(id=list_id).update(
+            total_tasks=F("total_tasks") + total,
+            completed_tasks=F("completed_tasks") + completed,
+            version=F("version") + 1,
+        )
+
+    async def _bump_versions(self, list_ids: list[int]):
+        if list_ids:
+            await TaskList.filter(id__in=list_ids).update(version=F("version") + 1)
 
     async def create_task(self, list_id: int, data: dict) -> Task:
-        return await Task.create(task_list_id=list_id, **data)
+        async with in_transaction(PRIMARY):
+            task = await Task.create(task_list_id=list_id, **data)
+            await self._shift_counters(list_id, 1, int(task.completed))
+        return task
+
+    async def bulk_create_tasks(self, list_id: int, items: list[dict]) -> list[int]:
+        """
+        Inserts the tasks in multi-row batches inside a single transaction.
+
+        Returns:
+            list[int]: The IDs of the created tasks, in the order of `items`.
+        """
+        tasks = [Task(task_list_id=list_id, **data) for data in items]
+        ids = []
+        async with in_transaction(PRIMARY) as connection:
+            for batch in chunked(tasks, settings.BULK_INSERT_BATCH_SIZE):
+                ids.extend(await insert_returning_ids(Task, batch, connection))
+            await self._shift_counters(
+                list_id, len(tasks), sum(task.completed for task in tasks)
+            )
+        return ids
+
+    async def import_tasks(self, list_id: int, items: list[dict]) -> int:
+        """
+        Writes one import batch with COPY (PostgreSQL) or multi-row INSERTs
+        and updates the list counters in the same transaction.
+
+        Returns:
+            int: Number of imported tasks.
+        """
+        tasks = [Task(task_list_id=list_id, **data) for data in items]
+        async with in_transaction(PRIMARY) as connection:
+            imported = await copy_rows(
+                Task, tasks, connection, settings.BULK_INSERT_BATCH_SIZE
+            )
+            await self._shift_counters(
+                list_id, imported, sum(task.completed for task in tasks)
+            )
+        return imported
 
     async def list_tasks(
-        self, list_id: int, completed=None, priority=None
-    ) -> list[Task]:
-        filters = Q(task_list_id=list_id)
+        self,
+        list_id: int,
+        completed=None,
+        priority=None,
+        limit: Optional[int] = None,
+        after: Optional[Cursor] = None,
+        fields: Optional[tuple] = None,
+    ) -> list:
+        """
+        Tasks of the list in `(created_at, id)` order, as models or, when
+        `fields` is given, as dicts holding only those columns.
+        """
+        filters = Q(task_list_id=list_id) & after_cursor(after)
         if completed is not None:
             filters &= Q(completed=completed)
         if priority is not None:
             filters &= Q(priority=priority)
-        return await Task.filter(filters)
+        query = Task.filter(filters).order_by("created_at", "id")
+        if limit is not None:
+            query = query.limit(limit)
+        if fields is not None:
+            return await query.values(*fields)
+        return await query
+
+    async def iter_tasks(
+        self,
+        list_id: int,
+        completed=None,
+        priority=None,
+        chunk_size: int = 1000,
+        fields: tuple = ("id", "created_at"),
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Yields the tasks of `list_tasks` in chunks of `chunk_size` rows.
+
+        Each chunk is a keyset query starting after the previous one, so no
+        connection is held between chunks and memory is bounded by the chunk
+        size. `fields` must include `id` and `created_at`.
+        """
+        after = None
+        while True:
+            rows = await self.list_tasks(
+                list_id, completed, priority, chunk_size, after, fields
+            )
+            if rows:
+                yield rows
+            if len(rows) < chunk_size:
+                return
+            after = (rows[-1]["created_at"], rows[-1]["id"])
 
     async def get_task(self, task_id: int) -> Optional[Task]:
         return await Task.get_or_none(id=task_id)
 
-    async def update_task(self, task: Task, data: dict):
-        task.update_from_dict(data)
-        await task.save()
-        return task
+    async def update_task(self, task_id: int, data: dict) -> Optional[Task]:
+        """
+        Updates only the given fields with UPDATE ... RETURNING.
 
-    async def delete_task(self, task_id: int):
-        return await Task.filter(id=task_id).delete()
+        A change of `completed` first tries the patch only on a row whose state
+        flips. The row lock it takes makes concurrent flips count once, and a
+        second statement applies the patch when nothing flipped. The version
+        of the list is bumped in the same transaction, unless the task already
+        held every value of the patch.
 
-    async def assign_user_to_task(self, task: Task, user) -> Task:
-        task.assigned_to = user
-        await task.save()
+        Returns:
+            Optional[Task]: The updated task, or None if it does not exist.
+        """
+        async with in_transaction(PRIMARY) as connection:
+            if "completed" in data:
+                task = await update_returning(
+                    Task,
+                    task_id,
+                    data,
+                    connection,
+                    exclude={"completed": data["completed"]},
+                )
+                if task is not None:
+                    await self._shift_counters(
+                        task.task_list_id, 0, 1 if task.completed else -1
+                    )
+                    return task
+            task = await update_returning(
+                Task, task_id, data, connection, only_changes=True
+            )
+            if task is None:
+                return await Task.get_or_none(id=task_id).using_db(connection)
+            await self._bump_versions([task.task_list_id])
         return task
 
+    async def delete_task(self, task_id: int) -> Optional[int]:
+        """
+        Deletes a task and updates the counters of its list.
+
+        Returns:
+            Optional[int]: The id of the list of the deleted task, or None if
+            the task does not exist.
+        """
+        async with in_transaction(PRIMARY):
+            task = (
+                await Task.filter(id=task_id)
+                .select_for_update()
+                .first()
+                .values("task_list_id", "completed")
+            )
+            if not task:
+                return None
+            await Task.filter(id=task_id).delete()
+            await self._shift_counters(
+                task["task_list_id"], -1, -int(task["completed"])
+            )
+        return task["task_list_id"]
+
+    def task_selector(
+        self,
+        ids: Optional[list[int]] = None,
+        list_id: Optional[int] = None,
+        completed: Optional[bool] = None,
+        priority: Optional[int] = None,
+    ) -> Q:
+        filters = Q()
+        if ids is not None:
+            filters &= Q(id__in=ids)
+        if list_id is not None:
+            filters &= Q(task_list_id=list_id)
+        if completed is not None:
+            filters &= Q(completed=completed)
+        if priority is not None:
+            filters &= Q(priority=priority)
+        return filters
+
+    async def bulk_update_tasks(self, filters: Q, data: dict) -> int:
+        """
+        Applies the same changes to every selected task.
+
+        The counter deltas come from the rows each UPDATE reports through
+        RETURNING, so concurrent writes to the same tasks cannot make them
+        drift. A change of `completed` runs two UPDATEs: one for the tasks
+        that already have the new value and one for those that flip.
+
+        Returns:
+            int: Number of updated tasks.
+        """
+        async with in_transaction(PRIMARY) as connection:
+            tasks = Task.filter(filters).using_db(connection)
+            if "completed" not in data:
+                rows = await execute_returning(tasks.update(**data), ("task_list_id",))
+                await self._bump_versions(sorted({r["task_list_id"] for r in rows}))
+                return len(rows)
+
+            completed = data["completed"]
+            kept = await execute_returning(
+                tasks.filter(completed=completed).update(**data), ("task_list_id",)
+            )
+            flipped = await execute_returning(
+                tasks.filter(completed=not completed).update(**data),
+                ("task_list_id",),
+            )
+            flips = Counter(row["task_list_id"] for row in flipped)
+            for list_id, total in flips.items():
+                await self._shift_counters(list_id, 0, total if completed else -total)
+            await self._bump_versions(
+                sorted({r["task_list_id"] for r in kept} - flips.keys())
+            )
+        return len(kept) + len(flipped)
+
+    async def bulk_delete_tasks(self, filters: Q) -> int:
+        """
+        Deletes every selected task with one DELETE, taking the counter
+        deltas from the rows it reports through RETURNING.
+
+        Returns:
+            int: Number of deleted tasks.
+        """
+        async with in_transaction(PRIMARY) as connection:
+            rows = await execute_returning(
+                Task.filter(filters).using_db(connection).delete(),
+                ("task_list_id", "completed"),
+            )
+            removed = defaultdict(lambda: [0, 0])
+            for row in rows:
+                counts = removed[row["task_list_id"]]
+                counts[0] += 1
+                counts[1] += bool(row["completed"])
+            for list_id, (total, completed) in removed.items():
+                await self._shift_counters(list_id, -total, -completed)
+        return len(rows)
+
+    async def recompute_list_counters(self, fix: bool = True) -> list[dict]:
+        """
+        Recomputes the progress counters of every list from the task table.
+
+        Args:
+            fix (bool): Whether the drifted counters should be overwritten.
+
+        Returns:
+            list[dict]: The lists whose stored counters did not match, with
+            both the stored and the actual values.
+        """
+        rows = await TaskList.annotate(
+            actual_total=Count("tasks"),
+            actual_completed=Count("tasks", _filter=Q(tasks__completed=True)),
+        ).values(
+            "id", "total_tasks", "completed_tasks", "actual_total", "actual_completed"
+        )
+        drifted = [
+            row
+            for row in rows
+            if (row["total_tasks"], row["completed_tasks"])
+            != (row["actual_total"], row["actual_completed"])
+        ]
+        if fix:
+            for row in drifted:
+                await TaskList.filter(
+                    id=row["id"],
+                    total_tasks=row["total_tasks"],
+                    completed_tasks=row["completed_tasks"],
+                ).update(
+                    total_tasks=row["actual_total"],
+                    completed_tasks=row["actual_completed"],
+                    version=F("version") + 1,
+                )
+        return drifted
+
+    async def assign_user_to_task(self, task_id: int, user) -> int:
+        """
+        Sets the assignee with a single UPDATE of the foreign key and queues
+        the notification in the same transaction.
+
+        Returns:
+            int: 1 if the task was assigned, 0 if it does not exist.
+        """
+        async with in_transaction(PRIMARY):
+            assigned = await Task.filter(id=task_id).update(assigned_to_id=user.id)
+            if assigned:
+                await notification_repo.enqueue_task_assignments(
+                    [(user.email, task_id)]
+                )
+        return assigned
+
+    async def get_task_titles(self, task_ids: list[int]) -> dict[int, str]:
+        rows = await Task.filter(id__in=task_ids).values_list("id", "title")
+        return dict(rows)
+
+    async def get_existing_task_ids(self, task_ids: list[int]) -> set[int]:
+        return set(await Task.filter(id__in=task_ids).values_list("id", flat=True))
+
+    async def assign_tasks(self, assignments: dict) -> int:
+        """
+        Assigns each task to its user, with one UPDATE per user, and queues
+        the notifications in the same transaction.
+
+        Args:
+            assignments (dict): Task ID -> User.
+
+        Returns:
+            int: Number of updated tasks.
+        """
+        if not assignments:
+            return 0
+        task_ids_by_user = defaultdict(list)
+        for task_id, user in assignments.items():
+            task_ids_by_user[user].append(task_id)
+        assigned = 0
+        async with in_transaction(PRIMARY):
+            for user, task_ids in task_ids_by_user.items():
+                assigned += await Task.filter(id__in=task_ids).update(
+                    assigned_to_id=user.id
+                )
+            await notification_repo.enqueue_task_assignments(
+                [(user.email, task_id) for task_id, user in assignments.items()]
+            )
+        return assigned
+
 
 task_repo = TaskRepository()
@@ -1,12 +1,43 @@
+from tortoise.exceptions import IntegrityError
+from app.core.security import invalidate_cached_user
+from app.core.tracing import trace_methods
 from app.infrastructure.database.models.user import User
 
 
+@trace_methods("repo")
 class UserRepository:
     async def get_by_email(self, email: str) -> User | None:
         return await User.get_or_none(email=email)
 
-    async def create(self, email: str, hashed_password: str) -> User:
-        return await User.create(email=email, hashed_password=hashed_password)
+    async def get_assignee(self, email: str) -> User | None:
+        return await User.filter(email=email).only("id", "email").first()
+
+    async def email_exists(self, email: str) -> bool:
+        return await User.exists(email=email)
+
+    async def get_by_emails(self, emails: list[str]) -> list[User]:
+        return await User.filter(email__in=emails).only("id", "email")
+
+    async def create(self, email: str, hashed_password: str) -> User | None:
+        """
+        Inserts the user, relying on the unique index on `email` for the
+        registrations racing for the same email.
+
+        Returns:
+            User | None: The new user, or None if the email is already taken.
+        """
+        try:
+            return await User.create(email=email, hashed_password=hashed_password)
+        except IntegrityError:
+            return None
+
+    async def update(self, email: str, data: dict) -> int:
+        updated = await User.filter(email=email).update(**data)
+        invalidate_cached_user(email)
+        return updated
+
+    async def deactivate(self, email: str) -> int:
+        return await self.update(email, {"is_active": False})
 
 
 user_repo = UserRepository()
@@ -0,0 +1,117 @@
+"""
+Routing of reads to the optional read replica (DATABASE_REPLICA_URL).
+
+Only the reads of safe requests (GET/HEAD, flagged by
+`ReplicaReadsMiddleware`) go to the replica. Writes, the reads of any other
+request, of the background jobs and of open transactions stay on the
+primary, so a read that precedes a write always sees committed data.
+
+Read-your-writes: once the current context writes, its following reads use
+the primary, and so do the safe requests of the same user for
+DATABASE_READ_YOUR_WRITES_MS after their last write. The recent writers are
+kept per worker: with several workers, route the requests of a user to the
+same one (sticky sessions) or raise the window above the replication lag.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from tortoise import connections
+from tortoise.backends.base.client import BaseTransactionWrapper
+from app.core.config import settings
+from app.infrastructure.database.pool import pool_stats
+from app.utils.cache import TTLCache
+
+PRIMARY = "default"
+REPLICA = "replica"
+RECENT_WRITERS_MAX_SIZE = 100_000
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+_user_id: ContextVar[Optional[int]] = ContextVar("db_user_id", default=None)
+
+recent_writers = TTLCache(
+    maxsize=RECENT_WRITERS_MAX_SIZE,
+    ttl=settings.DATABASE_READ_YOUR_WRITES_MS / 1000,
+)
+routing_stats = {"replica_reads": 0, "primary_reads": 0}
+
+
+@contextmanager
+def replica_reads():
+    """
+    Lets the reads of the current context use the replica, if configured.
+    """
+    token = _replica_reads.set(settings.DATABASE_REPLICA_URL is not None)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """
+    Sends the reads of the block to the primary, e.g. those that must see
+    rows another request has just written.
+    """
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def reading_from_replica() -> bool:
+    return _replica_reads.get()
+
+
+def bind_user(user_id: int) -> None:
+    """
+    Records the user of the current request, whose writes open a
+    read-your-writes window, and leaves the replica if the window is open.
+    """
+    _user_id.set(user_id)
+    if recent_writers.get(user_id) is not None:
+        _replica_reads.set(False)
+
+
+def record_write() -> None:
+    _replica_reads.set(False)
+    user_id = _user_id.get()
+    if user_id is not None:
+        recent_writers.set(user_id, True)
+
+
+def _in_transaction() -> bool:
+    return isinstance(connections.get(PRIMARY), BaseTransactionWrapper)
+
+
+class ReplicaRouter:
+    """
+    Tortoise router installed by `database_config` when a replica is set.
+
+    Returning None selects the model's default connection (the primary, or
+    the open transaction).
+    """
+
+    def db_for_read(self, model) -> Optional[str]:
+        if _replica_reads.get() and not _in_transaction():
+            routing_stats["replica_reads"] += 1
+            return REPLICA
+        routing_stats["primary_reads"] += 1
+        return None
+
+    def db_for_write(self, model) -> Optional[str]:
+        record_write()
+        return None
+
+
+def replica_stats() -> dict:
+    if settings.DATABASE_REPLICA_URL is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        **routing_stats,
+        "recent_writers": len(recent_writers),
+        "pool": pool_stats(REPLICA),
+    }
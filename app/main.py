@@ -1,10 +1,23 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from app.api.middleware import (
+    MetricsMiddleware,
+    QueryStatsMiddleware,
+    ReplicaReadsMiddleware,
+    TracingMiddleware,
+)
 from app.infrastructure.database.db import init_db
+from app.infrastructure.database.pool import PoolAcquireTimeout
 from contextlib import asynccontextmanager
-from app.api.routes import auth, task, assigned_task
+from app.api.routes import auth, task, assigned_task, ops, metrics as metrics_routes
 from app.core.logging import get_logging
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.tracing import span_exporter
 from app.debugger import initialize_fastapi_server_debugger_if_needed
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services.task_service import task_service
 
 log = get_logging(__name__)
 
@@ -16,8 +29,24 @@ if settings.DEBUGGER:
 async def lifespan(app: FastAPI):
     log.info("Starting app...")
     await init_db(app)
+    if settings.NOTIFICATIONS_DISPATCHER_ENABLED:
+        notification_dispatcher.start()
     yield
     log.info("Shutting down...")
+    await notification_dispatcher.stop()
+    await task_service.cache.close()
+    # Joins the exporter thread, which may still be posting a batch.
+    await asyncio.to_thread(span_exporter.shutdown)
+
+
+async def pool_acquire_timeout_handler(request: Request, exc: PoolAcquireTimeout):
+    # The pool is saturated: ask the client to retry instead of failing hard.
+    log.warning(f"{request.method} {request.url.path}: {exc}")
+    return ORJSONResponse(
+        status_code=503,
+        content={"detail": "Database busy, retry later"},
+        headers={"Retry-After": "1"},
+    )
 
 
 def create_application() -> FastAPI:
@@ -27,11 +56,34 @@ def create_application() -> FastAPI:
         description=settings.WEB_APP_DESCRIPTION,
         version=settings.WEB_APP_VERSION,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
+    app.add_exception_handler(PoolAcquireTimeout, pool_acquire_timeout_handler)
+    app.add_middleware(ReplicaReadsMiddleware)
+
     app.include_router(auth.router, prefix="/api")
     app.include_router(task.router, prefix="/api")
     app.include_router(assigned_task.router, prefix="/api")
+    app.include_router(ops.router, prefix="/api")
+
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_routes.router)
+        app.add_middleware(MetricsMiddleware)
+        metrics.register_routes(app.routes)
+    # Added last so that it wraps the metrics middleware.
+    app.add_middleware(
+        QueryStatsMiddleware,
+        headers=settings.DB_QUERY_DEBUG_HEADERS,
+        warn_threshold=settings.DB_QUERY_WARN_THRESHOLD,
+    )
+    if settings.TRACING_ENABLED:
+        app.add_middleware(
+            TracingMiddleware,
+            exporter=span_exporter,
+            sample_rate=settings.TRACING_SAMPLE_RATE,
+            timing=settings.TRACING_SERVER_TIMING,
+        )
 
     return app
 
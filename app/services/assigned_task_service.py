@@ -1,33 +1,66 @@
 from fastapi import HTTPException
+from app.core.config import settings
 from app.infrastructure.database.repositories.task_repo import task_repo
 from app.infrastructure.database.repositories.user_repo import user_repo
-from app.domain.schemas.assigned_task import AssignTask
-from app.utils.send_email import simulate_task_assignment_email
+from app.domain.schemas.assigned_task import (
+    AssignTask,
+    AssignTaskBatchResult,
+    AssignTaskError,
+    AssignTaskItem,
+)
 from app.core.logging import get_logging
+from app.core.tracing import trace_methods
 
 log = get_logging(__name__)
 
 
+@trace_methods("service")
 class AssignedTaskService:
     def __init__(self):
         self.task_repo = task_repo
         self.user_repo = user_repo
 
     async def assign_user_to_task(self, task_id: int, payload: AssignTask):
-        task = await self.task_repo.get_task(task_id)
-        if not task:
-            raise HTTPException(404, "Task not found")
-
-        user = await self.user_repo.get_by_email(payload.user_email)
+        user = await self.user_repo.get_assignee(payload.user_email)
         if not user:
             raise HTTPException(404, "User not found")
 
-        task = await self.task_repo.assign_user_to_task(task, user)
-        if not task:
-            raise HTTPException(500, "Failed to assign user to task")
-        await simulate_task_assignment_email(user.email, task.title)
+        assigned = await self.task_repo.assign_user_to_task(task_id, user)
+        if not assigned:
+            raise HTTPException(404, "Task not found")
 
         return {"message": f"Task assigned to {user.email}"}
 
+    async def assign_users_to_tasks(
+        self, items: list[AssignTaskItem]
+    ) -> AssignTaskBatchResult:
+        if len(items) > settings.BULK_MAX_ITEMS:
+            raise HTTPException(
+                413, f"At most {settings.BULK_MAX_ITEMS} assignments per request"
+            )
+
+        users = {
+            user.email: user
+            for user in await self.user_repo.get_by_emails(
+                list({item.user_email for item in items})
+            )
+        }
+        task_ids = await self.task_repo.get_existing_task_ids(
+            list({item.task_id for item in items})
+        )
+
+        # The last assignment of a task wins, like sequential single requests.
+        assignments, errors = {}, []
+        for index, item in enumerate(items):
+            if item.task_id not in task_ids:
+                errors.append(AssignTaskError(index=index, detail="Task not found"))
+            elif item.user_email not in users:
+                errors.append(AssignTaskError(index=index, detail="User not found"))
+            else:
+                assignments[item.task_id] = users[item.user_email]
+
+        assigned = await self.task_repo.assign_tasks(assignments)
+        return AssignTaskBatchResult(assigned=assigned, errors=errors)
+
 
 assigned_task_service = AssignedTaskService()
@@ -1,23 +1,34 @@
 from fastapi import HTTPException
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import (
+    hash_password_async,
+    verify_password_async,
+    create_access_token,
+)
+from app.core.tracing import trace_methods
 from app.infrastructure.database.repositories.user_repo import user_repo
 from app.domain.schemas.user import UserCreate
 from fastapi.security import OAuth2PasswordRequestForm
 
 
+@trace_methods("service")
 class AuthService:
     def __init__(self):
         self.user_repo = user_repo
 
     async def register_user(self, user: UserCreate):
-        exists = await self.user_repo.get_by_email(user.email)
-        if exists:
+        # Checked before hashing so that taken emails do not cost a bcrypt
+        # round in the bounded pool; the unique index still settles races.
+        if await self.user_repo.email_exists(user.email):
             raise HTTPException(400, "Email already registered")
-        return await self.user_repo.create(user.email, hash_password(user.password))
+        hashed_password = await hash_password_async(user.password)
+        created = await self.user_repo.create(user.email, hashed_password)
+        if not created:
+            raise HTTPException(400, "Email already registered")
+        return created
 
     async def login_user(self, form_data: OAuth2PasswordRequestForm):
         user_obj = await self.user_repo.get_by_email(form_data.username)
-        is_valid = user_obj and verify_password(
+        is_valid = user_obj and await verify_password_async(
             form_data.password, user_obj.hashed_password
         )
         if not is_valid:
@@ -0,0 +1,136 @@
+import asyncio
+from collections import defaultdict
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+from tortoise import timezone
+from app.core.config import settings
+from app.core.logging import get_logging
+from app.infrastructure.database.repositories.notification_repo import (
+    notification_repo,
+)
+from app.infrastructure.database.repositories.task_repo import task_repo
+from app.utils.send_email import send_task_assignment_digest
+
+log = get_logging(__name__)
+
+
+class NotificationDispatcher:
+    """
+    Background worker that drains the notification outbox in batches.
+
+    Notifications for the same recipient within a batch are coalesced into a
+    single digest email. Failed deliveries are retried with exponential
+    backoff until NOTIFICATIONS_MAX_ATTEMPTS is reached. Notifications whose
+    task was deleted before delivery are discarded.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str, list[str]], Awaitable[None]] = send_task_assignment_digest,
+    ):
+        self.repo = notification_repo
+        self.task_repo = task_repo
+        self.send = send
+        self.sent_total = 0
+        self.retried_total = 0
+        self.failed_total = 0
+        self.discarded_total = 0
+        self.last_delivery_lag_seconds = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def _retry_at(self, attempts: int) -> Optional[datetime]:
+        if attempts >= settings.NOTIFICATIONS_MAX_ATTEMPTS:
+            return None
+        delay = settings.NOTIFICATIONS_BACKOFF_SECONDS * 2 ** (attempts - 1)
+        return timezone.now() + timedelta(seconds=delay)
+
+    async def _deliver(self, recipient: str, rows: list, titles: dict[int, str]):
+        # Tasks deleted since the assignment are not part of the digest.
+        gone = [row.id for row in rows if row.task_id not in titles]
+        if gone:
+            await self.repo.mark_discarded(gone, "Task no longer exists")
+            self.discarded_total += len(gone)
+        rows = [row for row in rows if row.task_id in titles]
+        if not rows:
+            return
+        ids = [row.id for row in rows]
+        task_titles = [titles[row.task_id] for row in rows]
+        try:
+            await self.send(recipient, task_titles)
+        except Exception as exc:
+            retry_at = self._retry_at(max(row.attempts for row in rows))
+            await self.repo.mark_failed(ids, repr(exc), retry_at)
+            if retry_at is None:
+                self.failed_total += len(ids)
+                log.error(f"Giving up notifying {recipient}: {exc!r}")
+            else:
+                self.retried_total += len(ids)
+                log.warning(f"Notification to {recipient} failed, retrying: {exc!r}")
+            return
+        await self.repo.mark_sent(ids)
+        self.sent_total += len(ids)
+        oldest = min(row.created_at for row in rows)
+        self.last_delivery_lag_seconds = (timezone.now() - oldest).total_seconds()
+
+    async def dispatch_once(self) -> int:
+        """
+        Delivers one batch of due notifications.
+
+        Returns:
+            int: Number of outbox rows processed.
+        """
+        rows = await self.repo.claim_due(
+            settings.NOTIFICATIONS_BATCH_SIZE,
+            timedelta(seconds=settings.NOTIFICATIONS_LEASE_SECONDS),
+        )
+        if not rows:
+            return 0
+        titles = await self.task_repo.get_task_titles(
+            list({row.task_id for row in rows})
+        )
+        by_recipient = defaultdict(list)
+        for row in rows:
+            by_recipient[row.recipient].append(row)
+        for recipient, recipient_rows in by_recipient.items():
+            await self._deliver(recipient, recipient_rows, titles)
+        return len(rows)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                processed = await self.dispatch_once()
+            except Exception:
+                log.exception("Notification dispatch failed")
+                processed = 0
+            if processed < settings.NOTIFICATIONS_BATCH_SIZE:
+                await asyncio.sleep(settings.NOTIFICATIONS_POLL_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def metrics(self) -> dict:
+        stats = await self.repo.pending_stats()
+        oldest = stats["oldest_created_at"]
+        return {
+            "queue_depth": stats["depth"],
+            "oldest_pending_age_seconds": (
+                (timezone.now() - oldest).total_seconds() if oldest else 0.0
+            ),
+            "last_delivery_lag_seconds": self.last_delivery_lag_seconds,
+            "sent_total": self.sent_total,
+            "retried_total": self.retried_total,
+            "failed_total": self.failed_total,
+            "discarded_total": self.discarded_total,
+        }
+
+
+notification_dispatcher = NotificationDispatcher()
@@ -0,0 +1,119 @@
+from typing import Any, Awaitable, Callable, Iterable
+import orjson
+from app.core.config import settings
+from app.infrastructure.cache.memory import MemoryCacheBackend
+from app.infrastructure.cache.redis import RedisCacheBackend
+from app.utils.serialization import dumps_trusted
+
+# Scope of the entries derived from every list, such as the list index.
+INDEX_SCOPE = "index"
+# Counter bumped by writes whose lists are not known, such as bulk updates.
+EPOCH = "epoch"
+
+
+class TaskReadCache:
+    """
+    Read-through cache for the reads of `TaskService`, stored as JSON.
+
+    Each entry belongs to a scope: the id of the list it is derived from, or
+    the list index. Its key embeds the generation of the scope and a global
+    epoch, both read before the database. Writes bump the generations of the
+    lists they touched after committing, so the next reads miss while older
+    entries become unreachable and age out of the LRU. A read racing with a
+    write can only store its result under the old generation.
+
+    With `backend=None` every read goes to the database.
+    """
+
+    def __init__(self, backend, ttl: float, prefix: str = "tasks"):
+        self.backend = backend
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _counter_key(self, scope: Any) -> str:
+        return f"{self.prefix}:gen:{scope}"
+
+    async def get_or_load(
+        self,
+        scope: Any,
+        parts: tuple,
+        load: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Returns the cached result of `load`, or awaits it and caches what it
+        returns unless it is None. Cached values come back as the JSON types
+        they were stored as, e.g. datetimes as ISO strings.
+
+        Args:
+            scope (Any): List id the result is derived from, or INDEX_SCOPE.
+            parts (tuple): JSON-serializable arguments of the read.
+            load (Callable): Reads the value from the database.
+
+        Returns:
+            Any: The value, from the cache or from `load`.
+        """
+        if self.backend is None:
+            return await load()
+        counters = await self.backend.get_counters(
+            [self._counter_key(scope), self._counter_key(EPOCH)]
+        )
+        if counters is None:
+            return await load()
+        key = f"{self.prefix}:{scope}:{counters[0]}.{counters[1]}:" + (
+            orjson.dumps(parts).decode()
+        )
+        cached = await self.backend.get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+        # Fills follow the routing of the request: the replica, unless the
+        # user has just written (see `bind_user`). The reads of the routes
+        # key their entries by the ETag, i.e. the list versions read from
+        # the same database, so a lagging replica fills the entry of an
+        # older version instead of passing old rows off as new ones.
+        value = await load()
+        if value is not None:
+            await self.backend.set(key, dumps_trusted(value), self.ttl)
+        return value
+
+    async def invalidate_lists(self, list_ids: Iterable[int]) -> None:
+        """
+        Drops the entries of the given lists and the list index.
+        """
+        if self.backend is None:
+            return
+        scopes = [*sorted(set(list_ids)), INDEX_SCOPE]
+        await self.backend.incr([self._counter_key(scope) for scope in scopes])
+
+    async def invalidate_index(self) -> None:
+        await self.invalidate_lists([])
+
+    async def invalidate_all(self) -> None:
+        if self.backend is not None:
+            await self.backend.incr([self._counter_key(EPOCH)])
+
+    async def stats(self) -> dict:
+        if self.backend is None:
+            return {"backend": "none"}
+        return {**await self.backend.stats(), "ttl": self.ttl}
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+
+def build_task_cache() -> TaskReadCache:
+    """
+    Builds the cache configured by the TASK_CACHE_* settings.
+    """
+    backend = None
+    if settings.TASK_CACHE_BACKEND == "memory":
+        backend = MemoryCacheBackend(
+            maxsize=settings.TASK_CACHE_MAX_SIZE,
+            maxbytes=settings.TASK_CACHE_MAX_BYTES,
+        )
+    elif settings.TASK_CACHE_BACKEND == "redis":
+        backend = RedisCacheBackend(
+            settings.TASK_CACHE_REDIS_URL,
+            timeout=settings.TASK_CACHE_REDIS_TIMEOUT_SECONDS,
+        )
+    return TaskReadCache(backend, ttl=settings.TASK_CACHE_TTL_SECONDS)
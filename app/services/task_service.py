@@ -1,20 +1,89 @@
 from fastapi import HTTPException
+from pydantic import ValidationError
+from time import perf_counter
+from typing import AsyncIterator, Optional
+from app.core.config import settings
+from app.core.tracing import trace_methods
 from app.infrastructure.database.repositories.task_repo import task_repo
+from app.services.task_cache import INDEX_SCOPE, TaskReadCache, build_task_cache
+from app.utils.etag import make_etag
+from app.utils.export import csv_stream, ndjson_stream
+from app.utils.row_reader import LineTooLong, csv_rows, ndjson_rows
+from app.utils.pagination import Cursor, decode_cursor, split_page
 from app.domain.schemas.task import (
+    TaskBulkCreated,
+    TaskBulkCreateResult,
+    TaskBulkError,
+    TaskBulkResult,
+    TaskBulkSelection,
+    TaskBulkUpdate,
+    TaskImportResult,
     TaskListCreate,
     TaskCreate,
     TaskUpdate,
     TaskListOut,
     TaskOut,
+    TASK_OUT_FIELDS,
 )
 
+LIST_ROW_FIELDS = ("id", "name", "created_at", "total_tasks", "completed_tasks")
 
+
+def completed_percentage(done: int, total: int) -> float:
+    """
+    Computed here from the denormalized counters the row already carries,
+    rather than in the SELECT, where PostgreSQL would return a Decimal with
+    its own rounding and SQLite a float.
+    """
+    return round((done / total * 100), 2) if total else 0
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def aenumerate(items: AsyncIterator) -> AsyncIterator[tuple[int, object]]:
+    index = 0
+    async for item in items:
+        yield index, item
+        index += 1
+
+
+async def readable_rows(rows: AsyncIterator) -> AsyncIterator:
+    try:
+        async for row in rows:
+            yield row
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body is not valid UTF-8")
+    except LineTooLong as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
+
+
+def row_errors(exc: ValueError) -> list:
+    if isinstance(exc, ValidationError):
+        return exc.errors(include_url=False, include_context=False)
+    return [{"type": "value_error", "msg": str(exc)}]
+
+
+@trace_methods("service")
 class TaskService:
-    def __init__(self):
+    """
+    Reads of lists and tasks go through `self.cache`; every write through
+    this service drops the cached reads of the lists it touched.
+    """
+
+    def __init__(self, cache: Optional[TaskReadCache] = None):
         self.repo = task_repo
+        self.cache = cache if cache is not None else build_task_cache()
 
     async def create_list(self, payload: TaskListCreate):
         list_created = await self.repo.create_list(payload.name)
+        await self.cache.invalidate_index()
         list_dict = {
             "id": list_created.id,
             "name": list_created.name,
@@ -24,49 +93,302 @@ class TaskService:
         }
         return TaskListOut.model_validate(list_dict)
 
-    async def get_list_with_progress(self, list_id: int) -> TaskListOut:
-        task_list = await self.repo.get_list(list_id)
-        if not task_list:
+    async def get_list_etag(self, list_id: int) -> Optional[str]:
+        """
+        ETag of `get_list_with_progress`, from a lookup of the list version.
+        ETags are never cached: another worker may have changed the list.
+
+        Returns:
+            Optional[str]: The ETag, or None if the list does not exist.
+        """
+        version = await self.repo.get_list_version(list_id)
+        if version is None:
             return None
+        return make_etag("list", list_id, version)
 
-        total = len(task_list.tasks)
-        done = sum(1 for item in task_list.tasks if item.completed)
-        percent = round((done / total * 100), 2) if total else 0
+    async def get_lists_etag(
+        self, limit: int = settings.PAGE_SIZE_DEFAULT, cursor: Optional[str] = None
+    ) -> str:
+        """
+        ETag of a `get_all_lists` page, from the versions of its lists.
+        """
+        after = parse_cursor(cursor)
+        versions = await self.repo.get_list_versions(limit + 1, after)
+        return make_etag("lists", limit, cursor, versions)
 
-        return TaskListOut(
-            id=task_list.id,
-            name=task_list.name,
-            created_at=task_list.created_at,
-            tasks=[TaskOut.model_validate(task) for task in task_list.tasks],
-            completed_percentage=percent,
-        )
+    async def get_tasks_etag(
+        self,
+        list_id: int,
+        completed=None,
+        priority=None,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        ETag of a `list_tasks` page, from the list version and the filters.
+
+        Returns:
+            Optional[str]: The ETag, or None if the list does not exist.
+        """
+        version = await self.repo.get_list_version(list_id)
+        if version is None:
+            return None
+        return make_etag("tasks", list_id, version, completed, priority, limit, cursor)
+
+    async def get_list_with_progress(
+        self, list_id: int, etag: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Builds the list from trusted database rows, without validating one
+        model per task. The result is a plain dict in the shape of
+        `TaskListOut`, meant to be serialized with `TrustedJSONResponse`;
+        its datetimes are ISO strings when it comes from the cache.
+
+        Args:
+            list_id (int): The ID of the task list.
+            etag (str, optional): ETag read for the request. It is part of
+                the cache key, so a worker whose cache missed a write made
+                elsewhere never serves an older body under a newer ETag.
+
+        Returns:
+            Optional[dict]: The list with its tasks, or None if it does not
+            exist.
+        """
 
-    async def get_all_lists(self):
-        lists = await self.repo.get_all_lists()
-        return [await self.get_list_with_progress(task_list.id) for task_list in lists]
+        async def load():
+            task_list = await self.repo.get_list_row(list_id, LIST_ROW_FIELDS)
+            if not task_list:
+                return None
+
+            tasks = await self.repo.list_tasks(list_id, fields=TASK_OUT_FIELDS)
+            return {
+                "id": task_list["id"],
+                "name": task_list["name"],
+                "created_at": task_list["created_at"],
+                "tasks": tasks,
+                "completed_percentage": completed_percentage(
+                    task_list["completed_tasks"], task_list["total_tasks"]
+                ),
+            }
+
+        return await self.cache.get_or_load(list_id, ("list", etag), load)
+
+    async def get_all_lists(
+        self,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        etag: Optional[str] = None,
+    ) -> dict:
+        """
+        Returns:
+            dict: A page in the shape of `TaskListPage`, like the result of
+            `get_list_with_progress` (see it for `etag` too).
+        """
+        after = parse_cursor(cursor)
+
+        async def load():
+            rows = await self.repo.get_all_lists(limit + 1, after)
+            rows, next_cursor = split_page(rows, limit)
+            for row in rows:
+                row["completed_percentage"] = completed_percentage(
+                    row["completed_tasks"], row["total_tasks"]
+                )
+            return {"items": rows, "next_cursor": next_cursor}
+
+        return await self.cache.get_or_load(
+            INDEX_SCOPE, ("page", limit, cursor, etag), load
+        )
 
     async def create_task(self, list_id: int, payload: TaskCreate):
-        task_list = await self.repo.get_list(list_id)
-        if not task_list:
+        if not await self.repo.list_exists(list_id):
             raise HTTPException(status_code=404, detail="Task list not found")
 
         task = await self.repo.create_task(list_id, payload.model_dump())
+        await self.cache.invalidate_lists([list_id])
         return TaskOut.model_validate(task)
 
-    async def list_tasks(self, list_id: int, completed=None, priority=None):
-        return await self.repo.list_tasks(list_id, completed, priority)
+    async def bulk_create_tasks(self, list_id: int, items: list[dict]):
+        if len(items) > settings.BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {settings.BULK_MAX_ITEMS} tasks per request",
+            )
+        if not await self.repo.list_exists(list_id):
+            raise HTTPException(status_code=404, detail="Task list not found")
+
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, TaskCreate.model_validate(item)))
+            except ValidationError as exc:
+                errors.append(
+                    TaskBulkError(
+                        index=index,
+                        errors=exc.errors(include_url=False, include_context=False),
+                    )
+                )
+
+        ids = await self.repo.bulk_create_tasks(
+            list_id, [payload.model_dump() for _, payload in valid]
+        )
+        if ids:
+            await self.cache.invalidate_lists([list_id])
+        created = [
+            TaskBulkCreated(index=index, id=task_id)
+            for (index, _), task_id in zip(valid, ids)
+        ]
+        return TaskBulkCreateResult(created=created, errors=errors)
+
+    async def import_tasks(
+        self, list_id: int, fmt: str, body: AsyncIterator[bytes]
+    ) -> TaskImportResult:
+        """
+        Imports the tasks of a CSV or NDJSON body while it is being received.
+
+        Rows are validated one by one as `TaskCreate` and written every
+        IMPORT_BATCH_SIZE valid rows, so memory is bounded by the batch size.
+        Invalid rows are counted and the first IMPORT_MAX_ERRORS are reported
+        by their position among the data rows.
+
+        Raises:
+            HTTPException: 404 if the task list does not exist, 400 if the body
+            is not UTF-8, 413 if a line is longer than IMPORT_MAX_LINE_LENGTH
+            (batches written before are kept in both cases).
+        """
+        if not await self.repo.list_exists(list_id):
+            raise HTTPException(status_code=404, detail="Task list not found")
+
+        start = perf_counter()
+        reader = csv_rows if fmt == "csv" else ndjson_rows
+        rows = reader(body, settings.IMPORT_MAX_LINE_LENGTH)
+        batch, errors = [], []
+        imported = failed = 0
+        index = -1
+        try:
+            async for index, row in aenumerate(readable_rows(rows)):
+                error = row if isinstance(row, ValueError) else None
+                if error is None:
+                    try:
+                        batch.append(TaskCreate.model_validate(row).model_dump())
+                    except ValidationError as exc:
+                        error = exc
+                if error is not None:
+                    failed += 1
+                    if len(errors) < settings.IMPORT_MAX_ERRORS:
+                        errors.append(
+                            TaskBulkError(index=index, errors=row_errors(error))
+                        )
+                    continue
+                if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                    imported += await self.repo.import_tasks(list_id, batch)
+                    batch = []
+            if batch:
+                imported += await self.repo.import_tasks(list_id, batch)
+        finally:
+            # Batches written before a failure are kept, so drop their reads too.
+            if imported:
+                await self.cache.invalidate_lists([list_id])
+
+        seconds = perf_counter() - start
+        return TaskImportResult(
+            imported=imported,
+            failed=failed,
+            errors=errors,
+            seconds=round(seconds, 3),
+            rows_per_second=round((index + 1) / seconds, 1) if seconds else 0.0,
+        )
+
+    async def list_tasks(
+        self,
+        list_id: int,
+        completed=None,
+        priority=None,
+        limit: int = settings.PAGE_SIZE_DEFAULT,
+        cursor: Optional[str] = None,
+        etag: Optional[str] = None,
+    ) -> dict:
+        """
+        Returns:
+            dict: A page in the shape of `TaskPage`, like the result of
+            `get_list_with_progress` (see it for `etag` too).
+        """
+        after = parse_cursor(cursor)
+
+        async def load():
+            tasks = await self.repo.list_tasks(
+                list_id, completed, priority, limit + 1, after, fields=TASK_OUT_FIELDS
+            )
+            tasks, next_cursor = split_page(tasks, limit)
+            return {"items": tasks, "next_cursor": next_cursor}
+
+        return await self.cache.get_or_load(
+            list_id, ("page", completed, priority, limit, cursor, etag), load
+        )
+
+    async def export_tasks(
+        self, list_id: int, fmt: str, completed=None, priority=None
+    ) -> AsyncIterator[bytes]:
+        """
+        Streams the tasks of a list as NDJSON or CSV, fetched in chunks of
+        EXPORT_CHUNK_SIZE rows.
+
+        Raises:
+            HTTPException: 404 if the task list does not exist.
+        """
+        if not await self.repo.list_exists(list_id):
+            raise HTTPException(status_code=404, detail="Task list not found")
+
+        chunks = self.repo.iter_tasks(
+            list_id,
+            completed,
+            priority,
+            chunk_size=settings.EXPORT_CHUNK_SIZE,
+            fields=TASK_OUT_FIELDS,
+        )
+        if fmt == "csv":
+            return csv_stream(chunks, TASK_OUT_FIELDS)
+        return ndjson_stream(chunks)
 
     async def update_task(self, task_id: int, payload: TaskUpdate):
-        task = await self.repo.get_task(task_id)
-        if not task:
-            return None
-        return await self.repo.update_task(task, payload.dict(exclude_unset=True))
+        data = payload.model_dump(exclude_unset=True)
+        if not data:
+            return await self.repo.get_task(task_id)
+        task = await self.repo.update_task(task_id, data)
+        if task is not None:
+            await self.cache.invalidate_lists([task.task_list_id])
+        return task
 
     async def delete_task(self, task_id: int):
-        deleted = await self.repo.delete_task(task_id)
-        if not deleted:
+        list_id = await self.repo.delete_task(task_id)
+        if list_id is None:
             raise HTTPException(404, "Task not found")
+        await self.cache.invalidate_lists([list_id])
         return {"message": "Task deleted successfully"}
 
+    def _bulk_selector(self, selection: TaskBulkSelection):
+        if selection.ids is None:
+            return self.repo.task_selector(**selection.filter.model_dump())
+        if len(selection.ids) > settings.BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {settings.BULK_MAX_ITEMS} tasks per request",
+            )
+        return self.repo.task_selector(ids=selection.ids)
+
+    async def bulk_update_tasks(self, payload: TaskBulkUpdate) -> TaskBulkResult:
+        data = payload.patch.model_dump(exclude_unset=True)
+        if not data:
+            raise HTTPException(status_code=400, detail="No fields to update")
+        affected = await self.repo.bulk_update_tasks(self._bulk_selector(payload), data)
+        if affected:
+            await self.cache.invalidate_all()
+        return TaskBulkResult(affected=affected)
+
+    async def bulk_delete_tasks(self, payload: TaskBulkSelection) -> TaskBulkResult:
+        affected = await self.repo.bulk_delete_tasks(self._bulk_selector(payload))
+        if affected:
+            await self.cache.invalidate_all()
+        return TaskBulkResult(affected=affected)
+
 
 task_service = TaskService()
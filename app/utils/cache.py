@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache whose entries expire after a TTL.
+
+    With `sizeof`, the cache also keeps the total size of its values and
+    evicts the least recently used entries beyond `maxbytes`.
+
+    Not thread-safe: it is meant to be used from the event loop only.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        maxbytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= monotonic():
+            self._remove(key)
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        size = self._sizeof(value)
+        if self.maxbytes is not None and size > self.maxbytes:
+            self.pop(key)
+            return
+        self.pop(key)
+        self._data[key] = (monotonic() + ttl, value)
+        self.nbytes += size
+        while len(self._data) > self.maxsize or (
+            self.maxbytes is not None and self.nbytes > self.maxbytes
+        ):
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Any:
+        if key not in self._data:
+            return None
+        return self._remove(key)
+
+    def _sizeof(self, value: Any) -> int:
+        return self.sizeof(value) if self.sizeof else 0
+
+    def _remove(self, key: Hashable) -> Any:
+        _, value = self._data.pop(key)
+        self.nbytes -= self._sizeof(value)
+        return value
+
+    def discard_where(self, predicate: Callable[[Any], bool]) -> int:
+        """
+        Removes every entry whose value matches the predicate.
+
+        Returns:
+            int: Number of removed entries.
+        """
+        keys = [key for key, (_, value) in self._data.items() if predicate(value)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        stats = {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+        if self.sizeof:
+            stats.update(bytes=self.nbytes, maxbytes=self.maxbytes)
+        return stats
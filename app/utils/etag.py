@@ -0,0 +1,26 @@
+import hashlib
+from typing import Any, Optional
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Builds a weak ETag from the values that identify a representation, such
+    as a resource version and the query parameters.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluates an If-None-Match header against the current ETag using the
+    weak comparison required for GET requests (RFC 9110, 13.1.2).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
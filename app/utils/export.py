@@ -0,0 +1,42 @@
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, Sequence
+import orjson
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+async def ndjson_stream(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    """
+    Encodes each chunk of rows as newline-delimited JSON, one object per line.
+    """
+    async for rows in chunks:
+        yield b"".join(
+            orjson.dumps(row, option=orjson.OPT_UTC_Z) + b"\n" for row in rows
+        )
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def csv_stream(
+    chunks: AsyncIterator[list[dict]], fields: Sequence[str]
+) -> AsyncIterator[bytes]:
+    """
+    Encodes each chunk of rows as CSV lines. The header is yielded before the
+    first chunk is fetched, so the client gets bytes right away.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue().encode()
+    async for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(row[field]) for field in fields] for row in rows)
+        yield buffer.getvalue().encode()
@@ -0,0 +1,38 @@
+from bisect import bisect_left
+
+
+class Histogram:
+    """
+    Counts observations in buckets with fixed upper bounds, reported as
+    cumulative counts like Prometheus histograms.
+    """
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """
+        Returns:
+            list[tuple[str, int]]: `(upper bound, observations <= bound)` per
+            bucket, ending with `("+Inf", count)`.
+        """
+        total, result = 0, []
+        for bound, count in zip((*map(str, self.buckets), "+Inf"), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "buckets": dict(self.cumulative()),
+            "count": self.count,
+            "sum": round(self.sum, 6),
+        }
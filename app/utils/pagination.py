@@ -0,0 +1,69 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from tortoise.expressions import Q
+
+Cursor = Tuple[datetime, int]
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """
+    Builds an opaque cursor pointing right after the given row.
+
+    Args:
+        created_at (datetime): Creation date of the last row of the page.
+        item_id (int): ID of the last row of the page.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    raw = json.dumps([created_at.isoformat(), item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Parses a cursor produced by `encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def after_cursor(cursor: Optional[Cursor]) -> Q:
+    """
+    Keyset condition selecting the rows that follow the cursor in
+    `(created_at, id)` order.
+    """
+    if cursor is None:
+        return Q()
+    created_at, item_id = cursor
+    return Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=item_id)
+
+
+def split_page(rows: list, limit: int) -> Tuple[list, Optional[str]]:
+    """
+    Trims a `limit + 1` fetch to a page and builds the cursor of the next one.
+
+    Args:
+        rows (list): Rows (models or dicts) fetched with `limit + 1`.
+        limit (int): Page size requested by the client.
+
+    Returns:
+        Tuple[list, Optional[str]]: The page rows and the next cursor, or None
+        when there are no more rows.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    if isinstance(last, dict):
+        return rows, encode_cursor(last["created_at"], last["id"])
+    return rows, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,95 @@
+import codecs
+import csv
+from typing import Any, AsyncIterator, Optional
+import orjson
+
+
+class LineTooLong(ValueError):
+    """
+    Raised when a line, or a CSV record, exceeds the maximum length. The
+    stream cannot be split into rows past it.
+    """
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_length: Optional[int] = None
+) -> AsyncIterator[str]:
+    """
+    Splits a stream of UTF-8 byte chunks into lines without buffering more
+    than one incomplete line.
+
+    Raises:
+        LineTooLong: If a line is longer than `max_length` characters.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            check_length(line, max_length)
+            yield line + "\n"
+        check_length(pending, max_length)
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def check_length(text: str, max_length: Optional[int]) -> None:
+    if max_length is not None and len(text) > max_length:
+        raise LineTooLong(f"Line longer than {max_length} characters")
+
+
+async def ndjson_rows(
+    chunks: AsyncIterator[bytes], max_length: Optional[int] = None
+) -> AsyncIterator[Any]:
+    """
+    Yields the value of every non-blank line. Lines that are not valid JSON
+    yield the `ValueError` raised while parsing them.
+
+    Raises:
+        LineTooLong: If a line is longer than `max_length` characters.
+    """
+    async for line in iter_lines(chunks, max_length):
+        if not line.strip():
+            continue
+        try:
+            yield orjson.loads(line)
+        except orjson.JSONDecodeError as exc:
+            yield exc
+
+
+async def csv_rows(
+    chunks: AsyncIterator[bytes], max_length: Optional[int] = None
+) -> AsyncIterator[Any]:
+    """
+    Yields every CSV record after the header as a dict keyed by the header.
+    Empty cells are left out so that the schema defaults apply. Records
+    with quoted line breaks are buffered until their closing quote; records
+    with more values than the header yield a `ValueError`.
+
+    Raises:
+        LineTooLong: If a record is longer than `max_length` characters.
+    """
+    header, record, length, quotes = None, [], 0, 0
+    async for line in iter_lines(chunks, max_length):
+        record.append(line)
+        length += len(line)
+        if max_length is not None and length > max_length:
+            raise LineTooLong(f"Record longer than {max_length} characters")
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        values = next(csv.reader(record), [])
+        record, length, quotes = [], 0, 0
+        if not values:
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) > len(header):
+            yield ValueError(
+                f"{len(values)} values for the {len(header)} columns of the header"
+            )
+            continue
+        yield {name: value for name, value in zip(header, values) if value != ""}
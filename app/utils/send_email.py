@@ -1,3 +1,7 @@
+import asyncio
+import smtplib
+from email.message import EmailMessage
+from app.core.config import settings
 from app.core.logging import get_logging
 
 log = get_logging(__name__)
@@ -5,3 +9,46 @@ log = get_logging(__name__)
 
 async def simulate_task_assignment_email(user_email: str, task_title: str) -> None:
     log.info(f"Simulated notification sent to {user_email} " f"for task '{task_title}'")
+
+
+def build_assignment_digest(user_email: str, task_titles: list[str]) -> EmailMessage:
+    """
+    Builds a single message listing every task assigned to the user.
+    """
+    message = EmailMessage()
+    message["From"] = settings.SMTP_FROM
+    message["To"] = user_email
+    if len(task_titles) == 1:
+        message["Subject"] = f"Task assigned: {task_titles[0]}"
+    else:
+        message["Subject"] = f"{len(task_titles)} tasks assigned to you"
+    lines = "\n".join(f"- {title}" for title in task_titles)
+    message.set_content(f"The following tasks were assigned to you:\n\n{lines}\n")
+    return message
+
+
+def _send_smtp(message: EmailMessage) -> None:
+    with smtplib.SMTP(
+        settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS
+    ) as smtp:
+        if settings.SMTP_STARTTLS:
+            smtp.starttls()
+        if settings.SMTP_USERNAME:
+            smtp.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+        smtp.send_message(message)
+
+
+async def send_task_assignment_digest(user_email: str, task_titles: list[str]) -> None:
+    """
+    Sends one email with all the given task assignments. Without SMTP_HOST
+    configured the notifications are only simulated in the logs.
+
+    Raises:
+        OSError: If the SMTP server cannot be reached or rejects the message.
+    """
+    if not settings.SMTP_HOST:
+        for task_title in task_titles:
+            await simulate_task_assignment_email(user_email, task_title)
+        return
+    message = build_assignment_digest(user_email, task_titles)
+    await asyncio.to_thread(_send_smtp, message)
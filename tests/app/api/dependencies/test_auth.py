@@ -3,11 +3,19 @@ from jose import jwt
 from datetime import datetime, timedelta
 from fastapi import HTTPException
 from unittest.mock import AsyncMock, patch
-from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.auth import get_current_user, get_ops_user
 from app.core.config import settings
+from app.core.security import current_user_cache, invalidate_cached_user
 from app.infrastructure.database.models.user import User
 
 
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    current_user_cache.clear()
+    yield
+    current_user_cache.clear()
+
+
 def generate_token(email: str):
     expire = datetime.utcnow() + timedelta(minutes=30)
     payload = {"sub": email, "exp": expire}
@@ -78,3 +86,65 @@ async def test_get_current_user_token_missing_sub():
 
     assert exc_info.value.status_code == 401
     assert "Could not validate credentials" in str(exc_info.value.detail)
+
+
+@pytest.mark.asyncio
+@patch("app.api.dependencies.auth.User.get_or_none", new_callable=AsyncMock)
+async def test_get_current_user_served_from_cache(mock_get_user):
+    token = generate_token("test@example.com")
+    mock_user = User()
+    mock_user.email = "test@example.com"
+    mock_user.is_active = True
+    mock_get_user.return_value = mock_user
+
+    first = await get_current_user(token=token)
+    second = await get_current_user(token=token)
+
+    assert first is second
+    mock_get_user.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@patch("app.api.dependencies.auth.User.get_or_none", new_callable=AsyncMock)
+async def test_get_current_user_cache_invalidated(mock_get_user):
+    token = generate_token("test@example.com")
+    mock_user = User()
+    mock_user.email = "test@example.com"
+    mock_user.is_active = True
+    mock_get_user.return_value = mock_user
+    await get_current_user(token=token)
+
+    assert invalidate_cached_user("test@example.com") == 1
+    mock_user.is_active = False
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(token=token)
+
+    assert exc_info.value.status_code == 401
+    assert mock_get_user.await_count == 2
+
+
+@pytest.mark.asyncio
+@patch("app.api.dependencies.auth.User.get_or_none", new_callable=AsyncMock)
+async def test_get_current_user_rejected_users_not_cached(mock_get_user):
+    token = generate_token("test@example.com")
+    mock_get_user.return_value = None
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await get_current_user(token=token)
+
+    assert len(current_user_cache) == 0
+    assert mock_get_user.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_ops_user_only_allows_listed_emails():
+    user = User(email="ops@example.com")
+
+    with patch.object(settings, "OPS_ADMIN_EMAILS", ["ops@example.com"]):
+        assert await get_ops_user(user) is user
+        with pytest.raises(HTTPException) as exc_info:
+            await get_ops_user(User(email="someone@example.com"))
+
+    assert exc_info.value.status_code == 403
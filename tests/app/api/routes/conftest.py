@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+import httpx
+import pytest
+import pytest_asyncio
+from app.api.dependencies.auth import get_current_user
+from app.infrastructure.cache.memory import MemoryCacheBackend
+from app.infrastructure.database.models.user import User
+from app.main import create_application
+from app.services.task_cache import TaskReadCache
+from app.services.task_service import task_service
+
+
+@pytest.fixture
+def query_budget(count_queries):
+    """
+    Returns a context manager that fails the test when its block sends more
+    than `limit` statements to the database, listing them.
+    """
+
+    @contextmanager
+    def _query_budget(limit: int):
+        with count_queries() as counter:
+            yield counter
+        assert (
+            counter.count <= limit
+        ), f"{counter.count} queries for a budget of {limit}:\n" + "\n".join(
+            counter.queries
+        )
+
+    return _query_budget
+
+
+@pytest_asyncio.fixture
+async def api_client(db, monkeypatch):
+    """
+    Client of the whole application on a real database, authenticated as
+    `owner@example.com` and with an empty read cache.
+    """
+    user = await User.create(email="owner@example.com", hashed_password="x")
+    monkeypatch.setattr(
+        task_service, "cache", TaskReadCache(MemoryCacheBackend(100, 10**6), ttl=30)
+    )
+    app = create_application()
+    app.dependency_overrides[get_current_user] = lambda: user
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
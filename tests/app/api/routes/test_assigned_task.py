@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.routes import assigned_task
+from app.infrastructure.database.models.user import User
+from unittest.mock import AsyncMock, patch
+
+client = TestClient(app)
+
+
+def mock_get_current_user():
+    return User(id=1, email="test@example.com")
+
+
+@pytest.fixture(autouse=True)
+def override_get_current_user():
+    app.dependency_overrides[assigned_task.get_current_user] = mock_get_current_user
+    yield
+    app.dependency_overrides = {}
+
+
+@patch(
+    "app.api.routes.assigned_task.assigned_task_service.assign_user_to_task",
+    new_callable=AsyncMock,
+)
+def test_assign_task(mock_assign):
+    mock_assign.return_value = {"message": "Task assigned to ana@example.com"}
+
+    response = client.post(
+        "/api/assigned_task/5", json={"user_email": "ana@example.com"}
+    )
+    assert response.status_code == 200
+    assert response.json()["message"] == "Task assigned to ana@example.com"
+
+
+@patch(
+    "app.api.routes.assigned_task.assigned_task_service.assign_users_to_tasks",
+    new_callable=AsyncMock,
+)
+def test_assign_tasks_batch(mock_assign_batch):
+    mock_assign_batch.return_value = {
+        "assigned": 1,
+        "errors": [{"index": 1, "detail": "Task not found"}],
+    }
+
+    payload = [
+        {"task_id": 5, "user_email": "ana@example.com"},
+        {"task_id": 99, "user_email": "ana@example.com"},
+    ]
+
+    response = client.post("/api/assigned_task/batch", json=payload)
+    assert response.status_code == 200
+    assert response.json()["assigned"] == 1
+    items = mock_assign_batch.await_args.args[0]
+    assert [item.task_id for item in items] == [5, 99]
@@ -0,0 +1,60 @@
+import asyncio
+import re
+import httpx
+import pytest
+from app.api.dependencies.auth import get_current_user
+from app.core.metrics import CONTENT_TYPE
+from app.infrastructure.database.instrumentation import instrument_queries
+from app.infrastructure.database.models.task import TaskList
+from app.infrastructure.database.models.user import User
+from app.main import create_application
+
+pytestmark = pytest.mark.asyncio
+
+SAMPLE = re.compile(r"^(\w+)(?:\{(.*)\})? (\S+)$")
+ROUTE = 'method="GET",route="/api/task/lists/{list_id}"'
+
+
+def parse(text: str) -> dict:
+    samples = {}
+    for line in text.splitlines():
+        if not line.startswith("#"):
+            name, labels, value = SAMPLE.match(line).groups()
+            samples[(name, labels or "")] = float(value)
+    return samples
+
+
+async def test_scrape_under_load(db):
+    instrument_queries()
+    app = create_application()
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, email="a@b.c")
+    task_list = await TaskList.create(name="List")
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        before = parse((await c.get("/metrics")).text)
+
+        async def scrape():
+            for _ in range(10):
+                response = await c.get("/metrics")
+                assert response.status_code == 200
+                assert response.headers["content-type"] == CONTENT_TYPE
+                parse(response.text)
+                await asyncio.sleep(0)
+
+        load = [c.get(f"/api/task/lists/{task_list.id}") for _ in range(50)]
+        responses, _ = await asyncio.gather(asyncio.gather(*load), scrape())
+        await c.get("/not-a-route")
+        after = parse((await c.get("/metrics")).text)
+
+    def delta(name: str, labels: str) -> float:
+        return after[(name, labels)] - before.get((name, labels), 0)
+
+    assert [r.status_code for r in responses] == [200] * 50, responses[0].text
+    assert delta("http_requests_total", f'{ROUTE},status="200"') == 50
+    assert delta("http_request_duration_seconds_count", ROUTE) == 50
+    assert delta("db_queries_total", ROUTE) >= 50
+    assert delta("db_query_seconds_total", ROUTE) > 0
+    assert delta("http_requests_total", 'method="",route="<unmatched>",status="404"')
+    # Only the final scrape itself is in flight.
+    assert after[("http_requests_in_flight", "")] == 1
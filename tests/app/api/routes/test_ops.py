@@ -0,0 +1,47 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.dependencies.auth import get_current_user
+from app.api.routes import ops
+from app.infrastructure.database.models.user import User
+
+client = TestClient(app)
+
+
+def mock_get_current_user():
+    return User(id=1, email="test@example.com")
+
+
+@pytest.fixture(autouse=True)
+def override_get_current_user():
+    app.dependency_overrides[ops.get_ops_user] = mock_get_current_user
+    yield
+    app.dependency_overrides = {}
+
+
+@patch(
+    "app.api.routes.ops.notification_dispatcher.metrics",
+    new_callable=AsyncMock,
+    return_value={"queue_depth": 3, "oldest_pending_age_seconds": 1.5},
+)
+@patch(
+    "app.api.routes.ops.pool_stats",
+    return_value={"backend": "asyncpg", "in_use": 2, "waiters": 0},
+)
+def test_get_stats(mock_pool_stats, mock_metrics):
+    response = client.get("/api/ops/stats")
+
+    assert response.status_code == 200
+    assert set(response.json()["auth_cache"]) >= {"hits", "misses", "size"}
+    assert response.json()["notifications"]["queue_depth"] == 3
+    assert response.json()["db_pool"]["in_use"] == 2
+    assert set(response.json()["task_cache"]) >= {"hit_ratio", "evictions", "bytes"}
+
+
+def test_get_stats_forbidden_to_other_users():
+    app.dependency_overrides = {get_current_user: mock_get_current_user}
+
+    response = client.get("/api/ops/stats")
+
+    assert response.status_code == 403
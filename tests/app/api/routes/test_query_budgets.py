@@ -0,0 +1,94 @@
+import pytest
+from app.infrastructure.database.models.task import Task, TaskList
+from app.infrastructure.database.models.user import User
+
+pytestmark = pytest.mark.asyncio
+
+SIZES = [1, 25]
+
+
+async def seed(lists: int, tasks_per_list: int) -> list[TaskList]:
+    task_lists = [await TaskList.create(name=f"List {i}") for i in range(lists)]
+    await Task.bulk_create(
+        [
+            Task(title=f"Task {i}", task_list_id=task_list.id)
+            for task_list in task_lists
+            for i in range(tasks_per_list)
+        ]
+    )
+    return task_lists
+
+
+class TestQueryBudgets:
+    """
+    Cold-cache reads and writes must send a fixed number of statements,
+    whatever the amount of data: more usually means an N+1 came back.
+    """
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_list_index(self, api_client, query_budget, size):
+        await seed(size, 3)
+
+        with query_budget(2):
+            response = await api_client.get("/api/task/lists")
+
+        assert len(response.json()["items"]) == size
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_list_detail(self, api_client, query_budget, size):
+        [task_list] = await seed(1, size)
+
+        with query_budget(3):
+            response = await api_client.get(f"/api/task/lists/{task_list.id}")
+
+        assert len(response.json()["tasks"]) == size
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_filtered_tasks(self, api_client, query_budget, size):
+        [task_list] = await seed(1, size)
+
+        with query_budget(2):
+            response = await api_client.get(
+                f"/api/task/lists/{task_list.id}/tasks", params={"completed": False}
+            )
+
+        assert len(response.json()["items"]) == size
+
+    async def test_create_task(self, api_client, query_budget):
+        [task_list] = await seed(1, 1)
+
+        with query_budget(3):
+            response = await api_client.post(
+                f"/api/task/lists/{task_list.id}/tasks", json={"title": "New"}
+            )
+
+        assert response.status_code == 201
+
+    async def test_update_task(self, api_client, query_budget):
+        [task_list] = await seed(1, 1)
+        task = await Task.get(task_list_id=task_list.id)
+
+        with query_budget(2):
+            response = await api_client.patch(
+                f"/api/task/tasks/{task.id}", json={"completed": True}
+            )
+
+        assert response.json()["completed"] is True
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_assign_batch(self, api_client, query_budget, size):
+        [task_list] = await seed(1, size)
+        tasks = await Task.filter(task_list_id=task_list.id)
+        emails = ["ana@example.com", "bob@example.com"]
+        for email in emails:
+            await User.create(email=email, hashed_password="x")
+        items = [
+            {"task_id": task.id, "user_email": emails[i % 2]}
+            for i, task in enumerate(tasks)
+        ]
+
+        # One UPDATE per distinct user, not per task.
+        with query_budget(5):
+            response = await api_client.post("/api/assigned_task/batch", json=items)
+
+        assert response.json()["assigned"] == size
@@ -3,7 +3,9 @@ from fastapi.testclient import TestClient
 from app.main import app
 from app.api.routes import task
 from app.infrastructure.database.models.user import User
-from unittest.mock import AsyncMock, patch
+from datetime import datetime, timezone
+from unittest.mock import DEFAULT, AsyncMock, patch
+from app.infrastructure.database.pool import PoolAcquireTimeout
 
 client = TestClient(app)
 
@@ -19,6 +21,23 @@ def override_get_current_user():
     app.dependency_overrides = {}
 
 
+ETAG = 'W/"0123456789abcdef"'
+
+
+@pytest.fixture(autouse=True)
+def mock_etags():
+    with patch.multiple(
+        "app.api.routes.task.task_service",
+        new_callable=AsyncMock,
+        get_list_etag=DEFAULT,
+        get_lists_etag=DEFAULT,
+        get_tasks_etag=DEFAULT,
+    ) as mocks:
+        for mock in mocks.values():
+            mock.return_value = ETAG
+        yield mocks
+
+
 @patch("app.api.routes.task.task_service.create_list", new_callable=AsyncMock)
 def test_create_list(mock_create_list):
     # Given
@@ -44,37 +63,39 @@ def test_create_list(mock_create_list):
 
 @patch("app.api.routes.task.task_service.get_all_lists", new_callable=AsyncMock)
 def test_get_lists(mock_get_all_lists):
-    mock_get_all_lists.return_value = [
-        {
-            "id": 1,
-            "name": "job",
-            "created_at": "2025-08-06T18:30:37.097015Z",
-            "tasks": [
-                {
-                    "id": 1,
-                    "title": "programmer",
-                    "description": "vscode",
-                    "priority": 1,
-                    "completed": False,
-                    "created_at": "2025-08-06T18:40:29.889838Z",
-                }
-            ],
-            "completed_percentage": 0,
-        },
-        {
-            "id": 2,
-            "name": "test",
-            "created_at": "2025-08-07T13:55:39.476064Z",
-            "tasks": [],
-            "completed_percentage": 0,
-        },
-    ]
-
-    response = client.get("/api/task/lists")
+    mock_get_all_lists.return_value = {
+        "items": [
+            {
+                "id": 1,
+                "name": "job",
+                "created_at": "2025-08-06T18:30:37.097015Z",
+                "total_tasks": 1,
+                "completed_tasks": 0,
+                "completed_percentage": 0,
+            },
+            {
+                "id": 2,
+                "name": "test",
+                "created_at": "2025-08-07T13:55:39.476064Z",
+                "total_tasks": 0,
+                "completed_tasks": 0,
+                "completed_percentage": 0,
+            },
+        ],
+        "next_cursor": "abc",
+    }
+
+    response = client.get("/api/task/lists?limit=2")
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) == 2
+    assert len(data["items"]) == 2
+    assert data["next_cursor"] == "abc"
+    mock_get_all_lists.assert_awaited_once_with(2, None, response.headers["ETag"])
+
+
+def test_get_lists_limit_out_of_range():
+    response = client.get("/api/task/lists?limit=0")
+    assert response.status_code == 422
 
 
 @patch(
@@ -97,12 +118,81 @@ def test_get_list_success(mock_get_list):
 @patch(
     "app.api.routes.task.task_service.get_list_with_progress", new_callable=AsyncMock
 )
-def test_get_list_not_found(mock_get_list):
-    mock_get_list.return_value = None
+def test_get_list_serializes_trusted_rows(mock_get_list):
+    created_at = datetime(2025, 8, 7, 13, 55, 39, tzinfo=timezone.utc)
+    row = {
+        "id": 7,
+        "title": "Row",
+        "description": None,
+        "priority": 1,
+        "completed": False,
+        "created_at": created_at,
+    }
+    mock_get_list.return_value = {
+        "id": 1,
+        "name": "test",
+        "created_at": created_at,
+        "tasks": [row],
+        "completed_percentage": 0,
+    }
+
+    response = client.get("/api/task/lists/1")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["tasks"] == [{**row, "created_at": "2025-08-07T13:55:39Z"}]
+
+
+@patch(
+    "app.api.routes.task.task_service.get_list_with_progress", new_callable=AsyncMock
+)
+def test_get_list_not_found(mock_get_list, mock_etags):
+    mock_etags["get_list_etag"].return_value = None
 
     response = client.get("/api/task/lists/999")
     assert response.status_code == 404
     assert response.json()["detail"] == "Task list not found"
+    mock_get_list.assert_not_awaited()
+
+
+@pytest.mark.parametrize(
+    "url, method",
+    [
+        ("/api/task/lists", "get_all_lists"),
+        ("/api/task/lists/1", "get_list_with_progress"),
+        ("/api/task/lists/1/tasks?completed=false", "list_tasks"),
+    ],
+)
+def test_conditional_get_not_modified(url, method):
+    with patch(
+        f"app.api.routes.task.task_service.{method}", new_callable=AsyncMock
+    ) as mock_read:
+        response = client.get(url, headers={"If-None-Match": ETAG})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == ETAG
+    assert response.content == b""
+    mock_read.assert_not_awaited()
+
+
+@patch(
+    "app.api.routes.task.task_service.get_list_with_progress",
+    new_callable=AsyncMock,
+)
+def test_conditional_get_stale_etag(mock_get_list):
+    mock_get_list.return_value = {
+        "id": 1,
+        "name": "My list",
+        "created_at": "2025-08-07T14:03:19.297759Z",
+        "tasks": [],
+        "completed_percentage": 0.0,
+    }
+
+    response = client.get("/api/task/lists/1", headers={"If-None-Match": 'W/"old"'})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == ETAG
+    assert response.headers["cache-control"] == "private, no-cache"
 
 
 @patch("app.api.routes.task.task_service.create_task", new_callable=AsyncMock)
@@ -123,31 +213,90 @@ def test_create_task(mock_create_task):
     assert response.json()["title"] == "Write tests"
 
 
+@patch("app.api.routes.task.task_service.export_tasks", new_callable=AsyncMock)
+def test_export_tasks(mock_export_tasks):
+    async def stream():
+        yield b"id,title\r\n"
+        yield b"1,Write tests\r\n"
+
+    mock_export_tasks.return_value = stream()
+
+    response = client.get("/api/task/lists/1/export?format=csv&priority=2")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "list-1.csv" in response.headers["content-disposition"]
+    assert response.text == "id,title\r\n1,Write tests\r\n"
+    mock_export_tasks.assert_awaited_once_with(1, "csv", None, 2)
+
+
+@patch("app.api.routes.task.task_service.import_tasks", new_callable=AsyncMock)
+def test_import_tasks(mock_import_tasks):
+    received = []
+
+    async def import_tasks(list_id, fmt, body):
+        received.extend([chunk async for chunk in body])
+        return {
+            "imported": 1,
+            "failed": 0,
+            "errors": [],
+            "seconds": 0.01,
+            "rows_per_second": 100.0,
+        }
+
+    mock_import_tasks.side_effect = import_tasks
+
+    response = client.post(
+        "/api/task/lists/1/tasks/import?format=csv",
+        content=b"title\nWrite tests\n",
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 201
+    assert response.json()["imported"] == 1
+    assert b"".join(received) == b"title\nWrite tests\n"
+    assert mock_import_tasks.await_args.args[:2] == (1, "csv")
+
+
+def test_export_tasks_invalid_format():
+    response = client.get("/api/task/lists/1/export?format=xml")
+    assert response.status_code == 422
+
+
 @patch("app.api.routes.task.task_service.list_tasks", new_callable=AsyncMock)
 def test_list_tasks(mock_list_tasks):
-    mock_list_tasks.return_value = [
-        {
-            "id": 4,
-            "title": "test",
-            "description": "c-test",
-            "priority": 2,
-            "completed": False,
-            "created_at": "2025-08-07T14:03:45.311669Z",
-        },
-        {
-            "id": 5,
-            "title": "test",
-            "description": "c-test",
-            "priority": 1,
-            "completed": False,
-            "created_at": "2025-08-07T14:03:45.311669Z",
-        },
-    ]
-
-    response = client.get("/api/task/lists/1/tasks?completed=true&priority=2")
+    mock_list_tasks.return_value = {
+        "items": [
+            {
+                "id": 4,
+                "title": "test",
+                "description": "c-test",
+                "priority": 2,
+                "completed": False,
+                "created_at": "2025-08-07T14:03:45.311669Z",
+            },
+            {
+                "id": 5,
+                "title": "test",
+                "description": "c-test",
+                "priority": 1,
+                "completed": False,
+                "created_at": "2025-08-07T14:03:45.311669Z",
+            },
+        ],
+        "next_cursor": None,
+    }
+
+    response = client.get(
+        "/api/task/lists/1/tasks?completed=true&priority=2&limit=10&cursor=xyz"
+    )
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
+    assert isinstance(data["items"], list)
+    assert data["next_cursor"] is None
+    mock_list_tasks.assert_awaited_once_with(
+        1, True, 2, 10, "xyz", response.headers.get("ETag")
+    )
 
 
 @patch("app.api.routes.task.task_service.update_task", new_callable=AsyncMock)
@@ -182,6 +331,15 @@ def test_update_task_not_found(mock_update_task):
     assert response.json()["detail"] == "Task not found"
 
 
+@pytest.mark.parametrize("field", ["title", "priority", "completed"])
+@patch("app.api.routes.task.task_service.update_task", new_callable=AsyncMock)
+def test_update_task_rejects_null(mock_update_task, field):
+    response = client.patch("/api/task/tasks/5", json={field: None})
+
+    assert response.status_code == 422
+    mock_update_task.assert_not_awaited()
+
+
 @patch("app.api.routes.task.task_service.delete_task", new_callable=AsyncMock)
 def test_delete_task(mock_delete_task):
     mock_delete_task.return_value = {"message": "Task deleted successfully"}
@@ -189,3 +347,65 @@ def test_delete_task(mock_delete_task):
     response = client.delete("/api/task/tasks/5")
     assert response.status_code == 200
     assert response.json()["message"] == "Task deleted successfully"
+
+
+@patch("app.api.routes.task.task_service.bulk_create_tasks", new_callable=AsyncMock)
+def test_bulk_create_tasks(mock_bulk_create):
+    mock_bulk_create.return_value = {
+        "created": [{"index": 0, "id": 10}],
+        "errors": [{"index": 1, "errors": [{"loc": ["title"], "type": "missing"}]}],
+    }
+
+    payload = [{"title": "Import me"}, {"priority": 2}]
+
+    response = client.post("/api/task/lists/1/tasks/bulk", json=payload)
+    assert response.status_code == 201
+    assert response.json()["created"] == [{"index": 0, "id": 10}]
+    assert response.json()["errors"][0]["index"] == 1
+    mock_bulk_create.assert_awaited_once_with(1, payload)
+
+
+@patch("app.api.routes.task.task_service.bulk_update_tasks", new_callable=AsyncMock)
+def test_bulk_update_tasks(mock_bulk_update):
+    mock_bulk_update.return_value = {"affected": 3}
+
+    payload = {"filter": {"list_id": 1}, "patch": {"completed": True}}
+
+    response = client.post("/api/task/tasks/bulk/update", json=payload)
+    assert response.status_code == 200
+    assert response.json() == {"affected": 3}
+    sent = mock_bulk_update.await_args.args[0]
+    assert sent.filter.list_id == 1
+    assert sent.patch.completed is True
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"patch": {"completed": True}},
+        {"ids": [1], "filter": {"list_id": 1}, "patch": {"completed": True}},
+        {"filter": {}, "patch": {"completed": True}},
+    ],
+)
+def test_bulk_update_tasks_invalid_selection(payload):
+    response = client.post("/api/task/tasks/bulk/update", json=payload)
+    assert response.status_code == 422
+
+
+@patch("app.api.routes.task.task_service.bulk_delete_tasks", new_callable=AsyncMock)
+def test_bulk_delete_tasks(mock_bulk_delete):
+    mock_bulk_delete.return_value = {"affected": 2}
+
+    response = client.post("/api/task/tasks/bulk/delete", json={"ids": [4, 5]})
+    assert response.status_code == 200
+    assert response.json() == {"affected": 2}
+
+
+@patch("app.api.routes.task.task_service.update_task", new_callable=AsyncMock)
+def test_pool_acquire_timeout_is_a_503(mock_update_task):
+    mock_update_task.side_effect = PoolAcquireTimeout("No connection free")
+
+    response = client.patch("/api/task/tasks/1", json={"title": "Busy"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,102 @@
+import httpx
+import pytest
+from app.core.config import settings
+from app.core.security import create_access_token, hash_password
+from app.core.tracing import SpanExporter
+from app.infrastructure.database.instrumentation import instrument_queries
+from app.infrastructure.database.models.task import TaskList
+from app.infrastructure.database.models.user import User
+from app.main import create_application
+from app.services.task_cache import TaskReadCache
+from app.services.task_service import task_service
+
+pytestmark = pytest.mark.asyncio
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+class CapturingExporter(SpanExporter):
+    def __init__(self):
+        super().__init__()
+        self.traces = []
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+    def write(self, payload):
+        pass
+
+
+async def test_request_is_traced_from_route_to_database(db, monkeypatch):
+    instrument_queries()
+    exporter = CapturingExporter()
+    monkeypatch.setattr(settings, "TRACING_ENABLED", True)
+    monkeypatch.setattr(settings, "TRACING_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr("app.main.span_exporter", exporter)
+    monkeypatch.setattr(task_service, "cache", TaskReadCache(None, ttl=30))
+    user = await User.create(email="owner@example.com", hashed_password="x")
+    task_list = await TaskList.create(name="List")
+    token = create_access_token({"sub": user.email})
+    transport = httpx.ASGITransport(app=create_application())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        untraced = await c.get(f"/api/task/lists/{task_list.id}")
+        response = await c.get(
+            f"/api/task/lists/{task_list.id}",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-01",
+            },
+        )
+
+    assert "traceparent" not in untraced.headers
+    assert response.status_code == 200
+    assert response.headers["traceparent"].startswith(f"00-{TRACE_ID}-")
+    timing = response.headers["Server-Timing"]
+    for phase in ("auth", "service", "repo", "db", "total"):
+        assert f"{phase};dur=" in timing
+    [trace] = exporter.traces
+    spans = {span.name: span for span in trace.spans}
+    root = spans["GET /api/task/lists/{list_id}"]
+    assert root.attributes["http.status_code"] == 200
+    assert spans["auth.get_current_user"].parent_id == root.span_id
+    assert spans["auth.jwt_decode"].kind == "auth"
+    service = spans["TaskService.get_list_with_progress"]
+    assert service.parent_id == root.span_id
+    assert spans["TaskRepository.list_tasks"].parent_id == service.span_id
+    by_id = {span.span_id: span for span in trace.spans}
+    queries = [span for span in trace.spans if span.kind == "db"]
+    assert {by_id[span.parent_id].kind for span in queries} == {"auth", "repo"}
+
+
+def timing_durations(header: str) -> dict[str, float]:
+    return {
+        name: float(duration.removeprefix("dur="))
+        for name, duration in (part.split(";") for part in header.split(", "))
+    }
+
+
+async def test_login_counts_password_hashing_once(db, monkeypatch):
+    instrument_queries()
+    exporter = CapturingExporter()
+    monkeypatch.setattr(settings, "TRACING_ENABLED", True)
+    monkeypatch.setattr(settings, "TRACING_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr("app.main.span_exporter", exporter)
+    await User.create(email="owner@example.com", hashed_password=hash_password("pw"))
+    transport = httpx.ASGITransport(app=create_application())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        response = await c.post(
+            "/api/auth/login", data={"username": "owner@example.com", "password": "pw"}
+        )
+
+    assert response.status_code == 200
+    [trace] = exporter.traces
+    spans = {span.name: span for span in trace.spans}
+    service = spans["AuthService.login_user"]
+    assert spans["auth.verify_password"].parent_id == service.span_id
+    timing = timing_durations(response.headers["Server-Timing"])
+    # The hashing is part of the service time, not a phase of its own, so
+    # the phases add up to the total.
+    assert "auth" not in timing
+    assert timing["service"] + timing["app"] == pytest.approx(timing["total"], abs=0.02)
@@ -0,0 +1,83 @@
+import logging
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from app.api.middleware import QueryStatsMiddleware, ReplicaReadsMiddleware
+from app.infrastructure.database.instrumentation import current_query_stats
+from app.infrastructure.database.routing import reading_from_replica
+
+app = FastAPI()
+app.add_middleware(ReplicaReadsMiddleware)
+
+
+@app.get("/read")
+@app.post("/read")
+async def read() -> dict:
+    return {"replica": reading_from_replica()}
+
+
+@patch(
+    "app.infrastructure.database.routing.settings.DATABASE_REPLICA_URL",
+    "sqlite://replica.db",
+)
+def test_only_safe_requests_read_the_replica():
+    client = TestClient(app)
+
+    assert client.get("/read").json() == {"replica": True}
+    assert client.post("/read").json() == {"replica": False}
+
+
+def test_reads_stay_on_the_primary_without_replica():
+    assert TestClient(app).get("/read").json() == {"replica": False}
+
+
+def query_app(**options) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, **options)
+
+    @app.get("/lists/{list_id}")
+    async def get_list(list_id: int) -> dict:
+        # Stands in for the statements counted by the instrumented clients.
+        current_query_stats().count += list_id
+        current_query_stats().seconds += 0.002
+        if list_id == 0:
+            raise RuntimeError("Failed after its queries")
+        return {}
+
+    return app
+
+
+def test_query_headers_in_debug_mode():
+    response = TestClient(query_app(headers=True)).get("/lists/3")
+
+    assert response.headers["X-DB-Queries"] == "3"
+    assert response.headers["X-DB-Time-Ms"] == "2.00"
+
+
+def test_query_headers_are_off_by_default():
+    response = TestClient(query_app()).get("/lists/3")
+
+    assert "X-DB-Queries" not in response.headers
+
+
+def test_requests_beyond_the_threshold_are_logged(caplog):
+    client = TestClient(query_app(warn_threshold=5))
+
+    with caplog.at_level(logging.WARNING, logger="app.api.middleware"):
+        client.get("/lists/3")
+        client.get("/lists/8")
+
+    [record] = caplog.records
+    assert record.getMessage().startswith("GET /lists/{list_id}: 8 queries")
+    assert record.db_queries == 8
+
+
+def test_failed_requests_are_logged(caplog):
+    client = TestClient(query_app(warn_threshold=-1), raise_server_exceptions=False)
+
+    with caplog.at_level(logging.WARNING, logger="app.api.middleware"):
+        response = client.get("/lists/0")
+
+    assert response.status_code == 500
+    [record] = caplog.records
+    assert record.getMessage().startswith("GET /lists/{list_id}: 0 queries")
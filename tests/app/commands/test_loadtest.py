@@ -0,0 +1,78 @@
+import argparse
+import httpx
+import pytest
+from app.commands.loadtest import compare, parse_mix, percentile, run_load
+from app.commands.seed import SeedConfig, seed
+from app.infrastructure.cache.memory import MemoryCacheBackend
+from app.main import create_application
+from app.services.task_cache import TaskReadCache
+from app.services.task_service import task_service
+
+
+def report(p95_ms: float, rps: float) -> dict:
+    return {"endpoints": {"list_index": {"p95_ms": p95_ms, "rps": rps}}}
+
+
+class TestReport:
+
+    def test_percentile_is_nearest_rank(self):
+        samples = [float(i) for i in range(1, 101)]
+
+        assert percentile(samples, 50) == 50
+        assert percentile(samples, 95) == 95
+        assert percentile(samples, 99) == 99
+        assert percentile([3.0], 99) == 3
+        assert percentile([], 50) == 0
+
+    def test_compare_flags_slower_p95_and_lower_rps(self):
+        baseline = report(p95_ms=10, rps=100)
+
+        assert compare(report(p95_ms=12, rps=90), baseline, tolerance=0.25) == []
+        assert compare(report(p95_ms=13, rps=100), baseline, tolerance=0.25) == [
+            "list_index: p95 10 ms -> 13 ms"
+        ]
+        assert compare(report(p95_ms=10, rps=70), baseline, tolerance=0.25) == [
+            "list_index: 100 -> 70 RPS"
+        ]
+
+    def test_compare_ignores_endpoints_missing_from_the_run(self):
+        assert compare({"endpoints": {}}, report(10, 100), tolerance=0) == []
+
+    def test_parse_mix(self):
+        assert parse_mix("list_index=3,patch_task=1") == {
+            "list_index": 3,
+            "patch_task": 1,
+        }
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_mix("delete_everything=1")
+
+
+@pytest.mark.asyncio
+class TestRunLoad:
+
+    async def test_run_load_reports_every_endpoint_of_the_mix(self, db, monkeypatch):
+        monkeypatch.setattr(
+            task_service,
+            "cache",
+            TaskReadCache(MemoryCacheBackend(100, 10**6), ttl=30),
+        )
+        data = await seed(SeedConfig(users=2, lists=2, tasks_per_list=5))
+        mix = {
+            "list_index": 1,
+            "list_detail": 1,
+            "filtered_tasks": 1,
+            "patch_task": 1,
+            "assign_task": 1,
+        }
+        transport = httpx.ASGITransport(app=create_application())
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            result = await run_load(client, data, mix, concurrency=2, requests=60)
+
+        assert result["total"]["requests"] == 60
+        assert result["total"]["errors"] == 0
+        assert set(result["endpoints"]) == set(mix)
+        for summary in result["endpoints"].values():
+            assert summary["rps"] > 0
+            assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
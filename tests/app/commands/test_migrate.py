@@ -0,0 +1,25 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.commands.migrate import main
+
+pytestmark = pytest.mark.asyncio
+
+
+@patch("app.commands.migrate.Tortoise.close_connections", new_callable=AsyncMock)
+@patch("app.commands.migrate.init_db", new_callable=AsyncMock)
+class TestMigrateCommand:
+
+    @patch("app.commands.migrate.migrate", new_callable=AsyncMock)
+    async def test_main_applies_up_to_target(self, mock_migrate, mock_init, mock_close):
+        mock_migrate.return_value = [MagicMock()]
+
+        assert await main(target=2, status=False) == 0
+        mock_migrate.assert_awaited_once_with(target=2)
+        mock_close.assert_awaited_once()
+
+    @patch("app.commands.migrate.pending_migrations", new_callable=AsyncMock)
+    async def test_main_status_exit_code(self, mock_pending, mock_init, mock_close):
+        mock_pending.return_value = [MagicMock(version=3, name="indexes")]
+
+        assert await main(target=None, status=True) == 1
+        mock_close.assert_awaited_once()
@@ -0,0 +1,57 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.commands.repair_counters import main, repair_counters
+
+pytestmark = pytest.mark.asyncio
+
+DRIFTED = [
+    {
+        "id": 1,
+        "total_tasks": 3,
+        "completed_tasks": 0,
+        "actual_total": 2,
+        "actual_completed": 1,
+    }
+]
+
+
+class TestRepairCounters:
+
+    @patch("app.commands.repair_counters.log")
+    @patch("app.commands.repair_counters.task_repo")
+    async def test_repair_counters_logs_drift(self, mock_repo, mock_log):
+        mock_repo.recompute_list_counters = AsyncMock(return_value=DRIFTED)
+        cache = AsyncMock()
+
+        result = await repair_counters(fix=True, cache=cache)
+
+        assert result == DRIFTED
+        mock_repo.recompute_list_counters.assert_awaited_once_with(fix=True)
+        mock_log.warning.assert_called_once()
+        cache.invalidate_lists.assert_awaited_once_with([1])
+
+    @patch("app.commands.repair_counters.task_repo")
+    async def test_dry_run_keeps_the_cache(self, mock_repo):
+        mock_repo.recompute_list_counters = AsyncMock(return_value=DRIFTED)
+        cache = AsyncMock()
+
+        await repair_counters(fix=False, cache=cache)
+
+        cache.invalidate_lists.assert_not_called()
+
+    @patch("app.commands.repair_counters.build_task_cache")
+    @patch(
+        "app.commands.repair_counters.Tortoise.close_connections",
+        new_callable=AsyncMock,
+    )
+    @patch("app.commands.repair_counters.init_db", new_callable=AsyncMock)
+    @patch("app.commands.repair_counters.task_repo")
+    async def test_main_dry_run_exit_code(
+        self, mock_repo, mock_init_db, mock_close, mock_build_cache
+    ):
+        mock_build_cache.return_value = AsyncMock()
+        mock_repo.recompute_list_counters = AsyncMock(return_value=DRIFTED)
+
+        assert await main(fix=False) == 1
+        assert await main(fix=True) == 0
+        mock_build_cache.return_value.close.assert_awaited()
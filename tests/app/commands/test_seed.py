@@ -0,0 +1,34 @@
+import pytest
+from app.commands.seed import SeedConfig, seed
+from app.infrastructure.database.models.task import Task, TaskList
+from app.infrastructure.database.models.user import User
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestSeed:
+
+    async def test_seed_inserts_the_configured_volumes(self, db):
+        config = SeedConfig(users=3, lists=4, tasks_per_list=5, assignment_ratio=1)
+
+        data = await seed(config)
+
+        assert len(data.emails) == await User.all().count() == 3
+        assert len(data.list_ids) == await TaskList.all().count() == 4
+        assert len(data.task_ids) == await Task.all().count() == 20
+        assert await Task.filter(assigned_to_id=None).count() == 0
+
+    async def test_seed_keeps_the_list_counters_consistent(self, db):
+        await seed(SeedConfig(users=1, lists=3, tasks_per_list=10))
+
+        for task_list in await TaskList.all():
+            tasks = Task.filter(task_list_id=task_list.id)
+            assert task_list.total_tasks == await tasks.count()
+            assert (
+                task_list.completed_tasks == await tasks.filter(completed=True).count()
+            )
+
+    async def test_seed_without_assignments(self, db):
+        await seed(SeedConfig(users=2, lists=1, tasks_per_list=10, assignment_ratio=0))
+
+        assert await Task.exclude(assigned_to_id=None).count() == 0
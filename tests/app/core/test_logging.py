@@ -0,0 +1,118 @@
+import logging
+import queue
+import sys
+import threading
+import orjson
+from unittest.mock import patch
+from app.core.logging import (
+    JSONFormat,
+    MyFormat,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    get_logging,
+)
+from logging.handlers import QueueListener
+
+
+def make_record(name="app.test", level=logging.INFO, msg="hello %s", **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, ("world",), None)
+    record.__dict__.update(extra)
+    return record
+
+
+class CapturingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.add(threading.current_thread().name)
+
+
+class TestFormats:
+
+    def test_json_lines_carry_the_extra_fields(self):
+        line = JSONFormat().format(make_record(db_queries=3))
+
+        entry = orjson.loads(line)
+        assert entry["message"] == "hello world"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "app.test"
+        assert entry["db_queries"] == 3
+
+    def test_json_lines_include_the_traceback(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord(
+                "app.test", logging.ERROR, __file__, 1, "failed", None, True
+            )
+            record.exc_info = sys.exc_info()
+
+        entry = orjson.loads(JSONFormat().format(record))
+
+        assert "ValueError: boom" in entry["exception"]
+
+    def test_colored_format_reuses_its_formatters(self):
+        formatter = MyFormat()
+
+        with patch("app.core.logging.logging.Formatter") as mock_formatter:
+            text = formatter.format(make_record())
+
+        assert "hello world" in text
+        mock_formatter.assert_not_called()
+
+
+class TestPipeline:
+
+    def test_configured_once(self):
+        get_logging("app.one")
+        get_logging("app.two")
+
+        handlers = [
+            handler
+            for handler in logging.getLogger().handlers
+            if isinstance(handler, NonBlockingQueueHandler)
+        ]
+        assert len(handlers) == 1
+
+    def test_records_are_written_by_a_background_thread(self):
+        handler = NonBlockingQueueHandler(queue.Queue(10))
+        output = CapturingHandler()
+        listener = QueueListener(handler.queue, output)
+        listener.start()
+
+        handler.handle(make_record(db_queries=2))
+        listener.stop()
+
+        [record] = output.records
+        assert record.getMessage() == "hello world"
+        assert record.db_queries == 2
+        assert threading.current_thread().name not in output.threads
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = NonBlockingQueueHandler(queue.Queue(1))
+
+        handler.handle(make_record())
+        handler.handle(make_record())
+
+        assert handler.queue.qsize() == 1
+        assert handler.dropped == 1
+
+
+class TestSamplingFilter:
+
+    def test_rates_apply_to_child_loggers(self):
+        sampling = SamplingFilter({"app.api": 0.0, "app.api.health": 1.0})
+
+        assert sampling.rate("app.api.middleware") == 0.0
+        assert sampling.rate("app.api.health.deep") == 1.0
+        assert sampling.rate("app.services") == 1.0
+
+    def test_warnings_are_never_sampled(self):
+        sampling = SamplingFilter({"app.api": 0.0})
+
+        assert not sampling.filter(make_record("app.api.middleware"))
+        assert sampling.filter(make_record("app.api.middleware", logging.WARNING))
@@ -0,0 +1,56 @@
+from fastapi import FastAPI
+from app.core.metrics import MetricsRegistry
+
+
+def make_registry() -> MetricsRegistry:
+    app = FastAPI()
+
+    @app.get("/lists/{list_id}")
+    async def get_list(list_id: int):
+        return {}
+
+    registry = MetricsRegistry()
+    registry.register_routes(app.routes)
+    return registry
+
+
+class TestMetricsRegistry:
+
+    def test_requests_are_recorded_under_their_template(self):
+        registry = make_registry()
+
+        registry.observe_request("GET", "/lists/{list_id}", 200, 0.02, 3, 0.004)
+        registry.observe_request("GET", "/lists/{list_id}", 404, 0.001)
+        text = registry.render()
+
+        labels = 'method="GET",route="/lists/{list_id}"'
+        assert f'http_requests_total{{{labels},status="200"}} 1' in text
+        assert f'http_requests_total{{{labels},status="404"}} 1' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="0.025"}} 2' in (
+            text
+        )
+        assert f"http_request_duration_seconds_count{{{labels}}} 2" in text
+        assert f"db_queries_total{{{labels}}} 3" in text
+        assert f"db_query_seconds_total{{{labels}}} 0.004000" in text
+
+    def test_unknown_routes_share_one_label_set(self):
+        registry = make_registry()
+        series = len(registry.routes)
+
+        registry.observe_request("GET", None, 404, 0.001)
+        registry.observe_request("PURGE", "/lists/{list_id}", 405, 0.001)
+
+        assert len(registry.routes) == series
+        assert registry.unmatched.statuses == {404: 1, 405: 1}
+
+    def test_render_includes_gauges_and_password_hashing(self):
+        registry = make_registry()
+        registry.in_flight = 2
+        registry.password_hash_seconds.observe(0.25)
+
+        text = registry.render()
+
+        assert "http_requests_in_flight 2" in text
+        assert 'password_hash_seconds_bucket{le="0.3"} 1' in text
+        assert "password_hash_seconds_count 1" in text
+        assert text.endswith("\n")
@@ -1,6 +1,12 @@
+import asyncio
+import threading
+import pytest
 from app.core.security import (
+    PasswordHashPool,
     hash_password,
+    hash_password_async,
     verify_password,
+    verify_password_async,
     create_access_token,
 )
 from jose import jwt
@@ -39,3 +45,38 @@ class TestSecurityUtils:
 
         assert decoded["sub"] == "user@example.com"
         assert isinstance(decoded["exp"], int)
+
+
+@pytest.mark.asyncio
+class TestPasswordHashPool:
+
+    async def test_async_hash_and_verify_password(self):
+        hashed = await hash_password_async("securepassword")
+
+        assert await verify_password_async("securepassword", hashed) is True
+        assert await verify_password_async("wrongpassword", hashed) is False
+
+    async def test_admission_limit_queues_extra_calls(self):
+        pool = PasswordHashPool(workers=1, max_pending=2)
+        release = threading.Event()
+        observed = []
+
+        def blocking(value):
+            release.wait(5)
+            return value
+
+        calls = [asyncio.create_task(pool.run(blocking, n)) for n in range(5)]
+        await asyncio.sleep(0.05)
+        observed.append(pool.stats())
+        release.set()
+        results = await asyncio.gather(*calls)
+
+        assert results == [0, 1, 2, 3, 4]
+        assert observed[0]["in_flight"] == 2
+        assert observed[0]["waiting"] == 3
+        assert pool.stats()["in_flight"] == 0
+
+    async def test_max_pending_is_at_least_workers(self):
+        pool = PasswordHashPool(workers=3, max_pending=1)
+
+        assert pool.max_pending == 3
@@ -0,0 +1,146 @@
+import orjson
+import pytest
+from app.core.tracing import (
+    FileSpanExporter,
+    OTLPSpanExporter,
+    activate,
+    otlp_payload,
+    sample_trace,
+    server_timing,
+    start_span,
+    trace_methods,
+    traced,
+)
+
+pytestmark = pytest.mark.asyncio
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@trace_methods("service")
+class Service:
+    async def read(self):
+        return await fetch()
+
+    async def _private(self):
+        return None
+
+
+@traced("Repository.fetch", "repo")
+async def fetch():
+    with start_span("db.execute_query", "db"):
+        return "row"
+
+
+async def traced_call():
+    root = sample_trace(f"00-{TRACE_ID}-{PARENT_ID}-01", rate=0)
+    with activate(root):
+        assert await Service().read() == "row"
+    return root
+
+
+class TestSampling:
+
+    async def test_sampled_parent_continues_the_trace(self):
+        root = sample_trace(f"00-{TRACE_ID}-{PARENT_ID}-01", rate=0)
+
+        assert root.trace.trace_id == TRACE_ID
+        assert root.parent_id == PARENT_ID
+        assert root.traceparent.startswith(f"00-{TRACE_ID}-")
+
+    async def test_unsampled_parent_is_respected(self):
+        assert sample_trace(f"00-{TRACE_ID}-{PARENT_ID}-00", rate=1) is None
+
+    async def test_rate_applies_without_a_valid_parent(self):
+        assert sample_trace("garbage", rate=1) is not None
+        assert sample_trace(None, rate=0) is None
+
+
+class TestSpans:
+
+    async def test_nested_spans_across_layers(self):
+        root = await traced_call()
+
+        spans = {span.name: span for span in root.trace.spans}
+        assert set(spans) == {
+            "",
+            "Service.read",
+            "Repository.fetch",
+            "db.execute_query",
+        }
+        assert spans["Service.read"].parent_id == root.span_id
+        assert spans["Repository.fetch"].parent_id == spans["Service.read"].span_id
+        assert spans["db.execute_query"].kind == "db"
+
+    async def test_untraced_calls_record_nothing(self):
+        assert await Service().read() == "row"
+        assert Service._private.__name__ == "_private"
+
+    async def test_server_timing_lists_each_layer(self):
+        root = await traced_call()
+
+        header = server_timing(root, root.end_ns)
+
+        names = [part.split(";")[0] for part in header.split(", ")]
+        assert names == ["service", "repo", "db", "app", "total"]
+
+    async def test_server_timing_skips_outer_layers_nested_in_inner_ones(self):
+        root = sample_trace(None, rate=1)
+        with activate(root):
+            with start_span("AuthService.login_user", "service") as service:
+                with start_span("auth.verify_password", "auth"):
+                    pass
+        root.start_ns, service.start_ns, service.end_ns = 0, 1_000_000, 5_000_000
+
+        header = server_timing(root, 10_000_000)
+
+        assert header == "service;dur=4.00, app;dur=6.00, total;dur=10.00"
+
+
+class TestExporters:
+
+    async def test_otlp_payload(self):
+        root = await traced_call()
+        root.name = "GET /items"
+        root.attributes["http.status_code"] = 200
+
+        [resource] = otlp_payload([root.trace])["resourceSpans"]
+        spans = resource["scopeSpans"][0]["spans"]
+
+        server = next(span for span in spans if span["name"] == "GET /items")
+        assert server["kind"] == 2
+        assert server["parentSpanId"] == PARENT_ID
+        assert {"key": "http.status_code", "value": {"intValue": "200"}} in (
+            server["attributes"]
+        )
+        assert all(span["traceId"] == TRACE_ID for span in spans)
+
+    async def test_file_exporter_writes_json_lines(self, tmp_path):
+        exporter = FileSpanExporter(str(tmp_path / "traces.jsonl"))
+
+        exporter.export((await traced_call()).trace)
+        exporter.export((await traced_call()).trace)
+        exporter.shutdown()
+
+        lines = (tmp_path / "traces.jsonl").read_bytes().splitlines()
+        exported = [orjson.loads(line)["resourceSpans"][0] for line in lines]
+        assert sum(len(r["scopeSpans"][0]["spans"]) for r in exported) == 8
+        assert exporter.stats()["exported"] == 2
+
+    async def test_otlp_exporter_posts_to_the_collector(self, otlp_collector):
+        exporter = OTLPSpanExporter(otlp_collector.endpoint)
+
+        exporter.export((await traced_call()).trace)
+        exporter.shutdown()
+
+        assert otlp_collector.requests[0][0] == "/v1/traces"
+        assert len(otlp_collector.spans) == 4
+
+    async def test_unreachable_collector_is_counted(self):
+        exporter = OTLPSpanExporter("http://127.0.0.1:9", timeout=0.5)
+
+        exporter.export((await traced_call()).trace)
+        exporter.shutdown()
+
+        assert exporter.stats()["errors"] == 1
@@ -0,0 +1,37 @@
+import pytest
+from app.infrastructure.cache.redis import RedisCacheBackend, encode_command
+
+
+class TestRedisCacheBackend:
+
+    def test_encode_command(self):
+        assert encode_command("SET", "k", b"v", "PX", 1500) == (
+            b"*5\r\n$3\r\nSET\r\n$1\r\nk\r\n$1\r\nv\r\n$2\r\nPX\r\n$4\r\n1500\r\n"
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_set_and_counters(self, redis_server):
+        backend = RedisCacheBackend(redis_server.url, timeout=1)
+
+        await backend.set("a", b'{"x":1}', ttl=30)
+        await backend.incr(["gen:1", "gen:1", "gen:2"])
+
+        assert await backend.get("a") == b'{"x":1}'
+        assert await backend.get("b") is None
+        assert await backend.get_counters(["gen:1", "gen:2", "gen:3"]) == [2, 1, 0]
+        # The three increments share a single pipeline.
+        assert redis_server.commands.count("INCR") == 3
+        stats = await backend.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+        assert stats["bytes"] > 0
+        await backend.close()
+
+    @pytest.mark.asyncio
+    async def test_unavailable_server_behaves_as_a_miss(self, redis_server):
+        backend = RedisCacheBackend(redis_server.url, timeout=1)
+        await backend.set("a", b"1", ttl=30)
+        await redis_server.stop()
+
+        assert await backend.get("a") is None
+        assert await backend.get_counters(["gen:1"]) is None
+        assert (await backend.stats())["errors"] == 3
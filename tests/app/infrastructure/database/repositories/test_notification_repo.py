@@ -0,0 +1,98 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+from tortoise import timezone
+from app.infrastructure.database.models.notification import NotificationOutbox
+from app.infrastructure.database.repositories import notification_repo
+from app.infrastructure.database.repositories.notification_repo import (
+    DISCARDED,
+    FAILED,
+    PENDING,
+    SENT,
+    NotificationRepository,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestNotificationRepository:
+
+    async def test_claim_due_leases_rows(self, db):
+        repo = NotificationRepository()
+        await repo.enqueue_task_assignments(
+            [("ana@example.com", 1), ("ana@example.com", 2), ("bob@example.com", 3)]
+        )
+
+        claimed = await repo.claim_due(2, timedelta(seconds=60))
+        again = await repo.claim_due(10, timedelta(seconds=60))
+
+        assert [row.task_id for row in claimed] == [1, 2]
+        assert [row.attempts for row in claimed] == [1, 1]
+        assert [row.task_id for row in again] == [3]
+        assert await repo.claim_due(10, timedelta(seconds=60)) == []
+
+    async def test_expired_lease_is_claimed_again(self, db):
+        repo = NotificationRepository()
+        await repo.enqueue_task_assignments([("ana@example.com", 1)])
+
+        await repo.claim_due(10, timedelta(seconds=-1))
+        claimed = await repo.claim_due(10, timedelta(seconds=60))
+
+        assert [row.attempts for row in claimed] == [2]
+
+    async def test_claim_skips_rows_claimed_by_another_dispatcher(self, db):
+        repo = NotificationRepository()
+        await repo.enqueue_task_assignments(
+            [("ana@example.com", 1), ("bob@example.com", 2)]
+        )
+        first = await NotificationOutbox.all().order_by("id").first()
+        execute_returning = notification_repo.execute_returning
+
+        async def claimed_concurrently(query, columns):
+            # Another dispatcher leases the first row after our SELECT.
+            await NotificationOutbox.filter(id=first.id).update(
+                next_attempt_at=timezone.now() + timedelta(minutes=1)
+            )
+            return await execute_returning(query, columns)
+
+        with patch.object(notification_repo, "execute_returning", claimed_concurrently):
+            claimed = await repo.claim_due(10, timedelta(seconds=60))
+
+        assert [row.task_id for row in claimed] == [2]
+        await first.refresh_from_db()
+        assert first.attempts == 0
+
+    async def test_mark_sent_and_failed(self, db):
+        repo = NotificationRepository()
+        await repo.enqueue_task_assignments(
+            [("ana@example.com", 1), ("bob@example.com", 2), ("eve@example.com", 3)]
+        )
+        first, second, third = await NotificationOutbox.all().order_by("id")
+
+        await repo.mark_sent([first.id])
+        await repo.mark_failed([second.id], "boom", None)
+        retry_at = timezone.now() + timedelta(minutes=5)
+        await repo.mark_failed([third.id], "later", retry_at)
+
+        statuses = dict(await NotificationOutbox.all().values_list("id", "status"))
+        assert statuses == {first.id: SENT, second.id: FAILED, third.id: PENDING}
+        await repo.mark_discarded([third.id], "gone")
+        assert (await NotificationOutbox.get(id=third.id)).status == DISCARDED
+        await repo.mark_failed([third.id], "later", retry_at)
+        await third.refresh_from_db()
+        assert third.last_error == "later"
+        assert await repo.claim_due(10, timedelta(seconds=60)) == []
+
+    async def test_pending_stats(self, db):
+        repo = NotificationRepository()
+        assert await repo.pending_stats() == {"depth": 0, "oldest_created_at": None}
+
+        await repo.enqueue_task_assignments(
+            [("ana@example.com", 1), ("bob@example.com", 2)]
+        )
+        first = await NotificationOutbox.all().order_by("id").first()
+        await repo.mark_sent([first.id])
+
+        stats = await repo.pending_stats()
+        assert stats["depth"] == 1
+        assert stats["oldest_created_at"] is not None
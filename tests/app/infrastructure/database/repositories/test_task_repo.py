@@ -1,5 +1,8 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
+from app.infrastructure.database.models.task import Task, TaskList
+from app.infrastructure.database.models.notification import NotificationOutbox
+from app.infrastructure.database.models.user import User
 from app.infrastructure.database.repositories.task_repo import TaskRepository
 
 pytestmark = pytest.mark.asyncio
@@ -18,28 +21,52 @@ class TestTaskRepository:
         mock_tasklist_class.create.assert_awaited_once_with(name="Test List")
         assert result == mock_instance
 
+    @patch("app.infrastructure.database.repositories.task_repo.in_transaction")
+    @patch("app.infrastructure.database.repositories.task_repo.TaskList", autospec=True)
     @patch("app.infrastructure.database.repositories.task_repo.Task", autospec=True)
-    async def test_create_task_success(self, mock_task_class):
+    async def test_create_task_success(
+        self, mock_task_class, mock_tasklist_class, mock_transaction
+    ):
         repo = TaskRepository()
-        mock_instance = MagicMock()
+        mock_instance = MagicMock(completed=False)
         mock_task_class.create = AsyncMock(return_value=mock_instance)
+        mock_tasklist_class.filter.return_value.update = AsyncMock(return_value=1)
 
         data = {"title": "Task", "description": "Test", "priority": 3}
         result = await repo.create_task(1, data)
 
         mock_task_class.create.assert_awaited_once_with(task_list_id=1, **data)
+        mock_tasklist_class.filter.assert_called_once_with(id=1)
+        mock_tasklist_class.filter.return_value.update.assert_awaited_once()
+        mock_transaction.assert_called_once()
         assert result == mock_instance
 
     @patch("app.infrastructure.database.repositories.task_repo.Task", autospec=True)
     async def test_list_tasks_success(self, mock_task_class):
         repo = TaskRepository()
-        mock_task_class.filter = AsyncMock(return_value=["task1", "task2"])
+        query = mock_task_class.filter.return_value.order_by.return_value
+        query.limit = AsyncMock(return_value=["task1", "task2"])
 
-        result = await repo.list_tasks(1, completed=True, priority=3)
+        result = await repo.list_tasks(1, completed=True, priority=3, limit=2)
 
-        mock_task_class.filter.assert_awaited_once()
+        mock_task_class.filter.assert_called_once()
+        mock_task_class.filter.return_value.order_by.assert_called_once_with(
+            "created_at", "id"
+        )
+        query.limit.assert_awaited_once_with(2)
         assert result == ["task1", "task2"]
 
+    @patch("app.infrastructure.database.repositories.task_repo.Task", autospec=True)
+    async def test_list_tasks_projection(self, mock_task_class):
+        repo = TaskRepository()
+        query = mock_task_class.filter.return_value.order_by.return_value
+        query.values = AsyncMock(return_value=[{"id": 1}])
+
+        result = await repo.list_tasks(1, fields=("id",))
+
+        query.values.assert_awaited_once_with("id")
+        assert result == [{"id": 1}]
+
     @patch("app.infrastructure.database.repositories.task_repo.Task", autospec=True)
     async def test_get_task_success(self, mock_task_class):
         repo = TaskRepository()
@@ -50,38 +77,324 @@ class TestTaskRepository:
         mock_task_class.get_or_none.assert_awaited_once_with(id=1)
         assert result == "task"
 
+    @patch.object(TaskRepository, "_bump_versions", new_callable=AsyncMock)
+    @patch("app.infrastructure.database.repositories.task_repo.in_transaction")
+    @patch(
+        "app.infrastructure.database.repositories.task_repo.update_returning",
+        new_callable=AsyncMock,
+    )
     @patch("app.infrastructure.database.repositories.task_repo.Task", autospec=True)
-    async def test_update_task_success(self, mock_task_class):
+    async def test_update_task_success(
+        self, mock_task_class, mock_update_returning, mock_tx, mock_bump
+    ):
         repo = TaskRepository()
-        task_instance = MagicMock()
-        task_instance.save = AsyncMock()
+        mock_task_class._meta = MagicMock()
+        mock_tx.return_value.__aenter__ = AsyncMock(return_value="conn")
+        mock_tx.return_value.__aexit__ = AsyncMock(return_value=False)
+        task = MagicMock(task_list_id=7)
+        mock_update_returning.return_value = task
 
-        result = await repo.update_task(task_instance, {"title": "Updated"})
+        result = await repo.update_task(1, {"title": "Updated"})
 
-        task_instance.update_from_dict.assert_called_once_with({"title": "Updated"})
-        task_instance.save.assert_awaited_once()
-        assert result == task_instance
+        mock_update_returning.assert_awaited_once()
+        assert mock_update_returning.await_args.args[1:3] == (1, {"title": "Updated"})
+        mock_bump.assert_awaited_once_with([7])
+        assert result is task
 
+    @patch("app.infrastructure.database.repositories.task_repo.in_transaction")
+    @patch("app.infrastructure.database.repositories.task_repo.TaskList", autospec=True)
     @patch("app.infrastructure.database.repositories.task_repo.Task", autospec=True)
-    async def test_delete_task_success(self, mock_task_class):
+    async def test_delete_task_success(
+        self, mock_task_class, mock_tasklist_class, mock_transaction
+    ):
         repo = TaskRepository()
-        mock_task_class.filter.return_value.delete = AsyncMock(return_value=1)
+        query = mock_task_class.filter.return_value
+        query.select_for_update.return_value.first.return_value.values = AsyncMock(
+            return_value={"task_list_id": 7, "completed": True}
+        )
+        query.delete = AsyncMock(return_value=1)
+        mock_tasklist_class.filter.return_value.update = AsyncMock(return_value=1)
 
         result = await repo.delete_task(1)
 
-        mock_task_class.filter.assert_called_once_with(id=1)
-        mock_task_class.filter.return_value.delete.assert_awaited_once()
-        assert result == 1
+        mock_task_class.filter.assert_called_with(id=1)
+        query.delete.assert_awaited_once()
+        mock_tasklist_class.filter.assert_called_once_with(id=7)
+        assert result == 7
 
+    @patch("app.infrastructure.database.repositories.task_repo.in_transaction")
     @patch("app.infrastructure.database.repositories.task_repo.Task", autospec=True)
-    async def test_assign_user_to_task_success(self, mock_task_class):
+    async def test_delete_task_not_found(self, mock_task_class, mock_transaction):
+        repo = TaskRepository()
+        query = mock_task_class.filter.return_value
+        query.select_for_update.return_value.first.return_value.values = AsyncMock(
+            return_value=None
+        )
+        query.delete = AsyncMock()
+
+        result = await repo.delete_task(1)
+
+        query.delete.assert_not_called()
+        assert result is None
+
+    @patch("app.infrastructure.database.repositories.task_repo.in_transaction")
+    @patch("app.infrastructure.database.repositories.task_repo.notification_repo")
+    @patch("app.infrastructure.database.repositories.task_repo.Task", autospec=True)
+    async def test_assign_user_to_task_success(
+        self, mock_task_class, mock_notification_repo, mock_in_transaction
+    ):
+        repo = TaskRepository()
+        mock_task_class.filter.return_value.update = AsyncMock(return_value=1)
+        mock_user = MagicMock(id=3, email="ana@example.com")
+        mock_notification_repo.enqueue_task_assignments = AsyncMock()
+        mock_in_transaction.return_value.__aenter__ = AsyncMock()
+        mock_in_transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        result = await repo.assign_user_to_task(7, mock_user)
+
+        mock_task_class.filter.assert_called_once_with(id=7)
+        mock_task_class.filter.return_value.update.assert_awaited_once_with(
+            assigned_to_id=3
+        )
+        mock_notification_repo.enqueue_task_assignments.assert_awaited_once_with(
+            [("ana@example.com", 7)]
+        )
+        assert result == 1
+
+
+class TestTaskRepositoryCounters:
+
+    async def test_counters_follow_task_mutations(self, db):
+        repo = TaskRepository()
+        task_list = await repo.create_list("Counters")
+
+        first = await repo.create_task(task_list.id, {"title": "First"})
+        second = await repo.create_task(task_list.id, {"title": "Second"})
+        await repo.update_task(first.id, {"completed": True})
+        await repo.update_task(first.id, {"completed": True, "title": "Same state"})
+        await repo.update_task(second.id, {"completed": True})
+        await repo.update_task(second.id, {"completed": False})
+        await repo.delete_task(first.id)
+
+        await task_list.refresh_from_db()
+        assert (task_list.total_tasks, task_list.completed_tasks) == (1, 0)
+
+    async def test_list_version_follows_task_mutations(self, db):
+        repo = TaskRepository()
+        task_list = await repo.create_list("Versions")
+        other = await repo.create_list("Untouched")
+        versions = [await repo.get_list_version(task_list.id)]
+
+        task = await repo.create_task(task_list.id, {"title": "First"})
+        versions.append(await repo.get_list_version(task_list.id))
+        await repo.update_task(task.id, {"title": "Renamed"})
+        versions.append(await repo.get_list_version(task_list.id))
+        unchanged = await repo.update_task(
+            task.id, {"title": "Renamed", "description": None}
+        )
+        await repo.update_task(task.id, {"completed": True})
+        versions.append(await repo.get_list_version(task_list.id))
+        await repo.update_task(task.id, {"completed": True})
+        await repo.bulk_update_tasks(
+            repo.task_selector(list_id=task_list.id), {"priority": 3}
+        )
+        versions.append(await repo.get_list_version(task_list.id))
+        await repo.delete_task(task.id)
+        versions.append(await repo.get_list_version(task_list.id))
+
+        assert versions == [1, 2, 3, 4, 5, 6]
+        assert unchanged.title == "Renamed"
+        assert await repo.get_list_version(other.id) == 1
+        assert await repo.get_list_version(999) is None
+        assert await repo.get_list_versions(10) == [
+            (task_list.id, 6),
+            (other.id, 1),
+        ]
+
+    async def test_iter_tasks_in_chunks(self, db, count_queries):
+        repo = TaskRepository()
+        task_list = await repo.create_list("Export")
+        ids = await repo.bulk_create_tasks(
+            task_list.id,
+            [{"title": f"Task {n}", "priority": n % 2 + 1} for n in range(10)],
+        )
+
+        with count_queries() as counter:
+            chunks = [
+                chunk
+                async for chunk in repo.iter_tasks(
+                    task_list.id, priority=1, chunk_size=2, fields=("id", "created_at")
+                )
+            ]
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert [row["id"] for chunk in chunks for row in chunk] == ids[::2]
+        assert counter.count == 3
+
+    async def test_import_tasks_updates_counters(self, db):
+        repo = TaskRepository()
+        task_list = await repo.create_list("Import")
+
+        imported = await repo.import_tasks(
+            task_list.id, [{"title": "A"}, {"title": "B", "priority": 4}]
+        )
+
+        await task_list.refresh_from_db()
+        assert imported == 2
+        assert task_list.total_tasks == 2
+        assert await Task.filter(task_list=task_list, priority=4).count() == 1
+
+    async def test_update_task_statements(self, db, count_queries):
+        repo = TaskRepository()
+        task_list = await repo.create_list("Updates")
+        task = await repo.create_task(task_list.id, {"title": "Draft"})
+
+        with count_queries() as plain:
+            updated = await repo.update_task(task.id, {"title": "Final", "priority": 3})
+        with count_queries() as flip:
+            completed = await repo.update_task(task.id, {"completed": True})
+        with count_queries() as missing:
+            assert await repo.update_task(999, {"title": "Nope"}) is None
+
+        # The task UPDATE ... RETURNING plus the list version bump.
+        assert plain.queries[0].startswith("UPDATE") and plain.count == 2
+        assert (updated.title, updated.priority, updated.completed) == (
+            "Final",
+            3,
+            False,
+        )
+        assert updated.created_at == task.created_at
+        assert completed.completed is True
+        # The guarded task UPDATE plus the counter shift.
+        assert flip.count == 2
+        # The guarded UPDATE matches nothing and the task is looked up.
+        assert missing.count == 2
+
+    async def test_assign_user_to_task_targets_the_foreign_key(self, db, count_queries):
+        repo = TaskRepository()
+        task_list = await repo.create_list("Assign one")
+        task = await repo.create_task(task_list.id, {"title": "Report"})
+        ana = await User.create(email="ana@example.com", hashed_password="x")
+
+        with count_queries() as counter:
+            assigned = await repo.assign_user_to_task(task.id, ana)
+        missing = await repo.assign_user_to_task(999, ana)
+
+        assert (assigned, missing) == (1, 0)
+        assert counter.count == 2
+        assert counter.queries[0].startswith("UPDATE")
+        assert (await Task.get(id=task.id)).assigned_to_id == ana.id
+        assert await NotificationOutbox.filter(task_id=task.id).count() == 1
+
+    async def test_recompute_list_counters_repairs_drift(self, db):
+        repo = TaskRepository()
+        healthy = await repo.create_list("Healthy")
+        drifted = await repo.create_list("Drifted")
+        await repo.create_task(healthy.id, {"title": "Task"})
+        await Task.create(task_list_id=drifted.id, title="Raw", completed=True)
+
+        report = await repo.recompute_list_counters()
+
+        assert [row["id"] for row in report] == [drifted.id]
+        assert report[0]["actual_completed"] == 1
+        await drifted.refresh_from_db()
+        assert (drifted.total_tasks, drifted.completed_tasks) == (1, 1)
+        assert await repo.recompute_list_counters() == []
+
+    async def test_recompute_list_counters_dry_run(self, db):
+        repo = TaskRepository()
+        task_list = await TaskList.create(name="Drifted", total_tasks=5)
+
+        report = await repo.recompute_list_counters(fix=False)
+
+        assert report[0]["total_tasks"] == 5
+        await task_list.refresh_from_db()
+        assert task_list.total_tasks == 5
+
+    @patch("app.infrastructure.database.repositories.task_repo.settings")
+    async def test_bulk_create_tasks_in_batches(self, mock_settings, db):
+        mock_settings.BULK_INSERT_BATCH_SIZE = 2
+        repo = TaskRepository()
+        task_list = await repo.create_list("Bulk")
+        items = [{"title": f"Task {n}", "priority": n + 1} for n in range(5)]
+
+        ids = await repo.bulk_create_tasks(task_list.id, items)
+
+        stored = await Task.filter(id__in=ids).order_by("id").values_list("id", "title")
+        assert stored == [(task_id, f"Task {n}") for n, task_id in enumerate(ids)]
+        await task_list.refresh_from_db()
+        assert task_list.total_tasks == 5
+        assert await repo.list_exists(task_list.id) is True
+        assert await repo.list_exists(task_list.id + 1) is False
+
+    async def test_bulk_update_and_delete_keep_counters(self, db):
+        repo = TaskRepository()
+        first = await repo.create_list("First")
+        second = await repo.create_list("Second")
+        await repo.bulk_create_tasks(
+            first.id, [{"title": f"Task {n}", "priority": n % 2 + 1} for n in range(6)]
+        )
+        await repo.bulk_create_tasks(second.id, [{"title": "Other", "priority": 2}])
+
+        updated = await repo.bulk_update_tasks(
+            repo.task_selector(priority=2), {"completed": True}
+        )
+        again = await repo.bulk_update_tasks(
+            repo.task_selector(priority=2), {"completed": True, "title": "Done"}
+        )
+        deleted = await repo.bulk_delete_tasks(
+            repo.task_selector(list_id=first.id, completed=True)
+        )
+
+        assert (updated, again, deleted) == (4, 4, 3)
+        assert await repo.recompute_list_counters(fix=False) == []
+        await first.refresh_from_db()
+        await second.refresh_from_db()
+        assert (first.total_tasks, first.completed_tasks) == (3, 0)
+        assert (second.total_tasks, second.completed_tasks) == (1, 1)
+        assert await Task.filter(title="Done").count() == 1
+
+    async def test_bulk_writes_count_only_the_rows_they_changed(self, db):
+        repo = TaskRepository()
+        task_list = await repo.create_list("Race")
+        ids = await repo.bulk_create_tasks(
+            task_list.id, [{"title": f"Task {n}"} for n in range(4)]
+        )
+        # Another writer completes a task between the selection and the
+        # UPDATE: the counters follow what the UPDATE actually changed.
+        await Task.filter(id=ids[0]).update(completed=True)
+        await TaskList.filter(id=task_list.id).update(completed_tasks=1)
+
+        updated = await repo.bulk_update_tasks(
+            repo.task_selector(ids=ids), {"completed": True}
+        )
+        deleted = await repo.bulk_delete_tasks(repo.task_selector(ids=ids[:2]))
+
+        assert (updated, deleted) == (4, 2)
+        await task_list.refresh_from_db()
+        assert (task_list.total_tasks, task_list.completed_tasks) == (2, 2)
+        assert await repo.recompute_list_counters(fix=False) == []
+
+    async def test_assign_tasks_one_update_per_user(self, db, count_queries):
         repo = TaskRepository()
-        task_instance = MagicMock()
-        task_instance.save = AsyncMock()
-        mock_user = MagicMock()
+        task_list = await repo.create_list("Assign")
+        ids = await repo.bulk_create_tasks(
+            task_list.id, [{"title": f"Task {n}"} for n in range(4)]
+        )
+        ana = await User.create(email="ana@example.com", hashed_password="x")
+        bob = await User.create(email="bob@example.com", hashed_password="x")
 
-        result = await repo.assign_user_to_task(task_instance, mock_user)
+        titles = await repo.get_task_titles(ids[:2] + [999])
+        existing = await repo.get_existing_task_ids(ids[:2] + [999])
+        with count_queries() as counter:
+            assigned = await repo.assign_tasks(
+                {ids[0]: ana, ids[1]: ana, ids[2]: ana, ids[3]: bob}
+            )
 
-        assert task_instance.assigned_to == mock_user
-        task_instance.save.assert_awaited_once()
-        assert result == task_instance
+        assert titles == {ids[0]: "Task 0", ids[1]: "Task 1"}
+        assert existing == {ids[0], ids[1]}
+        assert assigned == 4
+        assert len([q for q in counter.queries if q.startswith("UPDATE")]) == 2
+        assert await Task.filter(assigned_to_id=ana.id).count() == 3
+        assert await NotificationOutbox.filter(recipient="ana@example.com").count() == 3
+        assert await repo.assign_tasks({}) == 0
@@ -1,4 +1,5 @@
 import pytest
+from tortoise.exceptions import IntegrityError
 from unittest.mock import AsyncMock, patch
 from app.infrastructure.database.repositories.user_repo import UserRepository
 
@@ -33,6 +34,26 @@ class TestUserRepository:
 
         assert result is None
 
+    async def test_get_assignee_selects_id_and_email(self, db, count_queries):
+        repo = UserRepository()
+        await repo.create("test@example.com", "hashedpassword123")
+
+        with count_queries() as counter:
+            user = await repo.get_assignee("test@example.com")
+
+        assert (user.id, user.email) == (1, "test@example.com")
+        (query,) = counter.queries
+        assert query.startswith('SELECT "id" "id","email" "email" FROM "users"')
+        assert await repo.get_assignee("notfound@example.com") is None
+
+    @patch("app.infrastructure.database.repositories.user_repo.User", autospec=True)
+    async def test_email_exists(self, mock_user_class):
+        repo = UserRepository()
+        mock_user_class.exists = AsyncMock(return_value=True)
+
+        assert await repo.email_exists("test@example.com") is True
+        mock_user_class.exists.assert_awaited_once_with(email="test@example.com")
+
     @patch("app.infrastructure.database.repositories.user_repo.User", autospec=True)
     async def test_create_user_success(self, mock_user_class):
         repo = UserRepository()
@@ -46,3 +67,55 @@ class TestUserRepository:
             email="new@example.com", hashed_password="hashedpassword123"
         )
         assert result == mock_user_instance
+
+    @patch("app.infrastructure.database.repositories.user_repo.User", autospec=True)
+    async def test_create_user_duplicate_email(self, mock_user_class):
+        repo = UserRepository()
+        mock_user_class.create = AsyncMock(side_effect=IntegrityError("UNIQUE"))
+
+        result = await repo.create("taken@example.com", "hashedpassword123")
+
+        assert result is None
+
+    @patch("app.infrastructure.database.repositories.user_repo.invalidate_cached_user")
+    @patch("app.infrastructure.database.repositories.user_repo.User", autospec=True)
+    async def test_update_invalidates_cached_user(
+        self, mock_user_class, mock_invalidate
+    ):
+        repo = UserRepository()
+        mock_user_class.filter.return_value.update = AsyncMock(return_value=1)
+
+        result = await repo.update("test@example.com", {"full_name": "New"})
+
+        mock_user_class.filter.assert_called_once_with(email="test@example.com")
+        mock_user_class.filter.return_value.update.assert_awaited_once_with(
+            full_name="New"
+        )
+        mock_invalidate.assert_called_once_with("test@example.com")
+        assert result == 1
+
+    @patch("app.infrastructure.database.repositories.user_repo.invalidate_cached_user")
+    @patch("app.infrastructure.database.repositories.user_repo.User", autospec=True)
+    async def test_deactivate(self, mock_user_class, mock_invalidate):
+        repo = UserRepository()
+        mock_user_class.filter.return_value.update = AsyncMock(return_value=1)
+
+        await repo.deactivate("test@example.com")
+
+        mock_user_class.filter.return_value.update.assert_awaited_once_with(
+            is_active=False
+        )
+        mock_invalidate.assert_called_once_with("test@example.com")
+
+    @patch("app.infrastructure.database.repositories.user_repo.User", autospec=True)
+    async def test_get_by_emails(self, mock_user_class):
+        repo = UserRepository()
+        mock_user_class.filter.return_value.only = AsyncMock(return_value=["user"])
+
+        result = await repo.get_by_emails(["a@example.com", "b@example.com"])
+
+        mock_user_class.filter.assert_called_once_with(
+            email__in=["a@example.com", "b@example.com"]
+        )
+        mock_user_class.filter.return_value.only.assert_awaited_once_with("id", "email")
+        assert result == ["user"]
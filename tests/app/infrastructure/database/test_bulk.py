@@ -0,0 +1,92 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from tortoise import Tortoise
+from app.infrastructure.database.bulk import (
+    chunked,
+    copy_rows,
+    execute_returning,
+    insert_returning_ids,
+)
+from app.infrastructure.database.models.task import Task, TaskList
+
+
+def test_chunked():
+    assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+
+
+@pytest.mark.asyncio
+async def test_insert_returning_ids(db):
+    task_list = await TaskList.create(name="Bulk")
+    tasks = [Task(title=f"Task {n}", task_list=task_list) for n in range(3)]
+
+    ids = await insert_returning_ids(Task, tasks, Tortoise.get_connection("default"))
+
+    assert ids == [task.id for task in tasks]
+    assert await Task.filter(id__in=ids).count() == 3
+    assert await insert_returning_ids(Task, [], None) == []
+
+
+@pytest.mark.asyncio
+async def test_copy_rows_inserts_in_batches_on_sqlite(db, count_queries):
+    task_list = await TaskList.create(name="Copy")
+    tasks = [Task(title=f"Task {n}", task_list=task_list) for n in range(5)]
+
+    with count_queries() as counter:
+        written = await copy_rows(
+            Task, tasks, Tortoise.get_connection("default"), insert_batch_size=2
+        )
+
+    assert written == 5
+    assert counter.count == 3
+    assert await Task.filter(task_list=task_list).count() == 5
+
+
+@pytest.mark.asyncio
+async def test_copy_rows_uses_copy_on_postgres(db):
+    task_list = await TaskList.create(name="Copy")
+    tasks = [Task(title=f"Task {n}", task_list=task_list) for n in range(3)]
+    sqlite = Tortoise.get_connection("default")
+    raw_connection = MagicMock()
+    raw_connection.copy_records_to_table = AsyncMock()
+    connection = MagicMock()
+    connection.capabilities.dialect = "postgres"
+    connection.executor_class = sqlite.executor_class
+    connection.acquire_connection.return_value.__aenter__ = AsyncMock(
+        return_value=raw_connection
+    )
+    connection.acquire_connection.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    written = await copy_rows(Task, tasks, connection)
+
+    assert written == 3
+    raw_connection.copy_records_to_table.assert_awaited_once()
+    call = raw_connection.copy_records_to_table.await_args
+    assert call.args == ("task",)
+    assert "title" in call.kwargs["columns"]
+    title = call.kwargs["columns"].index("title")
+    assert [record[title] for record in call.kwargs["records"]] == [
+        "Task 0",
+        "Task 1",
+        "Task 2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_execute_returning_reports_the_changed_rows(db, count_queries):
+    task_list = await TaskList.create(name="Returning")
+    await Task.create(title="Open", task_list=task_list)
+    done = await Task.create(title="Done", task_list=task_list, completed=True)
+
+    with count_queries() as counter:
+        updated = await execute_returning(
+            Task.filter(completed=False).update(priority=3), ("task_list_id",)
+        )
+        deleted = await execute_returning(
+            Task.filter(id=done.id).delete(), ("id", "completed")
+        )
+
+    assert counter.count == 2
+    assert updated == [{"task_list_id": task_list.id}]
+    assert [(row["id"], bool(row["completed"])) for row in deleted] == [(done.id, True)]
+    assert await Task.filter(priority=3).count() == 1
+    assert await Task.all().count() == 1
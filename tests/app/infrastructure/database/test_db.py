@@ -1,28 +1,81 @@
 import pytest
 from unittest.mock import AsyncMock, patch
 from fastapi import FastAPI
-from app.infrastructure.database.db import init_db
-from app.core.config import settings
+from app.infrastructure.database.db import MODELS, database_config, init_db
 
 
 @pytest.mark.asyncio
-@patch(
-    "app.infrastructure.database.db.Tortoise.generate_schemas",
-    new_callable=AsyncMock,
-)
+@patch("app.infrastructure.database.db.migrate", new_callable=AsyncMock)
 @patch("app.infrastructure.database.db.Tortoise.init", new_callable=AsyncMock)
-async def test_init_db_calls_tortoise_methods(mock_init, mock_generate_schemas):
+async def test_init_db_calls_tortoise_methods(mock_init, mock_migrate):
     app = FastAPI()
 
     await init_db(app)
 
-    mock_init.assert_awaited_once_with(
-        db_url=settings.DATABASE_URL,
-        modules={
-            "models": [
-                "app.infrastructure.database.models.user",
-                "app.infrastructure.database.models.task",
-            ]
-        },
+    mock_init.assert_awaited_once_with(config=database_config())
+    mock_migrate.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+@patch("app.infrastructure.database.db.settings")
+@patch("app.infrastructure.database.db.migrate", new_callable=AsyncMock)
+@patch("app.infrastructure.database.db.Tortoise.init", new_callable=AsyncMock)
+async def test_init_db_migrates_on_startup(mock_init, mock_migrate, mock_settings):
+    mock_settings.DATABASE_URL = "sqlite://:memory:"
+    mock_settings.DATABASE_REPLICA_URL = None
+    mock_settings.DATABASE_MIGRATE_ON_STARTUP = True
+
+    await init_db(FastAPI())
+
+    mock_migrate.assert_awaited_once_with()
+
+
+def test_database_config_sqlite():
+    with patch("app.infrastructure.database.db.settings") as mock_settings:
+        mock_settings.DATABASE_URL = "sqlite://:memory:"
+        mock_settings.DATABASE_REPLICA_URL = None
+        config = database_config()
+
+    assert config["connections"]["default"]["engine"] == "tortoise.backends.sqlite"
+    assert config["apps"]["models"]["models"] == MODELS
+
+
+def test_database_config_postgres_pool():
+    with patch("app.infrastructure.database.db.settings") as mock_settings:
+        mock_settings.DATABASE_URL = "postgres://user:pass@db:5432/tasks"
+        mock_settings.DATABASE_REPLICA_URL = None
+        mock_settings.DATABASE_POOL_MIN_SIZE = 2
+        mock_settings.DATABASE_POOL_MAX_SIZE = 20
+        mock_settings.DATABASE_POOL_MAX_QUERIES = 1000
+        mock_settings.DATABASE_POOL_MAX_INACTIVE_SECONDS = 60.0
+        mock_settings.DATABASE_POOL_ACQUIRE_TIMEOUT_SECONDS = 5.0
+        mock_settings.DATABASE_STATEMENT_CACHE_SIZE = 0
+        connection = database_config()["connections"]["default"]
+
+    assert connection["engine"] == "app.infrastructure.database.pool"
+    assert connection["credentials"] == {
+        "host": "db",
+        "port": 5432,
+        "user": "user",
+        "password": "pass",
+        "database": "tasks",
+        "minsize": 2,
+        "maxsize": 20,
+        "max_queries": 1000,
+        "max_inactive_connection_lifetime": 60.0,
+        "statement_cache_size": 0,
+        "acquire_timeout": 5.0,
+    }
+
+
+def test_database_config_replica():
+    with patch("app.infrastructure.database.db.settings") as mock_settings:
+        mock_settings.DATABASE_URL = "sqlite://primary.db"
+        mock_settings.DATABASE_REPLICA_URL = "sqlite://replica.db"
+        config = database_config()
+
+    assert config["connections"]["replica"]["credentials"]["file_path"] == (
+        "replica.db"
     )
-    mock_generate_schemas.assert_awaited_once()
+    assert config["apps"]["models"]["default_connection"] == "default"
+    assert config["routers"] == ["app.infrastructure.database.routing.ReplicaRouter"]
@@ -0,0 +1,40 @@
+import pytest
+from tortoise.transactions import in_transaction
+from app.infrastructure.database.instrumentation import (
+    current_query_stats,
+    instrument_queries,
+    track_queries,
+)
+from app.infrastructure.database.models.task import TaskList
+from app.infrastructure.database.repositories.task_repo import task_repo
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestQueryInstrumentation:
+
+    async def test_counts_the_statements_of_the_context(self, db):
+        instrument_queries()
+        instrument_queries()
+        task_list = await TaskList.create(name="List")
+
+        with track_queries(record=True) as outer:
+            await task_repo.get_list_row(task_list.id, ("name",))
+            with track_queries() as inner:
+                assert current_query_stats() is inner
+                await task_repo.create_task(task_list.id, {"title": "A"})
+
+        assert outer.count == len(outer.queries) == inner.count + 1
+        assert outer.queries[0].startswith("SELECT")
+        assert inner.queries is None
+        assert outer.seconds > inner.seconds > 0
+        assert current_query_stats() is None
+
+    async def test_transactions_are_counted(self, db):
+        instrument_queries()
+
+        with track_queries() as stats:
+            async with in_transaction():
+                await TaskList.create(name="List")
+
+        assert stats.count == 1
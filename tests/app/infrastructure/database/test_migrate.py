@@ -0,0 +1,118 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from tortoise import Tortoise, connections
+from app.infrastructure.database.migrate import (
+    create_migrations_table,
+    load_migrations,
+    migrate,
+)
+from tests.conftest import MODELS
+
+
+@pytest_asyncio.fixture
+async def empty_db():
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": MODELS})
+    yield connections.get("default")
+    await Tortoise.close_connections()
+
+
+async def table_columns(connection) -> dict:
+    tables = await connection.execute_query_dict(
+        "SELECT name FROM sqlite_master WHERE type = 'table' "
+        "AND name NOT IN ('sqlite_sequence', 'schema_migrations')"
+    )
+    columns = {}
+    for table in tables:
+        rows = await connection.execute_query_dict(
+            f"PRAGMA table_info(\"{table['name']}\")"
+        )
+        columns[table["name"]] = {
+            (row["name"], row["type"], row["notnull"], row["pk"]) for row in rows
+        }
+    return columns
+
+
+class TestMigrate:
+
+    def test_migrations_are_numbered_in_order(self):
+        versions = [migration.version for migration in load_migrations()]
+
+        assert versions == list(range(1, len(versions) + 1))
+
+    @pytest.mark.asyncio
+    @patch("app.infrastructure.database.migrate.in_transaction")
+    async def test_table_is_created_under_the_advisory_lock(self, mock_tx):
+        tx = MagicMock(execute_query=AsyncMock())
+        tx.capabilities.dialect = "postgres"
+        mock_tx.return_value.__aenter__ = AsyncMock(return_value=tx)
+        mock_tx.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        await create_migrations_table(MagicMock())
+
+        statements = [call.args[0] for call in tx.execute_query.await_args_list]
+        assert "pg_advisory_xact_lock" in statements[0]
+        assert "CREATE TABLE IF NOT EXISTS" in statements[1]
+
+    @pytest.mark.asyncio
+    async def test_migrate_is_idempotent(self, empty_db):
+        applied = await migrate(empty_db)
+        again = await migrate(empty_db)
+
+        rows = await empty_db.execute_query_dict(
+            'SELECT "version" FROM "schema_migrations" ORDER BY "version"'
+        )
+        assert [m.version for m in applied] == [row["version"] for row in rows]
+        assert again == []
+
+    @pytest.mark.asyncio
+    async def test_migrated_schema_matches_the_models(self, empty_db):
+        await migrate(empty_db)
+        migrated = await table_columns(empty_db)
+        await Tortoise.close_connections()
+
+        await Tortoise.init(db_url="sqlite://:memory:", modules={"models": MODELS})
+        await Tortoise.generate_schemas()
+        generated = await table_columns(connections.get("default"))
+
+        assert migrated == generated
+
+    @pytest.mark.asyncio
+    async def test_adopts_a_database_created_by_generate_schemas(self, empty_db):
+        await Tortoise.generate_schemas()
+
+        applied = await migrate(empty_db)
+
+        assert len(applied) == len(load_migrations())
+
+    @pytest.mark.asyncio
+    async def test_backfills_the_counters_of_a_first_release_database(self, empty_db):
+        await migrate(empty_db, target=1)
+        await empty_db.execute_query(
+            """INSERT INTO "tasklist" ("name") VALUES ('Old')"""
+        )
+        await empty_db.execute_query(
+            """INSERT INTO "task" ("title", "completed", "task_list_id")
+            VALUES ('a', 1, 1), ('b', 0, 1)"""
+        )
+
+        await migrate(empty_db)
+
+        rows = await empty_db.execute_query_dict(
+            'SELECT "total_tasks", "completed_tasks", "version" FROM "tasklist"'
+        )
+        assert rows == [{"total_tasks": 2, "completed_tasks": 1, "version": 1}]
+
+    @pytest.mark.asyncio
+    async def test_filtered_task_listing_uses_an_index(self, empty_db):
+        await migrate(empty_db)
+
+        plan = await empty_db.execute_query_dict(
+            'EXPLAIN QUERY PLAN SELECT "id" FROM "task" '
+            'WHERE "task_list_id" = 1 AND "completed" = 0 AND "priority" = 2 '
+            'ORDER BY "created_at", "id" LIMIT 50'
+        )
+
+        details = " ".join(row["detail"] for row in plan)
+        assert "idx_task_list_state" in details
+        assert "TEMP B-TREE" not in details
@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from tortoise.backends.asyncpg.client import AsyncpgDBClient
+from app.infrastructure.database.pool import (
+    InstrumentedAsyncpgDBClient,
+    InstrumentedPool,
+    PoolAcquireTimeout,
+    PoolStats,
+    pool_stats,
+)
+
+
+class FakePool:
+    """One-connection pool: a second acquire waits for the first release."""
+
+    def __init__(self):
+        self.free = asyncio.Semaphore(1)
+
+    async def acquire(self, timeout=None):
+        await asyncio.wait_for(self.free.acquire(), timeout)
+        return "connection"
+
+    async def release(self, connection):
+        self.free.release()
+
+    def get_size(self):
+        return 1
+
+    def get_idle_size(self):
+        return 0 if self.free.locked() else 1
+
+
+class TestInstrumentedPool:
+
+    @pytest.mark.asyncio
+    async def test_acquire_counts_waiters_and_times_the_wait(self):
+        stats = PoolStats()
+        pool = InstrumentedPool(FakePool(), stats, acquire_timeout=1)
+
+        first = await pool.acquire()
+        waiting = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0.01)
+        assert stats.waiters == 1
+
+        await pool.release(first)
+        assert await waiting == "connection"
+        assert stats.waiters == 0
+        assert stats.acquired_total == 2
+        assert stats.acquire_seconds.count == 2
+        assert stats.acquire_seconds.sum >= 0.01
+
+    @pytest.mark.asyncio
+    async def test_acquire_timeout(self):
+        stats = PoolStats()
+        pool = InstrumentedPool(FakePool(), stats, acquire_timeout=0.01)
+        await pool.acquire()
+
+        with pytest.raises(PoolAcquireTimeout):
+            await pool.acquire()
+
+        assert (stats.timeouts_total, stats.waiters) == (1, 0)
+
+
+class TestInstrumentedAsyncpgDBClient:
+
+    @pytest.mark.asyncio
+    @patch.object(AsyncpgDBClient, "create_pool", new_callable=AsyncMock)
+    async def test_stats_report_pool_pressure(self, mock_create_pool):
+        mock_create_pool.return_value = FakePool()
+        client = InstrumentedAsyncpgDBClient(
+            acquire_timeout=2,
+            connection_name="default",
+            host="db",
+            minsize=1,
+            maxsize=4,
+            statement_cache_size=100,
+        )
+
+        await client.create_connection(with_db=True)
+        async with client.acquire_connection():
+            stats = client.stats()
+
+        assert mock_create_pool.await_args.kwargs["statement_cache_size"] == 100
+        assert (stats["max_size"], stats["in_use"], stats["idle"]) == (4, 1, 0)
+        assert stats["acquired_total"] == 1
+        assert client.stats()["idle"] == 1
+
+    @pytest.mark.asyncio
+    async def test_pool_stats_without_pool(self, db):
+        assert pool_stats() == {"backend": "sqlite"}
+
+    def test_unknown_attributes_reach_the_pool(self):
+        pool = InstrumentedPool(MagicMock(), PoolStats(), acquire_timeout=None)
+
+        pool.expire_connections()
+
+        pool._pool.expire_connections.assert_called_once()
@@ -0,0 +1,140 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from contextlib import nullcontext
+from tortoise import Tortoise, connections
+from tortoise.transactions import in_transaction
+from app.api.dependencies.auth import get_current_user
+from app.core.config import settings
+from app.core.security import create_access_token, current_user_cache
+from app.infrastructure.database.db import database_config
+from app.infrastructure.database.migrate import migrate
+from app.infrastructure.database.models.task import TaskList
+from app.infrastructure.database.models.user import User
+from app.infrastructure.database.repositories.task_repo import task_repo
+from app.infrastructure.database.routing import (
+    PRIMARY,
+    REPLICA,
+    bind_user,
+    reading_from_replica,
+    recent_writers,
+    replica_reads,
+    replica_stats,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def replicated_db(tmp_path, monkeypatch):
+    """
+    Two SQLite files: writes only reach the primary, so a read served by the
+    replica does not see them.
+    """
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite://{tmp_path}/primary.db")
+    monkeypatch.setattr(
+        settings, "DATABASE_REPLICA_URL", f"sqlite://{tmp_path}/replica.db"
+    )
+    await Tortoise.init(config=database_config())
+    await migrate()
+    await migrate(connections.get(REPLICA))
+    recent_writers.clear()
+    yield
+    await Tortoise.close_connections()
+    recent_writers.clear()
+
+
+async def request(user_id: int, handler, safe: bool = True):
+    """
+    Runs `handler` in its own context, as the request of a user.
+    """
+
+    async def run():
+        with replica_reads() if safe else nullcontext():
+            bind_user(user_id)
+            return await handler()
+
+    return await asyncio.create_task(run())
+
+
+class TestReplicaRouting:
+
+    async def test_safe_requests_read_the_replica(self, replicated_db):
+        task_list = await TaskList.create(name="Primary only")
+
+        from_get = await request(
+            1, lambda: task_repo.get_list_row(task_list.id, ("name",))
+        )
+        from_post = await request(
+            1, lambda: task_repo.get_list_row(task_list.id, ("name",)), safe=False
+        )
+
+        assert from_get is None
+        assert from_post == {"name": "Primary only"}
+        assert replica_stats()["replica_reads"] >= 1
+
+    async def test_a_write_moves_the_rest_of_the_request_to_the_primary(
+        self, replicated_db
+    ):
+        task_list = await TaskList.create(name="List")
+
+        async def write_then_read():
+            await task_repo.create_task(task_list.id, {"title": "New"})
+            tasks = await task_repo.list_tasks(task_list.id, fields=("title",))
+            return tasks, reading_from_replica()
+
+        tasks, replica = await request(1, write_then_read)
+
+        assert tasks == [{"title": "New"}]
+        assert replica is False
+
+    async def test_the_writer_reads_its_writes_within_the_window(self, replicated_db):
+        task_list = await TaskList.create(name="List")
+        task = await task_repo.create_task(task_list.id, {"title": "Old"})
+
+        await request(
+            1, lambda: task_repo.update_task(task.id, {"title": "New"}), safe=False
+        )
+        by_writer = await request(1, lambda: task_repo.get_task(task.id))
+        by_other = await request(2, lambda: task_repo.get_task(task.id))
+
+        assert by_writer.title == "New"
+        assert by_other is None
+
+    async def test_new_users_authenticate_before_reaching_the_replica(
+        self, replicated_db
+    ):
+        user = await User.create(email="new@example.com", hashed_password="x")
+        token = create_access_token({"sub": user.email})
+        current_user_cache.clear()
+
+        authenticated = await request(user.id, lambda: get_current_user(token))
+
+        assert authenticated.id == user.id
+
+    async def test_the_window_expires(self, replicated_db, monkeypatch):
+        monkeypatch.setattr(recent_writers, "ttl", 0.05)
+        task_list = await TaskList.create(name="List")
+
+        await request(
+            1, lambda: task_repo.create_task(task_list.id, {"title": "A"}), safe=False
+        )
+        await asyncio.sleep(0.1)
+
+        assert await request(1, lambda: task_repo.list_exists(task_list.id)) is False
+
+    async def test_transactions_read_the_primary(self, replicated_db):
+        task_list = await TaskList.create(name="List")
+
+        async def read_in_transaction():
+            async with in_transaction(PRIMARY):
+                return await TaskList.get_or_none(id=task_list.id)
+
+        assert (await request(1, read_in_transaction)).name == "List"
+
+    async def test_without_replica_every_read_uses_the_primary(self, monkeypatch):
+        monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", None)
+
+        with replica_reads():
+            assert not reading_from_replica()
+        assert replica_stats() == {"enabled": False}
@@ -2,44 +2,40 @@ import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from fastapi import HTTPException
 from app.services.assigned_task_service import AssignedTaskService
-from app.domain.schemas.assigned_task import AssignTask
+from app.domain.schemas.assigned_task import AssignTask, AssignTaskItem
+from app.infrastructure.database.models.task import Task, TaskList
+from app.infrastructure.database.models.user import User
 
 pytestmark = pytest.mark.asyncio
 
 
 class TestAssignedTaskService:
 
-    @patch(
-        "app.services.assigned_task_service.simulate_task_assignment_email",
-        new_callable=AsyncMock,
-    )
     @patch("app.services.assigned_task_service.task_repo")
     @patch("app.services.assigned_task_service.user_repo")
-    async def test_assign_user_to_task_success(
-        self, mock_user_repo, mock_task_repo, mock_email
-    ):
+    async def test_assign_user_to_task_success(self, mock_user_repo, mock_task_repo):
         service = AssignedTaskService()
         payload = AssignTask(user_email="test@example.com")
+        user = MagicMock(email="test@example.com")
 
-        mock_task_repo.get_task = AsyncMock(return_value=MagicMock())
-        mock_user_repo.get_by_email = AsyncMock(
-            return_value=MagicMock(email="test@example.com")
-        )
-        mock_task_repo.assign_user_to_task = AsyncMock(
-            return_value=MagicMock(title="Task title")
-        )
+        mock_user_repo.get_assignee = AsyncMock(return_value=user)
+        mock_task_repo.assign_user_to_task = AsyncMock(return_value=1)
 
         result = await service.assign_user_to_task(1, payload)
 
         assert result == {"message": "Task assigned to test@example.com"}
-        mock_email.assert_awaited_once_with("test@example.com", "Task title")
+        mock_task_repo.assign_user_to_task.assert_awaited_once_with(1, user)
 
     @patch("app.services.assigned_task_service.task_repo")
-    async def test_assign_user_to_task_task_not_found(self, mock_task_repo):
+    @patch("app.services.assigned_task_service.user_repo")
+    async def test_assign_user_to_task_task_not_found(
+        self, mock_user_repo, mock_task_repo
+    ):
         service = AssignedTaskService()
         payload = AssignTask(user_email="test@example.com")
 
-        mock_task_repo.get_task = AsyncMock(return_value=None)
+        mock_user_repo.get_assignee = AsyncMock(return_value=MagicMock())
+        mock_task_repo.assign_user_to_task = AsyncMock(return_value=0)
 
         with pytest.raises(HTTPException) as exc:
             await service.assign_user_to_task(1, payload)
@@ -55,29 +51,70 @@ class TestAssignedTaskService:
         service = AssignedTaskService()
         payload = AssignTask(user_email="test@example.com")
 
-        mock_task_repo.get_task = AsyncMock(return_value=MagicMock())
-        mock_user_repo.get_by_email = AsyncMock(return_value=None)
+        mock_user_repo.get_assignee = AsyncMock(return_value=None)
+        mock_task_repo.assign_user_to_task = AsyncMock()
 
         with pytest.raises(HTTPException) as exc:
             await service.assign_user_to_task(1, payload)
 
         assert exc.value.status_code == 404
         assert exc.value.detail == "User not found"
+        mock_task_repo.assign_user_to_task.assert_not_called()
+
+    async def test_assign_user_to_task_query_count(self, db, count_queries):
+        task_list = await TaskList.create(name="Queries")
+        task = await Task.create(title="Report", task_list=task_list)
+        await User.create(email="ana@example.com", hashed_password="x")
+        service = AssignedTaskService()
+
+        with count_queries() as counter:
+            await service.assign_user_to_task(
+                task.id, AssignTask(user_email="ana@example.com")
+            )
+
+        # User lookup, foreign key UPDATE and outbox INSERT.
+        assert counter.count == 3
 
     @patch("app.services.assigned_task_service.task_repo")
     @patch("app.services.assigned_task_service.user_repo")
-    async def test_assign_user_to_task_assign_failed(
-        self, mock_user_repo, mock_task_repo
-    ):
+    async def test_assign_users_to_tasks(self, mock_user_repo, mock_task_repo):
         service = AssignedTaskService()
-        payload = AssignTask(user_email="test@example.com")
+        ana = MagicMock(id=1, email="ana@example.com")
+        bob = MagicMock(id=2, email="bob@example.com")
+        mock_user_repo.get_by_emails = AsyncMock(return_value=[ana, bob])
+        mock_task_repo.get_existing_task_ids = AsyncMock(return_value={10, 11, 12})
+        mock_task_repo.assign_tasks = AsyncMock(return_value=3)
+        items = [
+            AssignTaskItem(task_id=10, user_email="ana@example.com"),
+            AssignTaskItem(task_id=11, user_email="ana@example.com"),
+            AssignTaskItem(task_id=12, user_email="ana@example.com"),
+            AssignTaskItem(task_id=12, user_email="bob@example.com"),
+            AssignTaskItem(task_id=99, user_email="bob@example.com"),
+            AssignTaskItem(task_id=10, user_email="nobody@example.com"),
+        ]
+
+        result = await service.assign_users_to_tasks(items)
+
+        assert result.assigned == 3
+        assert [(error.index, error.detail) for error in result.errors] == [
+            (4, "Task not found"),
+            (5, "User not found"),
+        ]
+        mock_user_repo.get_by_emails.assert_awaited_once()
+        mock_task_repo.get_existing_task_ids.assert_awaited_once()
+        mock_task_repo.assign_tasks.assert_awaited_once_with(
+            {10: ana, 11: ana, 12: bob}
+        )
 
-        mock_task_repo.get_task = AsyncMock(return_value=MagicMock())
-        mock_user_repo.get_by_email = AsyncMock(return_value=MagicMock())
-        mock_task_repo.assign_user_to_task = AsyncMock(return_value=None)
+    @patch("app.services.assigned_task_service.settings")
+    async def test_assign_users_to_tasks_too_many_items(self, mock_settings):
+        mock_settings.BULK_MAX_ITEMS = 1
+        service = AssignedTaskService()
+        items = [
+            AssignTaskItem(task_id=n, user_email="ana@example.com") for n in (1, 2)
+        ]
 
         with pytest.raises(HTTPException) as exc:
-            await service.assign_user_to_task(1, payload)
+            await service.assign_users_to_tasks(items)
 
-        assert exc.value.status_code == 500
-        assert exc.value.detail == "Failed to assign user to task"
+        assert exc.value.status_code == 413
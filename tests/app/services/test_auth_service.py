@@ -10,9 +10,13 @@ from app.domain.schemas.user import UserCreate
 class TestAuthService:
 
     @patch("app.services.auth_service.user_repo")
-    @patch("app.services.auth_service.hash_password", return_value="hashed_pass")
+    @patch(
+        "app.services.auth_service.hash_password_async",
+        new_callable=AsyncMock,
+        return_value="hashed_pass",
+    )
     async def test_register_user_success(self, mock_hash_password, mock_user_repo):
-        mock_user_repo.get_by_email = AsyncMock(return_value=None)
+        mock_user_repo.email_exists = AsyncMock(return_value=False)
         mock_user_repo.create = AsyncMock(
             return_value=MagicMock(email="test@example.com")
         )
@@ -29,8 +33,13 @@ class TestAuthService:
         )
 
     @patch("app.services.auth_service.user_repo")
-    async def test_register_user_email_exists(self, mock_user_repo):
-        mock_user_repo.get_by_email = AsyncMock(return_value=MagicMock())
+    @patch(
+        "app.services.auth_service.hash_password_async",
+        new_callable=AsyncMock,
+        return_value="hashed_pass",
+    )
+    async def test_register_user_email_exists(self, mock_hash_password, mock_user_repo):
+        mock_user_repo.email_exists = AsyncMock(return_value=True)
 
         service = AuthService()
         user_data = UserCreate(
@@ -41,9 +50,36 @@ class TestAuthService:
             await service.register_user(user_data)
         assert exc.value.status_code == 400
         assert exc.value.detail == "Email already registered"
+        mock_hash_password.assert_not_awaited()
 
     @patch("app.services.auth_service.user_repo")
-    @patch("app.services.auth_service.verify_password", return_value=True)
+    @patch(
+        "app.services.auth_service.hash_password_async",
+        new_callable=AsyncMock,
+        return_value="hashed_pass",
+    )
+    async def test_register_user_race_on_email(
+        self, mock_hash_password, mock_user_repo
+    ):
+        # Another registration took the email between the check and the INSERT.
+        mock_user_repo.email_exists = AsyncMock(return_value=False)
+        mock_user_repo.create = AsyncMock(return_value=None)
+
+        service = AuthService()
+        user_data = UserCreate(
+            email="test@example.com", password="123456", full_name="Test User"
+        )
+
+        with pytest.raises(HTTPException) as exc:
+            await service.register_user(user_data)
+        assert exc.value.status_code == 400
+
+    @patch("app.services.auth_service.user_repo")
+    @patch(
+        "app.services.auth_service.verify_password_async",
+        new_callable=AsyncMock,
+        return_value=True,
+    )
     @patch("app.services.auth_service.create_access_token", return_value="token123")
     async def test_login_user_success(self, mock_token, mock_verify, mock_user_repo):
         user = MagicMock(email="test@example.com", hashed_password="hashed")
@@ -63,10 +99,14 @@ class TestAuthService:
 
         assert result["access_token"] == "token123"
         assert result["token_type"] == "bearer"
-        mock_verify.assert_called_once_with("123456", "hashed")
+        mock_verify.assert_awaited_once_with("123456", "hashed")
 
     @patch("app.services.auth_service.user_repo")
-    @patch("app.services.auth_service.verify_password", return_value=False)
+    @patch(
+        "app.services.auth_service.verify_password_async",
+        new_callable=AsyncMock,
+        return_value=False,
+    )
     async def test_login_user_invalid_credentials(self, mock_verify, mock_user_repo):
         user = MagicMock(email="test@example.com", hashed_password="hashed")
         mock_user_repo.get_by_email = AsyncMock(return_value=user)
@@ -86,3 +126,27 @@ class TestAuthService:
             await service.login_user(form_data)
         assert exc.value.status_code == 401
         assert exc.value.detail == "Invalid credentials"
+
+    @patch(
+        "app.services.auth_service.hash_password_async",
+        new_callable=AsyncMock,
+        return_value="hashed_pass",
+    )
+    async def test_register_user_hashes_only_free_emails(
+        self, mock_hash_password, db, count_queries
+    ):
+        service = AuthService()
+        user_data = UserCreate(
+            email="ana@example.com", password="123456", full_name="Ana"
+        )
+
+        with count_queries() as first:
+            await service.register_user(user_data)
+        with count_queries() as duplicate:
+            with pytest.raises(HTTPException) as exc:
+                await service.register_user(user_data)
+
+        assert exc.value.status_code == 400
+        assert first.count == 2 and first.queries[1].startswith("INSERT")
+        assert duplicate.count == 1
+        mock_hash_password.assert_awaited_once()
@@ -0,0 +1,128 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from tortoise import timezone
+from app.infrastructure.database.models.notification import NotificationOutbox
+from app.infrastructure.database.models.user import User
+from app.infrastructure.database.repositories.notification_repo import (
+    DISCARDED,
+    FAILED,
+    PENDING,
+    SENT,
+)
+from app.infrastructure.database.repositories.task_repo import TaskRepository
+from app.services.notification_dispatcher import NotificationDispatcher
+
+pytestmark = pytest.mark.asyncio
+
+
+async def seed_assignments(assignments: list[tuple[str, str]]) -> None:
+    repo = TaskRepository()
+    task_list = await repo.create_list("Notifications")
+    for email, title in assignments:
+        task = await repo.create_task(task_list.id, {"title": title})
+        await NotificationOutbox.create(
+            recipient=email, task_id=task.id, next_attempt_at=task.created_at
+        )
+
+
+class TestNotificationDispatcher:
+
+    async def test_dispatch_sends_one_digest_per_recipient(self, db, smtp_server):
+        await seed_assignments(
+            [
+                ("ana@example.com", "First"),
+                ("ana@example.com", "Second"),
+                ("bob@example.com", "Third"),
+            ]
+        )
+        dispatcher = NotificationDispatcher()
+
+        processed = await dispatcher.dispatch_once()
+
+        assert processed == 3
+        assert sorted(message["To"] for message in smtp_server.messages) == [
+            "ana@example.com",
+            "bob@example.com",
+        ]
+        assert await NotificationOutbox.filter(status=SENT).count() == 3
+        metrics = await dispatcher.metrics()
+        assert metrics["queue_depth"] == 0
+        assert metrics["sent_total"] == 3
+        assert await dispatcher.dispatch_once() == 0
+
+    async def test_failed_delivery_is_retried_with_backoff(self, db, smtp_server):
+        await seed_assignments([("ana@example.com", "First")])
+        smtp_server.fail_with = "451 Try again later"
+        dispatcher = NotificationDispatcher()
+
+        await dispatcher.dispatch_once()
+
+        row = await NotificationOutbox.get()
+        assert row.status == PENDING
+        assert row.attempts == 1
+        assert row.next_attempt_at > row.created_at
+        assert "451" in row.last_error
+        metrics = await dispatcher.metrics()
+        assert (metrics["queue_depth"], metrics["retried_total"]) == (1, 1)
+        assert smtp_server.messages == []
+
+    @patch("app.services.notification_dispatcher.settings")
+    async def test_gives_up_after_max_attempts(self, mock_settings, db):
+        mock_settings.NOTIFICATIONS_BATCH_SIZE = 10
+        mock_settings.NOTIFICATIONS_LEASE_SECONDS = 60
+        mock_settings.NOTIFICATIONS_MAX_ATTEMPTS = 1
+        await seed_assignments([("ana@example.com", "First")])
+        send = AsyncMock(side_effect=OSError("unreachable"))
+        dispatcher = NotificationDispatcher(send=send)
+
+        await dispatcher.dispatch_once()
+
+        row = await NotificationOutbox.get()
+        assert row.status == FAILED
+        assert dispatcher.failed_total == 1
+
+    async def test_deleted_task_is_not_notified(self, db):
+        await NotificationOutbox.create(
+            recipient="ana@example.com", task_id=999, next_attempt_at=timezone.now()
+        )
+        send = AsyncMock()
+        dispatcher = NotificationDispatcher(send=send)
+
+        await dispatcher.dispatch_once()
+
+        send.assert_not_awaited()
+        assert (await NotificationOutbox.get()).status == DISCARDED
+        assert (dispatcher.failed_total, dispatcher.discarded_total) == (0, 1)
+
+    async def test_deleted_tasks_are_left_out_of_the_digest(self, db):
+        await seed_assignments([("ana@example.com", "Kept")])
+        await NotificationOutbox.create(
+            recipient="ana@example.com", task_id=999, next_attempt_at=timezone.now()
+        )
+        send = AsyncMock()
+        dispatcher = NotificationDispatcher(send=send)
+
+        await dispatcher.dispatch_once()
+
+        send.assert_awaited_once_with("ana@example.com", ["Kept"])
+        statuses = (
+            await NotificationOutbox.all()
+            .order_by("id")
+            .values_list("status", flat=True)
+        )
+        assert statuses == [SENT, DISCARDED]
+        metrics = await dispatcher.metrics()
+        assert (metrics["sent_total"], metrics["discarded_total"]) == (1, 1)
+
+    async def test_assignment_is_delivered_end_to_end(self, db, smtp_server):
+        repo = TaskRepository()
+        task_list = await repo.create_list("E2E")
+        task = await repo.create_task(task_list.id, {"title": "Write report"})
+        user = await User.create(email="ana@example.com", hashed_password="x")
+
+        await repo.assign_user_to_task(task.id, user)
+        await NotificationDispatcher().dispatch_once()
+
+        assert [message["Subject"] for message in smtp_server.messages] == [
+            "Task assigned: Write report"
+        ]
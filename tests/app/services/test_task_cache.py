@@ -0,0 +1,103 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+from app.infrastructure.cache.memory import MemoryCacheBackend
+from app.infrastructure.cache.redis import RedisCacheBackend
+from app.infrastructure.database.routing import (
+    bind_user,
+    reading_from_replica,
+    recent_writers,
+    replica_reads,
+)
+from app.services.task_cache import INDEX_SCOPE, TaskReadCache
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture(params=["memory", "redis"])
+async def cache(request, redis_server):
+    if request.param == "memory":
+        backend = MemoryCacheBackend(maxsize=100, maxbytes=10_000)
+    else:
+        backend = RedisCacheBackend(redis_server.url, timeout=1)
+    yield TaskReadCache(backend, ttl=30)
+    await backend.close()
+
+
+class TestTaskReadCache:
+
+    async def test_read_through(self, cache):
+        load = AsyncMock(return_value={"id": 1})
+
+        first = await cache.get_or_load(1, ("list",), load)
+        second = await cache.get_or_load(1, ("list",), load)
+
+        assert first == second == {"id": 1}
+        load.assert_awaited_once()
+        stats = await cache.stats()
+        assert stats["hit_ratio"] == 0.5 and stats["bytes"] > 0
+
+    async def test_none_is_not_cached(self, cache):
+        load = AsyncMock(return_value=None)
+
+        await cache.get_or_load(1, ("etag",), load)
+        await cache.get_or_load(1, ("etag",), load)
+
+        assert load.await_count == 2
+
+    async def test_invalidation_is_scoped_to_the_lists(self, cache):
+        load = AsyncMock(side_effect=lambda: {"n": load.await_count})
+
+        await cache.get_or_load(1, ("list",), load)
+        await cache.get_or_load(2, ("list",), load)
+        await cache.get_or_load(INDEX_SCOPE, ("page",), load)
+        await cache.invalidate_lists([1])
+
+        assert await cache.get_or_load(1, ("list",), load) == {"n": 4}
+        assert await cache.get_or_load(2, ("list",), load) == {"n": 2}
+        assert await cache.get_or_load(INDEX_SCOPE, ("page",), load) == {"n": 5}
+
+        await cache.invalidate_all()
+        assert await cache.get_or_load(2, ("list",), load) == {"n": 6}
+
+    async def test_read_racing_a_write_is_not_served(self, cache):
+        async def stale_load():
+            # The write commits and invalidates while this read is in flight.
+            await cache.invalidate_lists([1])
+            return {"stale": True}
+
+        await cache.get_or_load(1, ("list",), stale_load)
+        fresh = await cache.get_or_load(1, ("list",), AsyncMock(return_value={}))
+
+        assert fresh == {}
+
+    async def test_disabled_cache_always_loads(self):
+        cache = TaskReadCache(None, ttl=30)
+        load = AsyncMock(return_value={"id": 1})
+
+        await cache.get_or_load(1, ("list",), load)
+        await cache.invalidate_lists([1])
+        await cache.get_or_load(1, ("list",), load)
+
+        assert load.await_count == 2
+        assert await cache.stats() == {"backend": "none"}
+
+    async def test_entries_are_loaded_as_the_request_routes(self, cache):
+        async def load():
+            return {"replica": reading_from_replica()}
+
+        with patch(
+            "app.infrastructure.database.routing.settings.DATABASE_REPLICA_URL",
+            "sqlite://replica.db",
+        ), replica_reads():
+            from_replica = await cache.get_or_load(1, ("list", 1), load)
+            # A user who has just written reads their writes from the primary.
+            recent_writers.set(2, True)
+            try:
+                bind_user(2)
+                from_primary = await cache.get_or_load(1, ("list", 2), load)
+            finally:
+                recent_writers.clear()
+
+        assert from_replica == {"replica": True}
+        assert from_primary == {"replica": False}
@@ -2,7 +2,16 @@ import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from datetime import datetime
 from app.services.task_service import TaskService
-from app.domain.schemas.task import TaskCreate, TaskUpdate
+from fastapi import HTTPException
+from app.domain.schemas.task import (
+    TaskBulkSelection,
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskListCreate,
+    TaskUpdate,
+    TASK_OUT_FIELDS,
+)
+from app.utils.pagination import decode_cursor
 
 pytestmark = pytest.mark.asyncio
 
@@ -27,30 +36,128 @@ class TestTaskService:
 
     @patch("app.services.task_service.task_repo")
     async def test_get_list_with_progress_success(self, mock_repo):
-        from app.domain.schemas.task import TaskOut
+        task_row = {
+            "id": 1,
+            "title": "Task",
+            "description": "desc",
+            "priority": 2,
+            "completed": True,
+            "created_at": datetime.utcnow(),
+        }
+        mock_repo.get_list_row = AsyncMock(
+            return_value={
+                "id": 1,
+                "name": "List",
+                "created_at": datetime.utcnow(),
+                "total_tasks": 1,
+                "completed_tasks": 1,
+            }
+        )
+        mock_repo.list_tasks = AsyncMock(return_value=[task_row])
 
-        mock_task = MagicMock()
-        mock_task.id = 1
-        mock_task.title = "Task"
-        mock_task.description = "desc"
-        mock_task.priority = 2
-        mock_task.completed = True
-        mock_task.created_at = datetime.utcnow()
+        service = TaskService()
+        result = await service.get_list_with_progress(1)
 
-        mock_list = MagicMock()
-        mock_list.id = 1
-        mock_list.name = "List"
-        mock_list.created_at = datetime.utcnow()
-        mock_list.tasks = [mock_task]
+        assert result["name"] == "List"
+        assert result["completed_percentage"] == 100.0
+        assert result["tasks"] == [task_row]
+        assert mock_repo.list_tasks.await_args.kwargs["fields"] == TASK_OUT_FIELDS
 
-        mock_repo.get_list = AsyncMock(return_value=mock_list)
+    @patch("app.services.task_service.task_repo")
+    async def test_get_list_with_progress_not_found(self, mock_repo):
+        mock_repo.get_list_row = AsyncMock(return_value=None)
+        mock_repo.list_tasks = AsyncMock()
 
         service = TaskService()
         result = await service.get_list_with_progress(1)
 
-        assert result.name == "List"
-        assert result.completed_percentage == 100.0
-        assert isinstance(result.tasks[0], TaskOut)
+        assert result is None
+        mock_repo.list_tasks.assert_not_called()
+
+    @patch("app.services.task_service.task_repo")
+    async def test_etags_follow_the_list_version(self, mock_repo):
+        mock_repo.get_list_version = AsyncMock(side_effect=[3, 4, 3, None])
+        service = TaskService()
+
+        first = await service.get_list_etag(1)
+        # Bumped by another worker: the version is read again, not cached.
+        bumped = await service.get_list_etag(1)
+        filtered = await service.get_tasks_etag(1, completed=True)
+        missing = await service.get_tasks_etag(2)
+
+        assert first != bumped
+        assert filtered not in (first, bumped)
+        assert missing is None
+
+    @patch("app.services.task_service.task_repo")
+    async def test_get_lists_etag_covers_the_page(self, mock_repo):
+        mock_repo.get_list_versions = AsyncMock(side_effect=[[(1, 1)], [(1, 2)]])
+        service = TaskService()
+
+        before = await service.get_lists_etag(limit=10)
+        after = await service.get_lists_etag(limit=10)
+
+        assert before != after
+        assert mock_repo.get_list_versions.await_args.args == (11, None)
+
+    @patch("app.services.task_service.task_repo")
+    async def test_get_all_lists_uses_aggregated_rows(self, mock_repo):
+        mock_repo.get_all_lists = AsyncMock(
+            return_value=[
+                {
+                    "id": 1,
+                    "name": "List",
+                    "created_at": datetime.utcnow(),
+                    "total_tasks": 3,
+                    "completed_tasks": 1,
+                }
+            ]
+        )
+
+        service = TaskService()
+        result = await service.get_all_lists(limit=10)
+
+        assert result["items"][0]["total_tasks"] == 3
+        assert result["items"][0]["completed_percentage"] == 33.33
+        assert result["next_cursor"] is None
+        mock_repo.get_all_lists.assert_awaited_once_with(11, None)
+
+    @patch("app.services.task_service.task_repo")
+    async def test_list_tasks_returns_next_cursor(self, mock_repo):
+        created_at = datetime(2025, 8, 7, 14, 3, 45)
+        mock_repo.list_tasks = AsyncMock(
+            return_value=[
+                {
+                    "id": task_id,
+                    "title": "Task",
+                    "description": None,
+                    "priority": 1,
+                    "completed": False,
+                    "created_at": created_at,
+                }
+                for task_id in (1, 2, 3)
+            ]
+        )
+
+        service = TaskService()
+        result = await service.list_tasks(1, completed=False, limit=2)
+
+        assert [task["id"] for task in result["items"]] == [1, 2]
+        assert decode_cursor(result["next_cursor"]) == (created_at, 2)
+        mock_repo.list_tasks.assert_awaited_once_with(
+            1, False, None, 3, None, fields=TASK_OUT_FIELDS
+        )
+
+    @patch("app.services.task_service.task_repo")
+    async def test_list_tasks_invalid_cursor(self, mock_repo):
+        mock_repo.list_tasks = AsyncMock()
+
+        service = TaskService()
+        with pytest.raises(HTTPException) as exc:
+            await service.list_tasks(1, cursor="not-a-cursor")
+
+        assert exc.value.status_code == 400
+        mock_repo.list_tasks.assert_not_called()
 
     @patch("app.services.task_service.task_repo")
     async def test_create_task_success(self, mock_repo):
@@ -62,41 +169,210 @@ class TestTaskService:
             completed=False,
             created_at=datetime.utcnow(),
         )
-        mock_list = MagicMock()
-        mock_repo.get_list = AsyncMock(return_value=mock_list)
+        mock_repo.list_exists = AsyncMock(return_value=True)
         mock_repo.create_task = AsyncMock(return_value=mock_task)
 
         service = TaskService()
         result = await service.create_task(1, TaskCreate(title="Task"))
 
         assert result.title == "Task"
+        mock_repo.list_exists.assert_awaited_once_with(1)
+
+    @patch("app.services.task_service.task_repo")
+    async def test_create_task_list_not_found(self, mock_repo):
+        mock_repo.list_exists = AsyncMock(return_value=False)
+        mock_repo.create_task = AsyncMock()
+
+        service = TaskService()
+        with pytest.raises(HTTPException) as exc:
+            await service.create_task(1, TaskCreate(title="Task"))
+
+        assert exc.value.status_code == 404
+        mock_repo.create_task.assert_not_called()
+
+    @patch("app.services.task_service.task_repo")
+    async def test_bulk_create_tasks_reports_invalid_items(self, mock_repo):
+        mock_repo.list_exists = AsyncMock(return_value=True)
+        mock_repo.bulk_create_tasks = AsyncMock(return_value=[10, 11])
+
+        service = TaskService()
+        result = await service.bulk_create_tasks(
+            1,
+            [
+                {"title": "First"},
+                {"description": "no title"},
+                {"title": "Third", "priority": 3},
+            ],
+        )
+
+        assert [(item.index, item.id) for item in result.created] == [
+            (0, 10),
+            (2, 11),
+        ]
+        assert result.errors[0].index == 1
+        assert result.errors[0].errors[0]["loc"] == ("title",)
+        mock_repo.bulk_create_tasks.assert_awaited_once_with(
+            1,
+            [
+                {"title": "First", "description": None, "priority": 1},
+                {"title": "Third", "description": None, "priority": 3},
+            ],
+        )
+
+    @patch("app.services.task_service.task_repo")
+    async def test_bulk_create_tasks_list_not_found(self, mock_repo):
+        mock_repo.list_exists = AsyncMock(return_value=False)
+        mock_repo.bulk_create_tasks = AsyncMock()
+
+        service = TaskService()
+        with pytest.raises(HTTPException) as exc:
+            await service.bulk_create_tasks(1, [{"title": "Task"}])
+
+        assert exc.value.status_code == 404
+        mock_repo.bulk_create_tasks.assert_not_called()
+
+    @patch("app.services.task_service.settings")
+    @patch("app.services.task_service.task_repo")
+    async def test_bulk_create_tasks_too_many_items(self, mock_repo, mock_settings):
+        mock_settings.BULK_MAX_ITEMS = 1
+
+        service = TaskService()
+        with pytest.raises(HTTPException) as exc:
+            await service.bulk_create_tasks(1, [{"title": "A"}, {"title": "B"}])
+
+        assert exc.value.status_code == 413
+
+    @patch("app.services.task_service.task_repo")
+    async def test_export_tasks_streams_csv(self, mock_repo):
+        async def iter_tasks(*args, **kwargs):
+            yield [{field: 1 for field in TASK_OUT_FIELDS}]
+
+        mock_repo.list_exists = AsyncMock(return_value=True)
+        mock_repo.iter_tasks = MagicMock(side_effect=iter_tasks)
+
+        service = TaskService()
+        stream = await service.export_tasks(1, "csv", completed=True)
+        parts = [part async for part in stream]
+
+        assert parts[0].decode().strip() == ",".join(TASK_OUT_FIELDS)
+        assert parts[1].decode().strip() == ",".join("1" * len(TASK_OUT_FIELDS))
+        assert mock_repo.iter_tasks.call_args.args == (1, True, None)
+
+    @patch("app.services.task_service.task_repo")
+    async def test_export_tasks_list_not_found(self, mock_repo):
+        mock_repo.list_exists = AsyncMock(return_value=False)
+        mock_repo.iter_tasks = MagicMock()
+
+        service = TaskService()
+        with pytest.raises(HTTPException) as exc:
+            await service.export_tasks(1, "ndjson")
+
+        assert exc.value.status_code == 404
+        mock_repo.iter_tasks.assert_not_called()
+
+    @patch("app.services.task_service.settings")
+    @patch("app.services.task_service.task_repo")
+    async def test_import_tasks_in_batches(self, mock_repo, mock_settings):
+        async def body():
+            yield b'{"title": "A"}\n{"priority": 2}\n{"title": "B"}\n'
+            yield b'oops\n{"title": "C", "priority": 5}\n'
+
+        mock_settings.IMPORT_BATCH_SIZE = 2
+        mock_settings.IMPORT_MAX_ERRORS = 1
+        mock_settings.IMPORT_MAX_LINE_LENGTH = 100
+        mock_repo.list_exists = AsyncMock(return_value=True)
+        mock_repo.import_tasks = AsyncMock(
+            side_effect=lambda list_id, batch: len(batch)
+        )
+
+        service = TaskService()
+        result = await service.import_tasks(1, "ndjson", body())
+
+        assert (result.imported, result.failed) == (3, 2)
+        assert [error.index for error in result.errors] == [1]
+        assert [
+            [task["title"] for task in call.args[1]]
+            for call in mock_repo.import_tasks.await_args_list
+        ] == [["A", "B"], ["C"]]
+        assert result.rows_per_second > 0
+
+    @patch("app.services.task_service.task_repo")
+    async def test_import_tasks_invalid_utf8(self, mock_repo):
+        async def body():
+            yield b"title\n\xff\xfe\n"
+
+        mock_repo.list_exists = AsyncMock(return_value=True)
+        mock_repo.import_tasks = AsyncMock()
+
+        service = TaskService()
+        with pytest.raises(HTTPException) as exc:
+            await service.import_tasks(1, "csv", body())
+
+        assert exc.value.status_code == 400
+
+    @patch("app.services.task_service.settings")
+    @patch("app.services.task_service.task_repo")
+    async def test_import_tasks_line_too_long(self, mock_repo, mock_settings):
+        async def body():
+            yield b'{"title": "' + b"a" * 100
+
+        mock_settings.IMPORT_MAX_LINE_LENGTH = 50
+        mock_repo.list_exists = AsyncMock(return_value=True)
+        mock_repo.import_tasks = AsyncMock()
+
+        service = TaskService()
+        with pytest.raises(HTTPException) as exc:
+            await service.import_tasks(1, "ndjson", body())
+
+        assert exc.value.status_code == 413
+        mock_repo.import_tasks.assert_not_called()
+
+    @patch("app.services.task_service.task_repo")
+    async def test_import_tasks_list_not_found(self, mock_repo):
+        mock_repo.list_exists = AsyncMock(return_value=False)
+
+        service = TaskService()
+        with pytest.raises(HTTPException) as exc:
+            await service.import_tasks(1, "csv", None)
+
+        assert exc.value.status_code == 404
 
     @patch("app.services.task_service.task_repo")
     async def test_update_task_success(self, mock_repo):
         mock_task = MagicMock()
-        mock_task.update_from_dict = MagicMock()
-        mock_task.save = AsyncMock()
-
-        mock_repo.get_task = AsyncMock(return_value=mock_task)
+        mock_repo.get_task = AsyncMock()
         mock_repo.update_task = AsyncMock(return_value=mock_task)
 
         service = TaskService()
         result = await service.update_task(1, TaskUpdate(title="Updated"))
 
-        assert result is not None
+        assert result is mock_task
+        mock_repo.update_task.assert_awaited_once_with(1, {"title": "Updated"})
+        mock_repo.get_task.assert_not_called()
 
     @patch("app.services.task_service.task_repo")
     async def test_update_task_not_found(self, mock_repo):
-        mock_repo.get_task = AsyncMock(return_value=None)
+        mock_repo.update_task = AsyncMock(return_value=None)
 
         service = TaskService()
         result = await service.update_task(1, TaskUpdate(title="Updated"))
 
         assert result is None
 
+    @patch("app.services.task_service.task_repo")
+    async def test_update_task_empty_patch_reads_the_task(self, mock_repo):
+        mock_repo.get_task = AsyncMock(return_value="task")
+        mock_repo.update_task = AsyncMock()
+
+        service = TaskService()
+        result = await service.update_task(1, TaskUpdate())
+
+        assert result == "task"
+        mock_repo.update_task.assert_not_called()
+
     @patch("app.services.task_service.task_repo")
     async def test_delete_task_success(self, mock_repo):
-        mock_repo.delete_task = AsyncMock(return_value=1)
+        mock_repo.delete_task = AsyncMock(return_value=7)
 
         service = TaskService()
         result = await service.delete_task(1)
@@ -105,10 +381,111 @@ class TestTaskService:
 
     @patch("app.services.task_service.task_repo")
     async def test_delete_task_not_found(self, mock_repo):
-        mock_repo.delete_task = AsyncMock(return_value=0)
+        mock_repo.delete_task = AsyncMock(return_value=None)
 
         service = TaskService()
         with pytest.raises(Exception) as exc:
             await service.delete_task(1)
 
         assert exc.value.status_code == 404
+
+    @patch("app.services.task_service.task_repo")
+    async def test_bulk_update_tasks_by_filter(self, mock_repo):
+        mock_repo.task_selector = MagicMock(return_value="selector")
+        mock_repo.bulk_update_tasks = AsyncMock(return_value=4)
+
+        service = TaskService()
+        result = await service.bulk_update_tasks(
+            TaskBulkUpdate(
+                filter={"list_id": 1, "completed": False}, patch={"completed": True}
+            )
+        )
+
+        assert result.affected == 4
+        mock_repo.task_selector.assert_called_once_with(
+            list_id=1, completed=False, priority=None
+        )
+        mock_repo.bulk_update_tasks.assert_awaited_once_with(
+            "selector", {"completed": True}
+        )
+
+    @patch("app.services.task_service.task_repo")
+    async def test_bulk_update_tasks_empty_patch(self, mock_repo):
+        mock_repo.bulk_update_tasks = AsyncMock()
+
+        service = TaskService()
+        with pytest.raises(HTTPException) as exc:
+            await service.bulk_update_tasks(TaskBulkUpdate(ids=[1], patch={}))
+
+        assert exc.value.status_code == 400
+        mock_repo.bulk_update_tasks.assert_not_called()
+
+    @patch("app.services.task_service.task_repo")
+    async def test_bulk_delete_tasks_by_ids(self, mock_repo):
+        mock_repo.task_selector = MagicMock(return_value="selector")
+        mock_repo.bulk_delete_tasks = AsyncMock(return_value=2)
+
+        service = TaskService()
+        result = await service.bulk_delete_tasks(TaskBulkSelection(ids=[1, 2]))
+
+        assert result.affected == 2
+        mock_repo.task_selector.assert_called_once_with(ids=[1, 2])
+
+    @patch("app.services.task_service.settings")
+    @patch("app.services.task_service.task_repo")
+    async def test_bulk_delete_tasks_too_many_ids(self, mock_repo, mock_settings):
+        mock_settings.BULK_MAX_ITEMS = 1
+
+        service = TaskService()
+        with pytest.raises(HTTPException) as exc:
+            await service.bulk_delete_tasks(TaskBulkSelection(ids=[1, 2]))
+
+        assert exc.value.status_code == 413
+
+
+class TestTaskServiceCache:
+
+    async def test_reads_are_cached_until_a_write(self, db, count_queries):
+        service = TaskService()
+        first = await service.create_list(TaskListCreate(name="First"))
+        second = await service.create_list(TaskListCreate(name="Second"))
+        task = await service.create_task(first.id, TaskCreate(title="Draft"))
+        await service.get_list_with_progress(first.id)
+        await service.get_list_with_progress(second.id)
+        await service.list_tasks(first.id)
+        await service.get_all_lists()
+
+        with count_queries() as cached:
+            detail = await service.get_list_with_progress(first.id)
+            page = await service.list_tasks(first.id)
+            await service.get_all_lists()
+
+        await service.update_task(task.id, TaskUpdate(completed=True))
+        with count_queries() as after_write:
+            updated = await service.get_list_with_progress(first.id)
+            await service.get_list_with_progress(second.id)
+            lists = await service.get_all_lists()
+
+        assert cached.count == 0
+        assert [row["title"] for row in detail["tasks"]] == ["Draft"]
+        assert [row["id"] for row in page["items"]] == [task.id]
+        # The detail of the updated list and the index are read again.
+        assert after_write.count == 3
+        assert updated["completed_percentage"] == 100.0
+        assert lists["items"][0]["completed_percentage"] == 100.0
+
+        await service.delete_task(task.id)
+        assert (await service.get_list_with_progress(first.id))["tasks"] == []
+
+    async def test_bodies_follow_the_etag_of_other_workers_writes(self, db):
+        service, other_worker = TaskService(), TaskService()
+        task_list = await service.create_list(TaskListCreate(name="List"))
+        await service.create_task(task_list.id, TaskCreate(title="Draft"))
+        etag = await service.get_list_etag(task_list.id)
+        await service.get_list_with_progress(task_list.id, etag)
+
+        await other_worker.create_task(task_list.id, TaskCreate(title="Other"))
+        etag = await service.get_list_etag(task_list.id)
+        detail = await service.get_list_with_progress(task_list.id, etag)
+
+        assert [task["title"] for task in detail["tasks"]] == ["Draft", "Other"]
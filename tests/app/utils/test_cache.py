@@ -0,0 +1,72 @@
+from unittest.mock import patch
+from app.utils.cache import TTLCache
+
+
+class TestTTLCache:
+
+    def test_get_set_and_stats(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_ratio"] == 0.5
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.evictions == 1
+
+    @patch("app.utils.cache.monotonic")
+    def test_entries_expire(self, mock_monotonic):
+        cache = TTLCache(maxsize=2, ttl=60)
+        mock_monotonic.return_value = 100.0
+        cache.set("a", 1, ttl=5)
+
+        mock_monotonic.return_value = 104.0
+        assert cache.get("a") == 1
+        mock_monotonic.return_value = 105.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_non_positive_ttl_is_not_stored(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+
+        cache.set("a", 1, ttl=-1)
+
+        assert len(cache) == 0
+
+    def test_discard_where(self):
+        cache = TTLCache(maxsize=5, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 1)
+
+        assert cache.discard_where(lambda value: value == 1) == 2
+        assert cache.pop("b") == 2
+        assert len(cache) == 0
+
+    def test_evicts_beyond_maxbytes(self):
+        cache = TTLCache(maxsize=10, ttl=60, maxbytes=10, sizeof=len)
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        cache.set("a", b"12")
+
+        cache.set("c", b"12345")
+        cache.set("d", b"12345678901")
+
+        assert cache.get("b") is None
+        assert cache.get("d") is None
+        assert cache.get("a") == b"12" and cache.get("c") == b"12345"
+        assert cache.stats()["bytes"] == 7
+        assert cache.evictions == 1
@@ -0,0 +1,22 @@
+from app.utils.etag import etag_matches, make_etag
+
+
+class TestETag:
+
+    def test_make_etag_is_weak_and_stable(self):
+        etag = make_etag("list", 1, 3)
+
+        assert etag.startswith('W/"') and etag.endswith('"')
+        assert etag == make_etag("list", 1, 3)
+        assert etag != make_etag("list", 1, 4)
+
+    def test_etag_matches(self):
+        etag = make_etag("list", 1, 3)
+        opaque = etag.removeprefix("W/")
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(opaque, etag)
+        assert etag_matches(f'W/"other", {etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches('W/"other"', etag)
@@ -0,0 +1,55 @@
+import pytest
+from datetime import datetime, timezone
+from app.utils.export import csv_stream, ndjson_stream
+
+pytestmark = pytest.mark.asyncio
+
+CREATED_AT = datetime(2025, 8, 7, 13, 55, 39, tzinfo=timezone.utc)
+
+
+async def chunks_of(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(stream) -> list[bytes]:
+    return [part async for part in stream]
+
+
+class TestExport:
+
+    async def test_ndjson_stream_one_line_per_row(self):
+        rows = [{"id": 1, "created_at": CREATED_AT}, {"id": 2, "created_at": None}]
+
+        parts = await collect(ndjson_stream(chunks_of(rows[:1], rows[1:])))
+
+        assert parts == [
+            b'{"id":1,"created_at":"2025-08-07T13:55:39Z"}\n',
+            b'{"id":2,"created_at":null}\n',
+        ]
+
+    async def test_csv_stream_yields_header_first(self):
+        rows = [
+            {"id": 1, "title": "A, quoted", "description": None},
+            {"id": 2, "title": "B", "description": "x"},
+        ]
+
+        parts = await collect(
+            csv_stream(chunks_of(rows), ("id", "title", "description"))
+        )
+
+        assert parts == [
+            b"id,title,description\r\n",
+            b'1,"A, quoted",\r\n2,B,x\r\n',
+        ]
+
+    async def test_csv_stream_formats_datetimes(self):
+        parts = await collect(
+            csv_stream(chunks_of([{"created_at": CREATED_AT}]), ("created_at",))
+        )
+
+        assert parts[1] == b"2025-08-07T13:55:39+00:00\r\n"
+
+    async def test_empty_export_has_only_the_header(self):
+        assert await collect(csv_stream(chunks_of(), ("id",))) == [b"id\r\n"]
+        assert await collect(ndjson_stream(chunks_of())) == []
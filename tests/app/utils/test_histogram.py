@@ -0,0 +1,19 @@
+from app.utils.histogram import Histogram
+
+
+class TestHistogram:
+
+    def test_cumulative_buckets(self):
+        histogram = Histogram((0.1, 0.01, 1))
+
+        for value in (0.005, 0.01, 0.5, 3):
+            histogram.observe(value)
+
+        assert histogram.cumulative() == [
+            ("0.01", 2),
+            ("0.1", 2),
+            ("1", 3),
+            ("+Inf", 4),
+        ]
+        assert histogram.snapshot()["count"] == 4
+        assert histogram.snapshot()["sum"] == 3.515
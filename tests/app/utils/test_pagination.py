@@ -0,0 +1,34 @@
+import pytest
+from datetime import datetime
+from app.utils.pagination import decode_cursor, encode_cursor, split_page
+
+
+class TestPaginationUtils:
+
+    def test_cursor_round_trip(self):
+        created_at = datetime(2025, 8, 7, 14, 3, 45, 311669)
+
+        cursor = encode_cursor(created_at, 42)
+
+        assert decode_cursor(cursor) == (created_at, 42)
+
+    @pytest.mark.parametrize("cursor", ["", "abc", "W10", "WyJ4IiwgMV0"])
+    def test_decode_invalid_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+    def test_split_page_last_page(self):
+        rows = [{"id": 1, "created_at": datetime(2025, 1, 1)}]
+
+        page, next_cursor = split_page(rows, 2)
+
+        assert page == rows
+        assert next_cursor is None
+
+    def test_split_page_with_more_rows(self):
+        rows = [{"id": n, "created_at": datetime(2025, 1, 1)} for n in (1, 2, 3)]
+
+        page, next_cursor = split_page(rows, 2)
+
+        assert [row["id"] for row in page] == [1, 2]
+        assert decode_cursor(next_cursor) == (datetime(2025, 1, 1), 2)
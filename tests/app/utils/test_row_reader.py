@@ -0,0 +1,72 @@
+import pytest
+from app.utils.row_reader import LineTooLong, csv_rows, iter_lines, ndjson_rows
+
+pytestmark = pytest.mark.asyncio
+
+
+async def chunks_of(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(stream) -> list:
+    return [item async for item in stream]
+
+
+class TestRowReader:
+
+    async def test_iter_lines_across_chunks(self):
+        body = "línea 1\nlínea 2\nfin".encode()
+        # Split inside a multi-byte character and inside a line.
+        chunks = chunks_of(body[:2], body[2:12], body[12:])
+
+        assert await collect(iter_lines(chunks)) == ["línea 1\n", "línea 2\n", "fin"]
+
+    @pytest.mark.parametrize(
+        "chunks",
+        [
+            # Without a line break, the pending line must not grow unbounded.
+            [b"a" * 6, b"a" * 6],
+            [b"short\n" + b"a" * 11 + b"\n"],
+        ],
+    )
+    async def test_iter_lines_rejects_long_lines(self, chunks):
+        with pytest.raises(LineTooLong):
+            await collect(iter_lines(chunks_of(*chunks), max_length=10))
+
+    async def test_ndjson_rows_reports_invalid_lines(self):
+        rows = await collect(
+            ndjson_rows(chunks_of(b'{"title": "A"}\n\nnot json\n', b'{"title": "B"}'))
+        )
+
+        assert rows[0] == {"title": "A"}
+        assert isinstance(rows[1], ValueError)
+        assert rows[2] == {"title": "B"}
+
+    async def test_csv_rows_uses_the_header(self):
+        body = (
+            b'\xef\xbb\xbftitle,description,priority\r\nA,"multi\nline",3\r\n'
+            b"\r\nB,,\r\n"
+        )
+
+        rows = await collect(csv_rows(chunks_of(body[:30], body[30:])))
+
+        assert rows == [
+            {"title": "A", "description": "multi\nline", "priority": "3"},
+            {"title": "B"},
+        ]
+
+    async def test_csv_rows_reports_extra_values(self):
+        body = b"title,priority\nA,1,extra\nB,2\n"
+
+        rows = await collect(csv_rows(chunks_of(body)))
+
+        assert isinstance(rows[0], ValueError)
+        assert rows[1] == {"title": "B", "priority": "2"}
+
+    async def test_csv_rows_rejects_long_records(self):
+        # Every line is short, but the quoted record spans too many of them.
+        body = b'title,description\nA,"' + b"line\n" * 5 + b'"\n'
+
+        with pytest.raises(LineTooLong):
+            await collect(csv_rows(chunks_of(body), max_length=20))
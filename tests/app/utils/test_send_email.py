@@ -1,12 +1,16 @@
 import pytest
-from unittest.mock import patch
-from app.utils.send_email import simulate_task_assignment_email
-
-pytestmark = pytest.mark.asyncio
+import smtplib
+from unittest.mock import AsyncMock, patch
+from app.utils.send_email import (
+    build_assignment_digest,
+    send_task_assignment_digest,
+    simulate_task_assignment_email,
+)
 
 
 class TestSendEmailUtils:
 
+    @pytest.mark.asyncio
     @patch("app.utils.send_email.log")
     async def test_simulate_task_assignment_email_logs_correctly(self, mock_log):
         user_email = "test@example.com"
@@ -17,3 +21,39 @@ class TestSendEmailUtils:
         mock_log.info.assert_called_once_with(
             f"Simulated notification sent to {user_email} for task '{task_title}'"
         )
+
+    def test_build_assignment_digest_lists_every_task(self):
+        message = build_assignment_digest("ana@example.com", ["First", "Second"])
+
+        assert message["To"] == "ana@example.com"
+        assert message["Subject"] == "2 tasks assigned to you"
+        assert "- First\n- Second" in message.get_content()
+
+    @pytest.mark.asyncio
+    @patch(
+        "app.utils.send_email.simulate_task_assignment_email",
+        new_callable=AsyncMock,
+    )
+    @patch("app.utils.send_email.settings")
+    async def test_send_digest_without_smtp_host_simulates(
+        self, mock_settings, mock_simulate
+    ):
+        mock_settings.SMTP_HOST = None
+
+        await send_task_assignment_digest("ana@example.com", ["First", "Second"])
+
+        assert mock_simulate.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_send_digest_through_smtp(self, smtp_server):
+        await send_task_assignment_digest("ana@example.com", ["First"])
+
+        assert len(smtp_server.messages) == 1
+        assert smtp_server.messages[0]["Subject"] == "Task assigned: First"
+
+    @pytest.mark.asyncio
+    async def test_send_digest_raises_when_rejected(self, smtp_server):
+        smtp_server.fail_with = "451 Try again later"
+
+        with pytest.raises(smtplib.SMTPDataError):
+            await send_task_assignment_digest("ana@example.com", ["First"])
@@ -0,0 +1,166 @@
+import gc
+import inspect
+import json
+import os
+import sys
+from statistics import median
+from time import perf_counter
+from typing import Optional
+import pytest
+
+# Each sample calls the function until it lasts this long, so timer
+# resolution and scheduling jitter stay small against what is measured.
+MIN_SAMPLE_SECONDS = 0.01
+MAX_LOOPS = 100_000
+
+
+def calibrate() -> float:
+    """
+    Time of a fixed pure-Python workload. Results are stored relative to it,
+    so a baseline recorded on one machine still means something on another.
+    """
+    timings = []
+    gc.disable()
+    try:
+        for _ in range(15):
+            start = perf_counter()
+            total = 0
+            for n in range(200_000):
+                total += n * n % 7
+            timings.append(perf_counter() - start)
+    finally:
+        gc.enable()
+    return min(timings)
+
+
+def tracing_active() -> bool:
+    # Coverage and debuggers slow the measured code down, not the calibration.
+    monitoring = getattr(sys, "monitoring", None)
+    return sys.gettrace() is not None or (
+        monitoring is not None
+        and monitoring.get_tool(monitoring.COVERAGE_ID) is not None
+    )
+
+
+class BenchmarkSession:
+    """
+    Keeps the results of the micro-benchmarks of a session and compares each
+    one, relative to the calibration, with its baseline. Without a baseline
+    the benchmarks only measure.
+    """
+
+    def __init__(self, baseline: dict, tolerance: float):
+        self.baseline = baseline
+        self.tolerance = tolerance
+        self.calibration = calibrate()
+        self.results: dict[str, dict] = {}
+
+    def record(self, name: str, timings: list[float]) -> dict:
+        result = {
+            "median_s": median(timings),
+            "min_s": min(timings),
+            "rounds": len(timings),
+            "relative": median(timings) / self.calibration,
+        }
+        self.results[name] = result
+        return result
+
+    def regression(self, name: str) -> Optional[str]:
+        """
+        Returns:
+            Optional[str]: Why the benchmark is slower than its baseline beyond
+            the tolerance, or None.
+        """
+        before = self.baseline.get("results", {}).get(name)
+        after = self.results[name]
+        if before is None or tracing_active():
+            return None
+        ratio = after["relative"] / before["relative"]
+        if ratio <= 1 + self.tolerance:
+            return None
+        return (
+            f"{ratio:.2f}x slower than the baseline (tolerance "
+            f"{1 + self.tolerance:.2f}x): median {after['median_s'] * 1000:.3f} ms, "
+            f"baseline {before['median_s'] * 1000:.3f} ms"
+        )
+
+    def dump(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(
+                {"calibration_s": self.calibration, "results": self.results},
+                file,
+                indent=2,
+                sort_keys=True,
+            )
+            file.write("\n")
+
+
+@pytest.fixture(scope="session")
+def benchmark_session(pytestconfig):
+    baseline_path = pytestconfig.getoption("benchmark_baseline")
+    baseline = {}
+    if baseline_path:
+        with open(baseline_path) as file:
+            baseline = json.load(file)
+    save_path = pytestconfig.getoption("benchmark_save")
+    if not (baseline_path or save_path):
+        # Nothing would use the timings: the benchmarks only smoke-test.
+        yield None
+        return
+    session = BenchmarkSession(baseline, pytestconfig.getoption("benchmark_tolerance"))
+    yield session
+    if save_path:
+        session.dump(save_path)
+
+
+@pytest.fixture
+def bench(request, benchmark_session):
+    """
+    Returns a coroutine that times `func(*args)` (sync or async) over
+    `rounds` samples after `warmup` calls, records the median under the test
+    id and fails the test when it regressed against the baseline.
+
+    Each sample calls the function as many times (a power of two) as it
+    takes to last `MIN_SAMPLE_SECONDS`, and its timing is per call. Without
+    --benchmark-baseline or --benchmark-save the function is only called
+    once and None is returned.
+    """
+
+    async def _bench(func, *args, rounds: int = 20, warmup: int = 2):
+        async def call():
+            result = func(*args)
+            if inspect.isawaitable(result):
+                await result
+
+        if benchmark_session is None:
+            await call()
+            return None
+
+        for _ in range(warmup):
+            await call()
+        loops = 1
+        while loops < MAX_LOOPS:
+            start = perf_counter()
+            for _ in range(loops):
+                await call()
+            if perf_counter() - start >= MIN_SAMPLE_SECONDS:
+                break
+            loops *= 2
+        timings = []
+        for _ in range(rounds):
+            start = perf_counter()
+            for _ in range(loops):
+                await call()
+            timings.append((perf_counter() - start) / loops)
+
+        name = request.node.nodeid
+        result = benchmark_session.record(name, timings)
+        regression = benchmark_session.regression(name)
+        if regression:
+            pytest.fail(f"{name}: {regression}")
+        return result
+
+    return _bench
@@ -0,0 +1,37 @@
+import re
+import pytest
+from app.domain.schemas.task import TaskCreate
+from app.infrastructure.database.repositories.task_repo import task_repo
+from app.services.task_service import TaskService
+
+pytestmark = pytest.mark.asyncio
+
+
+def statements(queries: list[str]) -> list[str]:
+    # Literal IDs differ between lists; the shape of the statements must not.
+    return [re.sub(r"\b\d+\b", "?", query) for query in queries]
+
+
+class TestCreateTaskQueries:
+
+    async def test_queries_do_not_depend_on_list_size(self, db, count_queries):
+        service = TaskService()
+        small = await task_repo.create_list("Small")
+        large = await task_repo.create_list("Large")
+        await task_repo.bulk_create_tasks(
+            large.id, [{"title": f"Task {n}"} for n in range(5_000)]
+        )
+
+        with count_queries() as small_counter:
+            await service.create_task(small.id, TaskCreate(title="Small"))
+        with count_queries() as large_counter:
+            await service.create_task(large.id, TaskCreate(title="Large"))
+
+        assert statements(large_counter.queries) == statements(small_counter.queries)
+        exists, insert, update = large_counter.queries
+        # The list is checked with EXISTS, without selecting any of its columns.
+        assert exists.startswith('SELECT 1 FROM "tasklist"')
+        assert insert.startswith('INSERT INTO "task"')
+        assert update.startswith('UPDATE "tasklist"')
+        # No statement reads the tasks of the list.
+        assert not any('FROM "task"' in query for query in large_counter.queries)
@@ -0,0 +1,54 @@
+import pytest
+import tracemalloc
+from time import perf_counter
+from app.infrastructure.database.repositories.task_repo import task_repo
+from app.services.task_service import TaskService
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.benchmark]
+
+
+async def seed_list(amount: int) -> int:
+    task_list = await task_repo.create_list(f"Export {amount}")
+    await task_repo.bulk_create_tasks(
+        task_list.id,
+        [{"title": f"Task {n}", "description": "x" * 64} for n in range(amount)],
+    )
+    return task_list.id
+
+
+async def consume(stream) -> dict:
+    """
+    Reads the whole export, keeping only its size, and measures the peak
+    memory allocated meanwhile and the time to the first and last bytes.
+    """
+    tracemalloc.start()
+    start = perf_counter()
+    first_byte, size = None, 0
+    async for part in stream:
+        if first_byte is None:
+            first_byte = perf_counter() - start
+        size += len(part)
+    total = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"first_byte": first_byte, "total": total, "size": size, "peak": peak}
+
+
+class TestExportStreaming:
+
+    @pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+    async def test_memory_does_not_grow_with_list_size(self, db, fmt, monkeypatch):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "EXPORT_CHUNK_SIZE", 500)
+        service = TaskService()
+        small = await seed_list(500)
+        large = await seed_list(10_000)
+
+        small_run = await consume(await service.export_tasks(small, fmt))
+        large_run = await consume(await service.export_tasks(large, fmt))
+
+        assert large_run["size"] > small_run["size"] * 15
+        # A buffered export would hold ~20x more for the large list.
+        assert large_run["peak"] < small_run["peak"] * 2
+        assert large_run["first_byte"] < large_run["total"] / 10
@@ -0,0 +1,46 @@
+import pytest
+import tracemalloc
+from app.infrastructure.database.models.task import Task
+from app.infrastructure.database.repositories.task_repo import task_repo
+from app.services.task_service import TaskService
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.benchmark]
+
+
+async def ndjson_body(amount: int, rows_per_chunk: int = 200):
+    """
+    Generates the upload in small chunks, like a request body arriving from
+    the network, so the whole file never exists in memory.
+    """
+    for start in range(0, amount, rows_per_chunk):
+        yield b"".join(
+            b'{"title": "Task %d", "description": "%s", "priority": %d}\n'
+            % (n, b"x" * 64, n % 5 + 1)
+            for n in range(start, min(start + rows_per_chunk, amount))
+        )
+
+
+async def measure_import(service: TaskService, amount: int):
+    task_list = await task_repo.create_list(f"Import {amount}")
+    tracemalloc.start()
+    result = await service.import_tasks(task_list.id, "ndjson", ndjson_body(amount))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert await Task.filter(task_list_id=task_list.id).count() == amount
+    return result, peak
+
+
+class TestImportStreaming:
+
+    async def test_memory_is_bounded_by_batch_size(self, db, monkeypatch):
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 500)
+        service = TaskService()
+
+        small, small_peak = await measure_import(service, 1_000)
+        large, large_peak = await measure_import(service, 10_000)
+
+        assert (small.imported, large.imported) == (1_000, 10_000)
+        # A buffered import would hold ~10x more for the large file.
+        assert large_peak < small_peak * 2
@@ -0,0 +1,68 @@
+import pytest
+from app.infrastructure.database.models.task import Task, TaskList
+from app.services.task_service import TaskService
+
+pytestmark = pytest.mark.asyncio
+
+
+async def walk_pages(service: TaskService, list_id: int, **filters) -> list[int]:
+    ids, cursor = [], None
+    while True:
+        page = await service.list_tasks(list_id, limit=7, cursor=cursor, **filters)
+        ids.extend(task["id"] for task in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+class TestKeysetPagination:
+
+    async def test_pages_cover_every_task_once(self, db):
+        task_list = await TaskList.create(name="Big list")
+        await Task.bulk_create(
+            [
+                Task(title=f"Task {n}", task_list=task_list, priority=n % 3 + 1)
+                for n in range(50)
+            ]
+        )
+
+        ids = await walk_pages(TaskService(), task_list.id)
+
+        assert ids == sorted(await Task.all().values_list("id", flat=True))
+
+    async def test_pages_respect_filters(self, db, count_queries):
+        task_list = await TaskList.create(name="Big list")
+        await Task.bulk_create(
+            [
+                Task(
+                    title=f"Task {n}",
+                    task_list=task_list,
+                    priority=n % 3 + 1,
+                    completed=n % 2 == 0,
+                )
+                for n in range(60)
+            ]
+        )
+        expected = await Task.filter(completed=True, priority=2).values_list(
+            "id", flat=True
+        )
+
+        with count_queries() as counter:
+            ids = await walk_pages(
+                TaskService(), task_list.id, completed=True, priority=2
+            )
+
+        assert ids == sorted(expected)
+        assert counter.count == len(ids) // 7 + 1
+
+    async def test_list_index_pages(self, db):
+        for n in range(12):
+            await TaskList.create(name=f"List {n}")
+        service = TaskService()
+
+        first = await service.get_all_lists(limit=10)
+        second = await service.get_all_lists(limit=10, cursor=first["next_cursor"])
+
+        assert len(first["items"]) == 10
+        assert len(second["items"]) == 2
+        assert second["next_cursor"] is None
@@ -0,0 +1,54 @@
+import pytest
+from app.api.dependencies.auth import get_current_user
+from app.core.security import (
+    create_access_token,
+    current_user_cache,
+    hash_password,
+    verify_password,
+)
+from app.infrastructure.database.models.user import User
+
+pytestmark = pytest.mark.asyncio
+
+
+async def create_users(size: int) -> str:
+    await User.bulk_create(
+        [User(email=f"user{n}@example.com", hashed_password="x") for n in range(size)]
+    )
+    return f"user{size - 1}@example.com"
+
+
+class TestSecurityMicro:
+
+    async def test_verify_password(self, bench):
+        hashed = hash_password("secret")
+
+        # bcrypt is slow on purpose: a few rounds are enough.
+        await bench(verify_password, "secret", hashed, rounds=3, warmup=1)
+
+    @pytest.mark.parametrize("claims", [1, 10, 100])
+    async def test_create_access_token(self, bench, claims):
+        data = {"sub": "user@example.com"}
+        data.update({f"claim{n}": n for n in range(claims - 1)})
+
+        await bench(create_access_token, data, rounds=50)
+
+
+class TestGetCurrentUserMicro:
+
+    @pytest.mark.parametrize("size", [10, 1_000])
+    async def test_uncached_token(self, db, bench, size):
+        token = create_access_token({"sub": await create_users(size)})
+
+        async def authenticate():
+            current_user_cache.clear()
+            await get_current_user(token)
+
+        await bench(authenticate, rounds=50)
+
+    @pytest.mark.parametrize("size", [10, 1_000])
+    async def test_cached_token(self, db, bench, size):
+        token = create_access_token({"sub": await create_users(size)})
+
+        await bench(get_current_user, token, rounds=50)
+        current_user_cache.clear()
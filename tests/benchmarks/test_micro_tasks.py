@@ -0,0 +1,104 @@
+import itertools
+import pytest
+from app.utils.serialization import dumps_trusted
+from app.domain.schemas.task import (
+    TASK_OUT_FIELDS,
+    TaskCreate,
+    TaskOut,
+    TaskUpdate,
+)
+from app.infrastructure.database.repositories.task_repo import task_repo
+from app.services.task_cache import TaskReadCache
+from app.services.task_service import TaskService
+
+pytestmark = pytest.mark.asyncio
+
+SIZES = [10, 100, 1_000]
+
+
+@pytest.fixture
+def service():
+    # Without a cache backend every call reads the database.
+    return TaskService(TaskReadCache(None, ttl=30))
+
+
+async def list_with_tasks(size: int) -> int:
+    task_list = await task_repo.create_list("Benchmark")
+    await task_repo.bulk_create_tasks(
+        task_list.id,
+        [
+            {"title": f"Task {n}", "priority": n % 5 + 1, "completed": n % 3 == 0}
+            for n in range(size)
+        ],
+    )
+    return task_list.id
+
+
+class TestTaskServiceMicro:
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_get_list_with_progress(self, db, bench, service, size):
+        list_id = await list_with_tasks(size)
+
+        await bench(service.get_list_with_progress, list_id)
+
+    @pytest.mark.parametrize("size", [10, 100])
+    async def test_get_all_lists(self, db, bench, service, size):
+        for n in range(size):
+            await task_repo.create_list(f"List {n}")
+
+        await bench(service.get_all_lists, size)
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_create_task(self, db, bench, service, size):
+        list_id = await list_with_tasks(size)
+
+        await bench(service.create_task, list_id, TaskCreate(title="New"))
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_update_task(self, db, bench, service, size):
+        list_id = await list_with_tasks(size)
+        task_id = (await task_repo.list_tasks(list_id, limit=1))[0].id
+        payloads = itertools.cycle(
+            [TaskUpdate(completed=True), TaskUpdate(completed=False)]
+        )
+
+        await bench(lambda: service.update_task(task_id, next(payloads)))
+
+
+class TestTaskRepositoryMicro:
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_list_tasks_models(self, db, bench, size):
+        list_id = await list_with_tasks(size)
+
+        await bench(task_repo.list_tasks, list_id)
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_list_tasks_filtered_rows(self, db, bench, size):
+        list_id = await list_with_tasks(size)
+
+        await bench(
+            lambda: task_repo.list_tasks(
+                list_id, completed=False, priority=1, fields=TASK_OUT_FIELDS
+            )
+        )
+
+
+class TestTaskOutSerializationMicro:
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_validated_models(self, db, bench, size):
+        list_id = await list_with_tasks(size)
+        tasks = await task_repo.list_tasks(list_id)
+
+        await bench(
+            lambda: [TaskOut.model_validate(task).model_dump_json() for task in tasks]
+        )
+
+    @pytest.mark.parametrize("size", SIZES)
+    async def test_trusted_rows(self, db, bench, size):
+        list_id = await list_with_tasks(size)
+        rows = await task_repo.list_tasks(list_id, fields=TASK_OUT_FIELDS)
+
+        await bench(lambda: dumps_trusted({"items": rows, "next_cursor": None}))
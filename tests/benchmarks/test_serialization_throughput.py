@@ -0,0 +1,81 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from time import perf_counter
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.api.responses import TrustedJSONResponse
+from app.domain.schemas.task import TaskListOut, TaskOut
+from app.infrastructure.database.models.task import Task
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.benchmark]
+
+
+CREATED_AT = datetime(2025, 8, 7, 13, 55, 39, 476064, tzinfo=timezone.utc)
+
+
+def task_rows(amount: int) -> list[dict]:
+    return [
+        {
+            "id": n,
+            "title": f"Task {n}",
+            "description": None if n % 2 else "Some description",
+            "priority": n % 5 + 1,
+            "completed": n % 3 == 0,
+            "created_at": CREATED_AT,
+        }
+        for n in range(amount)
+    ]
+
+
+async def validated_path(tasks: list[Task], response_field) -> bytes:
+    # Previous path: ORM objects -> TaskOut.model_validate -> FastAPI
+    # re-validation against response_model -> stdlib json.
+    result = TaskListOut(
+        id=1,
+        name="List",
+        created_at=CREATED_AT,
+        tasks=[TaskOut.model_validate(task) for task in tasks],
+    )
+    content = await serialize_response(field=response_field, response_content=result)
+    return JSONResponse(content).body
+
+
+async def trusted_path(rows: list[dict]) -> bytes:
+    # Current path: the plain dict `TaskService.get_list_with_progress`
+    # returns, serialized by orjson without validation.
+    result = {
+        "id": 1,
+        "name": "List",
+        "created_at": CREATED_AT,
+        "tasks": rows,
+        "completed_percentage": 0.0,
+    }
+    return TrustedJSONResponse(result).body
+
+
+async def throughput(amount: int, serialize, *args) -> float:
+    best = float("inf")
+    for _ in range(3 if amount < 100_000 else 1):
+        start = perf_counter()
+        await serialize(*args)
+        best = min(best, perf_counter() - start)
+    return amount / best
+
+
+class TestSerializationThroughput:
+
+    @pytest.mark.parametrize("amount", [1_000, 10_000, 100_000])
+    async def test_trusted_rows_beat_validated_models(self, amount):
+        rows = task_rows(amount)
+        tasks = [Task(task_list_id=1, **row) for row in rows]
+        response_field = create_response_field(name="response", type_=TaskListOut)
+
+        before = await throughput(amount, validated_path, tasks, response_field)
+        after = await throughput(amount, trusted_path, rows)
+
+        assert json.loads(await validated_path(tasks[:3], response_field)) == (
+            json.loads(await trusted_path(rows[:3]))
+        )
+        assert after > before * 2
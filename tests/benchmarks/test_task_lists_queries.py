@@ -0,0 +1,34 @@
+import pytest
+from app.infrastructure.database.models.task import Task, TaskList
+from app.infrastructure.database.repositories.task_repo import task_repo
+from app.services.task_service import TaskService
+
+pytestmark = pytest.mark.asyncio
+
+
+async def seed_lists(amount: int, tasks_per_list: int = 4):
+    for index in range(amount):
+        task_list = await TaskList.create(name=f"List {index}")
+        await Task.bulk_create(
+            [
+                Task(title=f"Task {n}", task_list=task_list, completed=n % 2 == 0)
+                for n in range(tasks_per_list)
+            ]
+        )
+    await task_repo.recompute_list_counters()
+
+
+class TestGetAllListsQueries:
+
+    @pytest.mark.parametrize("amount", [1, 10, 100])
+    async def test_query_count_is_constant(self, db, count_queries, amount):
+        await seed_lists(amount)
+        service = TaskService()
+
+        with count_queries() as counter:
+            result = await service.get_all_lists(limit=amount)
+
+        assert len(result["items"]) == amount
+        assert counter.count == 1
+        assert all(item["total_tasks"] == 4 for item in result["items"])
+        assert all(item["completed_percentage"] == 50.0 for item in result["items"])
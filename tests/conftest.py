@@ -0,0 +1,289 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+import pytest_asyncio
+from contextlib import contextmanager
+from email import message_from_bytes
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from tortoise import Tortoise
+from app.infrastructure.database.instrumentation import (
+    instrument_queries,
+    track_queries,
+)
+from app.infrastructure.database.migrate import migrate
+
+MODELS = [
+    "app.infrastructure.database.models.user",
+    "app.infrastructure.database.models.task",
+    "app.infrastructure.database.models.notification",
+]
+
+
+@pytest_asyncio.fixture
+async def db():
+    await Tortoise.init(db_url="sqlite://:memory:", modules={"models": MODELS})
+    await migrate()
+    yield
+    await Tortoise.close_connections()
+
+
+@pytest.fixture
+def count_queries():
+    """
+    Returns a context manager that records every statement sent to the
+    database, through the same instrumentation that counts the queries of
+    each request.
+    """
+
+    @contextmanager
+    def _count_queries():
+        instrument_queries()
+        with track_queries(record=True) as stats:
+            yield stats
+
+    return _count_queries
+
+
+class SMTPStandIn:
+    """
+    Minimal SMTP server that accepts every message and keeps it in memory.
+    Set `fail_with` to a reply such as "451 Try again later" to reject
+    messages at the DATA stage.
+    """
+
+    def __init__(self):
+        self.messages = []
+        self.fail_with = None
+        self.host = "127.0.0.1"
+        self.port = None
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        def reply(line: str):
+            writer.write(f"{line}\r\n".encode())
+
+        reply("220 stand-in ESMTP")
+        while line := await reader.readline():
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                reply("250 stand-in")
+            elif command == "DATA":
+                reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b""
+                while (chunk := await reader.readline()) not in (b".\r\n", b""):
+                    data += chunk[1:] if chunk.startswith(b"..") else chunk
+                if self.fail_with:
+                    reply(self.fail_with)
+                else:
+                    self.messages.append(message_from_bytes(data))
+                    reply("250 OK")
+            elif command == "QUIT":
+                reply("221 Bye")
+                await writer.drain()
+                break
+            else:
+                reply("250 OK")
+            await writer.drain()
+        writer.close()
+
+
+@pytest_asyncio.fixture
+async def smtp_server(monkeypatch):
+    """
+    Runs an SMTP stand-in on a random local port and points the settings at it.
+    """
+    from app.core.config import settings
+
+    server = SMTPStandIn()
+    await server.start()
+    monkeypatch.setattr(settings, "SMTP_HOST", server.host)
+    monkeypatch.setattr(settings, "SMTP_PORT", server.port)
+    monkeypatch.setattr(settings, "SMTP_STARTTLS", False)
+    monkeypatch.setattr(settings, "SMTP_USERNAME", None)
+    yield server
+    await server.stop()
+
+
+class RedisStandIn:
+    """
+    Minimal server for the subset of the Redis protocol used by the cache:
+    PING, AUTH, SELECT, GET, SET (with PX), MGET, INCR and INFO.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+        self.host = "127.0.0.1"
+        self.port = None
+        self._server = None
+        self._writers = set()
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        for writer in self._writers:
+            writer.close()
+        await self._server.wait_closed()
+
+    def _get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def _run(self, name, args):
+        if name in ("PING", "AUTH", "SELECT"):
+            return b"+OK\r\n"
+        if name == "GET":
+            return self._bulk(self._get(args[0]))
+        if name == "SET":
+            ttl = int(args[3]) / 1000 if len(args) > 3 else None
+            self.data[args[0]] = (
+                args[1],
+                time.monotonic() + ttl if ttl is not None else None,
+            )
+            return b"+OK\r\n"
+        if name == "MGET":
+            return b"*%d\r\n" % len(args) + b"".join(
+                self._bulk(self._get(key)) for key in args
+            )
+        if name == "INCR":
+            value = int(self._get(args[0]) or 0) + 1
+            self.data[args[0]] = (str(value).encode(), None)
+            return b":%d\r\n" % value
+        if name == "INFO":
+            used = sum(len(value) for value, _ in self.data.values())
+            return self._bulk(
+                f"used_memory:{used}\r\nmaxmemory:0\r\nevicted_keys:0\r\n".encode()
+            )
+        return b"-ERR unknown command\r\n"
+
+    @staticmethod
+    def _bulk(value):
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    async def _handle(self, reader, writer):
+        self._writers.add(writer)
+        try:
+            while line := await reader.readline():
+                args = []
+                for _ in range(int(line[1:])):
+                    length = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                name = args[0].decode().upper()
+                self.commands.append(name)
+                writer.write(self._run(name, args[1:]))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        self._writers.discard(writer)
+        writer.close()
+
+
+@pytest_asyncio.fixture
+async def redis_server():
+    """
+    Runs a Redis protocol stand-in on a random local port.
+    """
+    server = RedisStandIn()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+class OTLPCollectorStandIn:
+    """
+    Minimal OTLP/HTTP collector that keeps the JSON export requests posted
+    to /v1/traces. It runs in a thread: exporters post from their own.
+    """
+
+    def __init__(self):
+        self.requests = []
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                collector.requests.append((self.path, json.loads(body)))
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.endpoint = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever)
+
+    @property
+    def spans(self) -> list[dict]:
+        return [
+            span
+            for _, body in self.requests
+            for resource in body["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+@pytest.fixture
+def otlp_collector():
+    """
+    Runs an OTLP/HTTP collector stand-in on a random local port.
+    """
+    collector = OTLPCollectorStandIn()
+    collector.start()
+    yield collector
+    collector.stop()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark", "micro-benchmarks (tests/benchmarks)")
+    group.addoption(
+        "--benchmark-baseline",
+        help=(
+            "Results to compare the micro-benchmarks with, failing the slower "
+            "ones (e.g. tests/benchmarks/baselines/micro.json). Without it "
+            "they only measure."
+        ),
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=0.5,
+        help="Slowdown against the baseline that fails a benchmark (fraction).",
+    )
+    group.addoption(
+        "--benchmark-save",
+        help="Write the results of the session to this file.",
+    )